@@ -1,29 +1,99 @@
-import math
 import os
-import random
+from collections import OrderedDict
 
 import numpy as np
-import pygame
 
+from array_engine import UnitArrays, factory_positions, interpolate_units
+from bots import ScriptedBot
 from game import GameBoard
 from unit import Bomb, Troop
-from order import Move, Inc, SendBomb
+from order import Order
 
 FAC_TEXT_OFFSET = 10
 
+TEXT_COLOR = (255, 255, 255)
+
+# Sizes of the render caches
+SPRITE_CACHE_SIZE = 1024
+TEXT_CACHE_SIZE = 512
+
+# Imported by ``load_pygame`` when the window is opened, so boards and apps
+# can be set up without paying for pygame
+pygame = None
+
+
+def load_pygame():
+    global pygame
+    if pygame is None:
+        import pygame as pygame_module
+        pygame = pygame_module
+    return pygame
+
+
+class LRUCache:
+    """
+    Least recently used cache of rendered surfaces
+
+    Parameters
+    ----------
+    maxsize : int
+        Number of entries to keep
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, make):
+        """
+        Return the entry for ``key``, calling ``make()`` to create it if it
+        isn't cached
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = make()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
 
 class App:
-    def __init__(self, turn_time=1000.0):
+    def __init__(self, turn_time=1000.0, bots=None, game=None):
         """
         Parameters
         ----------
         turn_time : float
             Time for one turn [ms]
+        bots : dict, optional
+            ``bots.Bot`` playing each team. Both teams play a ``ScriptedBot``
+            seeded from ``game.seed`` by default.
+        game : GameBoard, optional
+            Game to show. A new game is started by default.
         """
 
         self.turn_time = turn_time
-        self.game = GameBoard()
-        self.game.init_game()
+        if game is None:
+            game = GameBoard()
+            game.init_game()
+        self.game = game
+
+        if bots is None:
+            # Seeded from the board, so games replay from ``game.seed``
+            bots = {
+                1: ScriptedBot(1, seed=game.seed),
+                -1: ScriptedBot(-1, seed=game.seed + 1),
+            }
+        self.bots = bots
 
         self.timer = 0.0
 
@@ -33,7 +103,17 @@ class App:
         # TODO: this should scale with game.max_dist
         self.scale = min(self.width, self.height) / 22.0
 
+        # Unit sprites rotated to face their destination, keyed by unit type,
+        # team, and source and destination positions, and rendered text keyed
+        # by string
+        self.sprite_cache = LRUCache(SPRITE_CACHE_SIZE)
+        self.text_cache = LRUCache(TEXT_CACHE_SIZE)
+
+        # Screen areas drawn on last frame, to be cleared on the next
+        self._dirty_rects = None
+
     def pygame_init(self):
+        load_pygame()
         pygame.init()
         pygame.font.init()
 
@@ -43,41 +123,58 @@ class App:
         self._display_surf = pygame.display.set_mode(
             self.size, pygame.HWSURFACE | pygame.DOUBLEBUF)
 
+        self._running = True
+
+        self.load_resources()
+
+    def offscreen_init(self):
+        """
+        Set up drawing onto an off-screen surface, ``_display_surf``, with no
+        window or video driver. Use ``draw_frame`` rather than ``render``.
+        """
+        load_pygame()
+        pygame.font.init()
+
+        self._display_surf = pygame.Surface(self.size)
+        self.load_resources(convert=False)
+
+    def load_resources(self, convert=True):
+        """
+        Load the background, font and sprites
+
+        Parameters
+        ----------
+        convert : bool, optional
+            Convert images to the display's pixel format for faster drawing.
+            Needs a display.
+        """
         bgfile = os.path.join("res", "background.png")
         self._background = pygame.image.load(bgfile)
-
-        self._running = True
+        if convert:
+            self._background = self._background.convert()
 
         self.font = pygame.font.SysFont("arial", 12)
-        self.load_sprites()
+        self.load_sprites(convert)
+
+    def load_sprites(self, convert=True):
+        def load(filename):
+            image = pygame.image.load(os.path.join("res", filename))
+            return image.convert_alpha() if convert else image
 
-    def load_sprites(self):
         self.factory_sprites = {}
 
         for team, color in [(-1, "blue"), (0, "grey"), (1, "red")]:
             self.factory_sprites[team] = []
             for i in range(4):
                 filename = "{}_fac_{}.png".format(color, i)
-                path = os.path.join("res", filename)
-                image = pygame.image.load(path)
-
-                self.factory_sprites[team].append(image)
+                self.factory_sprites[team].append(load(filename))
 
         self.troop_sprites = {}
         self.bomb_sprites = {}
 
         for team, color in [(-1, "blue"), (1, "red")]:
-            filename = "{}_troop.png".format(color)
-            path = os.path.join("res", filename)
-            image = pygame.image.load(path)
-
-            self.troop_sprites[team] = image
-
-            filename = "{}_bomb.png".format(color)
-            path = os.path.join("res", filename)
-            image = pygame.image.load(path)
-
-            self.bomb_sprites[team] = image
+            self.troop_sprites[team] = load("{}_troop.png".format(color))
+            self.bomb_sprites[team] = load("{}_bomb.png".format(color))
 
     def on_event(self, event):
         pass
@@ -91,29 +188,11 @@ class App:
         while self.timer > self.turn_time:
             self.timer -= self.turn_time
 
-            # TODO: testing input
-            for factory in self.game.factories:
-                if factory.team in [-1, 1]:
-                    self.game.orders[factory.team].append(
-                        Inc(factory.id)
+            for team, bot in self.bots.items():
+                for order_string in bot.get_orders(self.game):
+                    self.game.orders[team].append(
+                        Order.from_string(order_string)
                     )
-                    if factory.production == 3:
-                        targets = self.game.factories.copy()
-                        random.shuffle(targets)
-                        if self.game.current_turn % 10 == 0:
-                            self.game.orders[factory.team].append(
-                                SendBomb(factory.id, targets[0].id)
-                            )
-                        for t_factory in targets:
-                            if factory.id != t_factory.id:
-                                self.game.orders[factory.team].append(
-                                    Move(
-                                        factory.id,
-                                        t_factory.id,
-                                        t_factory.stock + 1,
-                                    )
-                                )
-            # TODO: end testing input
 
             self.game.update()
 
@@ -121,72 +200,147 @@ class App:
             self._running = False
 
     def render(self):
-        # Clear screen
-        self._display_surf.blit(self._background, (0, 0))
+        """
+        Draw a frame. Only the areas drawn on this frame or the last one are
+        cleared and sent to the display.
+        """
+        previous = self._dirty_rects
+        full_redraw, self._dirty_rects = self.draw_frame(previous)
 
-        for factory in self.game.factories:
-            self.draw_factory(factory)
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(previous + self._dirty_rects)
 
-        for unit in self.game.bombs + self.game.troops:
-            self.draw_unit(unit)
+    def draw_frame(self, dirty_rects=None):
+        """
+        Draw the game onto ``_display_surf``
 
-        pygame.display.flip()
+        Parameters
+        ----------
+        dirty_rects : list of pygame.Rect, optional
+            Areas drawn on for the last frame. Only these are cleared, unless
+            they cover so much of the screen that redrawing it all is
+            cheaper. The whole surface is cleared by default.
+
+        Returns
+        -------
+        full_redraw : bool
+            Whether the whole surface was cleared
+        drawn : list of pygame.Rect
+            Areas drawn on
+        """
+        surface = self._display_surf
+        # With lots of overlapping units it's cheaper to redraw everything
+        full_redraw = dirty_rects is None or sum(
+            rect.width * rect.height for rect in dirty_rects
+        ) > self.width * self.height / 2
+        if full_redraw:
+            surface.blit(self._background, (0, 0))
+        else:
+            for rect in dirty_rects:
+                surface.blit(self._background, rect, rect)
 
-    def draw(self, img, position, rotation=0.0):
-        center = np.array(position) * self.scale + self.center
+        drawn = []
+        for factory in self.game.factories:
+            drawn.extend(self.draw_factory(factory))
+
+        units = self.game.bombs + self.game.troops
+        if units:
+            positions, headings = interpolate_units(
+                UnitArrays.from_units(units),
+                factory_positions(self.game),
+                # Make the units smoothly move to their destinations
+                progress=self.timer / self.turn_time,
+            )
+            for unit, position, heading in zip(units, positions, headings):
+                drawn.extend(self.draw_unit(unit, position, heading))
+
+        return full_redraw, drawn
+
+    def draw(self, img, position):
+        """
+        Blit an image centred on a game position
+
+        Returns
+        -------
+        pygame.Rect
+            The area drawn on
+        """
+        center_x = position[0] * self.scale + self.center[0]
+        center_y = position[1] * self.scale + self.center[1]
         topleft = (
-            center[0] - img.get_width()/2,
-            center[1] - img.get_height()/2
+            center_x - img.get_width()/2,
+            center_y - img.get_height()/2
         )
 
-        image = pygame.transform.rotate(img, rotation)
-
-        self._display_surf.blit(image, topleft)
-
-    def draw_factory(self, factory):
-        team_facs = self.factory_sprites[factory.team]
-        factory_sprite = team_facs[factory.production]
-
-        self.draw(factory_sprite, factory.position)
+        return self._display_surf.blit(img, topleft)
 
-        status = " (D)" if factory.disabled_turns > 0 else ""
-        text = self.font.render(
-            "{}{}".format(factory.stock, status),
-            True,
-            (255, 255, 255),
+    def render_text(self, text):
+        return self.text_cache.get(
+            text, lambda: self.font.render(text, True, TEXT_COLOR)
         )
-        self.draw(text, factory.position)
 
-    def draw_unit(self, unit):
+    def unit_sprite(self, unit, heading):
+        """
+        Return the unit's sprite, rotated by ``heading`` degrees to face its
+        destination
+        """
         if type(unit) == Bomb:
-            sprite = self.bomb_sprites[unit.team]
-            status_text = ""
+            sprites = self.bomb_sprites
         elif type(unit) == Troop:
-            sprite = self.troop_sprites[unit.team]
-            status_text = str(unit.strength)
+            sprites = self.troop_sprites
         else:
             raise ValueError("Unknown unit type {}".format(type(unit)))
 
-        # Make the unit smoothly move to the destination
-        draw_position = np.array(unit.get_position())
+        def rotate():
+            return pygame.transform.rotate(sprites[unit.team], heading)
 
-        direction = np.array(unit.destination.position) \
-            - np.array(unit.source.position)
+        key = (
+            type(unit), unit.team,
+            tuple(unit.source.position), tuple(unit.destination.position),
+        )
+        return self.sprite_cache.get(key, rotate)
 
-        # Timer in ms
-        slide = direction * self.timer / (1000.0 * unit.distance)
-        draw_position += slide
+    def draw_factory(self, factory):
+        """
+        Returns
+        -------
+        list of pygame.Rect
+            Areas drawn on
+        """
+        team_facs = self.factory_sprites[factory.team]
+        factory_sprite = team_facs[factory.production]
 
-        rotation = math.degrees(math.atan2(direction[0], direction[1])) + 180
+        status = " (D)" if factory.disabled_turns > 0 else ""
+        text = self.render_text("{}{}".format(factory.stock, status))
+        return [
+            self.draw(factory_sprite, factory.position),
+            self.draw(text, factory.position),
+        ]
 
-        self.draw(sprite, draw_position, rotation=rotation)
+    def draw_unit(self, unit, position, heading):
+        """
+        Parameters
+        ----------
+        unit : Unit
+        position : (float, float)
+            Where to draw the unit
+        heading : float
+            Sprite rotation, see ``array_engine.interpolate_units``
+
+        Returns
+        -------
+        list of pygame.Rect
+            Areas drawn on
+        """
+        sprite = self.unit_sprite(unit, heading)
 
-        text = self.font.render(
-            status_text,
-            True,
-            (255, 255, 255),
-        )
-        self.draw(text, draw_position)
+        drawn = [self.draw(sprite, position)]
+        if type(unit) == Troop:
+            text = self.render_text(str(unit.strength))
+            drawn.append(self.draw(text, position))
+        return drawn
 
     def cleanup(self):
         self.font = None
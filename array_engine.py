@@ -0,0 +1,482 @@
+"""
+Struct-of-arrays game engine.
+
+``ArrayGameBoard`` holds the same state as a ``GameBoard`` in NumPy arrays and
+advances whole turns with vectorized unit arrival, production, battle and bomb
+resolution. The per-turn kernels are module-level functions so that other
+engines (e.g. batched simulators) can run them over several boards at once.
+"""
+import numpy as np
+
+from factory import Factory
+from game import GameBoard
+from order import Inc, Move, SendBomb
+from unit import Bomb, Troop
+
+BOMB_DISABLE_TURNS = 5
+BOMB_MIN_DAMAGE = 10
+UPGRADE_COST = 10
+MAX_PRODUCTION = 3
+
+
+def team_index(team):
+    """
+    Index of a player team (-1 or 1) in per-team arrays
+    """
+    return (team + 1) // 2
+
+
+class UnitArrays:
+    """
+    Columns describing units in flight. Troops and bombs share the columns and
+    are told apart by ``is_bomb``.
+
+    Parameters
+    ----------
+    source, destination : array of int
+        Source and destination factory indices
+    team : array of int
+        Team that sent each unit
+    strength : array of int
+        Troop strength, 0 for bombs
+    travelled, distance : array of int
+        Turns travelled so far and total turns to reach the destination
+    is_bomb : array of bool
+    """
+    COLUMNS = (
+        "source", "destination", "team", "strength", "travelled", "distance",
+        "is_bomb",
+    )
+
+    def __init__(self, source=(), destination=(), team=(), strength=(),
+                 travelled=(), distance=(), is_bomb=()):
+        self.source = np.asarray(source, dtype=np.int64)
+        self.destination = np.asarray(destination, dtype=np.int64)
+        self.team = np.asarray(team, dtype=np.int64)
+        self.strength = np.asarray(strength, dtype=np.int64)
+        self.travelled = np.asarray(travelled, dtype=np.int64)
+        self.distance = np.asarray(distance, dtype=np.int64)
+        self.is_bomb = np.asarray(is_bomb, dtype=bool)
+
+    def __len__(self):
+        return len(self.source)
+
+    def select(self, mask):
+        """
+        Return the units selected by a boolean mask or index array
+        """
+        return UnitArrays(
+            *(getattr(self, column)[mask] for column in self.COLUMNS)
+        )
+
+    def concatenate(self, other):
+        """
+        Return these units followed by the units in ``other``
+        """
+        return UnitArrays(*(
+            np.concatenate((getattr(self, column), getattr(other, column)))
+            for column in self.COLUMNS
+        ))
+
+    def copy(self):
+        return UnitArrays(
+            *(getattr(self, column).copy() for column in self.COLUMNS)
+        )
+
+    @classmethod
+    def from_units(cls, units):
+        """
+        Columns for a list of ``Unit`` objects, with factories given by ID
+        """
+        return cls(
+            [unit.source.id for unit in units],
+            [unit.destination.id for unit in units],
+            [unit.team for unit in units],
+            [unit.strength or 0 for unit in units],
+            [unit.travelled for unit in units],
+            [unit.distance for unit in units],
+            [isinstance(unit, Bomb) for unit in units],
+        )
+
+
+def factory_positions(board):
+    """
+    Factory positions of a board as an array of shape (n, 2), indexed by
+    factory ID. Rows for unused IDs are NaN.
+    """
+    positions = np.full((len(board.factory_table), 2), np.nan)
+    for fac in board.factories:
+        positions[fac.id] = fac.position
+    return positions
+
+
+def interpolate_units(units, positions, progress=0.0):
+    """
+    Positions and headings of all units at once, e.g. for drawing.
+
+    Parameters
+    ----------
+    units : UnitArrays
+    positions : array of float, shape (n, 2)
+        Factory positions, indexed like ``units.source`` (see
+        ``factory_positions``)
+    progress : float or array of float, optional
+        Fraction of the next turn that has gone by, to slide units smoothly
+        between turns
+
+    Returns
+    -------
+    unit_positions : array of float, shape (len(units), 2)
+        Same as ``Unit.get_position`` when ``progress`` is 0
+    headings : array of float
+        Counterclockwise rotation in degrees that turns a sprite pointing
+        towards negative y (up on screen) to face the unit's destination
+    """
+    source = positions[units.source]
+    direction = positions[units.destination] - source
+    fraction = (units.travelled + progress) / units.distance
+    unit_positions = source + direction * fraction[:, np.newaxis]
+    headings = np.degrees(
+        np.arctan2(direction[:, 0], direction[:, 1])
+    ) + 180
+    return unit_positions, headings
+
+
+def advance_units(units, num_factories):
+    """
+    Move every unit one turn and resolve arrivals.
+
+    Parameters
+    ----------
+    units : UnitArrays
+        Units in flight, mutated in place
+    num_factories : int
+        Length of the factory arrays
+
+    Returns
+    -------
+    occupying : array of int, shape (2, num_factories)
+        Strength of arriving troops per team (see ``team_index``)
+    bombs_arriving : array of int
+        Number of bombs arriving at each factory
+    remaining : array of bool
+        Mask of units still in flight
+    """
+    units.travelled += 1
+    arrived = units.travelled == units.distance
+
+    troops = arrived & ~units.is_bomb
+    occupying = np.zeros((2, num_factories), dtype=np.int64)
+    np.add.at(
+        occupying,
+        (team_index(units.team[troops]), units.destination[troops]),
+        units.strength[troops],
+    )
+
+    bombs_arriving = np.bincount(
+        units.destination[arrived & units.is_bomb], minlength=num_factories,
+    )
+
+    return occupying, bombs_arriving, ~arrived
+
+
+def produce(team, stock, production, disabled, active=None):
+    """
+    Vectorized ``Factory.produce``, mutating the arrays in place. Only
+    factories in the ``active`` mask are updated, if given.
+    """
+    is_disabled = disabled > 0
+    producing = ~is_disabled & (team != 0)
+    if active is not None:
+        is_disabled &= active
+        producing &= active
+
+    disabled[is_disabled] -= 1
+    stock[producing] += production[producing]
+
+
+def resolve_battles(team, stock, occupying):
+    """
+    Vectorized ``Factory.resolve_battles``, mutating the arrays in place.
+    """
+    result = occupying[1] - occupying[0]
+    winner = np.sign(result)
+    result = np.abs(result)
+
+    stock += np.where(team == winner, result, -result)
+
+    captured = stock < 0
+    team[captured] = winner[captured]
+    np.abs(stock, out=stock)
+
+
+def resolve_bombs(stock, disabled, bombs_arriving):
+    """
+    Vectorized ``Factory.resolve_bombs``, mutating the arrays in place.
+    """
+    for i in range(int(bombs_arriving.max(initial=0))):
+        hit = bombs_arriving > i
+        destroyed = np.maximum(BOMB_MIN_DAMAGE, stock[hit] // 2)
+        stock[hit] = np.maximum(0, stock[hit] - destroyed)
+
+    disabled[bombs_arriving > 0] = BOMB_DISABLE_TURNS
+
+
+def execute_orders(orders, team, stock, production, remaining_bombs,
+                   distances, offset=0):
+    """
+    Validate and execute orders in sequence against factory arrays, with the
+    same rules as ``Order.validate`` and ``Order.execute``. Stock and
+    production arrays are mutated in place.
+
+    Parameters
+    ----------
+    orders : dict
+        Lists of ``Order`` objects keyed by team
+    team, stock, production : array of int
+        Factory arrays
+    remaining_bombs : array of int
+        Bombs left per team (see ``team_index``), mutated in place
+    distances : sequence of sequences of int
+        Distance matrix of the board the orders are for
+    offset : int, optional
+        Index of the board's factory 0 in the factory arrays
+
+    Returns
+    -------
+    list of tuple
+        New units, one ``UnitArrays`` row each
+    """
+    num_factories = len(distances)
+
+    def get_index(factory_id):
+        if type(factory_id) is not int \
+                or not 0 <= factory_id < num_factories:
+            msg = "Factory {} not found"
+            raise ValueError(msg.format(factory_id))
+        return factory_id
+
+    new_units = []
+    for order_team, team_orders in orders.items():
+        for order in team_orders:
+            if isinstance(order, Move):
+                source = get_index(order.source)
+                destination = get_index(order.destination)
+                index = source + offset
+                if team[index] != order_team or source == destination \
+                        or not order.valid_count():
+                    continue
+
+                strength = min(int(stock[index]), order.count)
+                if strength == 0:
+                    continue
+                stock[index] -= strength
+                new_units.append((
+                    index, destination + offset, order_team, strength, 0,
+                    distances[source][destination], False,
+                ))
+            elif isinstance(order, SendBomb):
+                source = get_index(order.source)
+                destination = get_index(order.destination)
+                index = source + offset
+                if team[index] != order_team or source == destination \
+                        or remaining_bombs[team_index(order_team)] <= 0:
+                    continue
+
+                remaining_bombs[team_index(order_team)] -= 1
+                new_units.append((
+                    index, destination + offset, order_team, 0, 0,
+                    distances[source][destination], True,
+                ))
+            elif isinstance(order, Inc):
+                index = get_index(order.target) + offset
+                if team[index] != order_team:
+                    continue
+
+                if stock[index] >= UPGRADE_COST \
+                        and production[index] < MAX_PRODUCTION:
+                    stock[index] -= UPGRADE_COST
+                    production[index] += 1
+
+    return new_units
+
+
+def arrays_to_board(template, team, stock, production, disabled, units,
+                    offset=0):
+    """
+    Build a ``GameBoard`` from factory and unit arrays, sharing the static map
+    data of ``template``. Turn counters, bombs and results are left to the
+    caller.
+
+    Parameters
+    ----------
+    template : GameBoard
+        Board the arrays were created from
+    team, stock, production, disabled : array of int
+        Factory arrays
+    units : UnitArrays
+        Units in flight on this board
+    offset : int, optional
+        Index of the board's factory 0 in the factory and unit arrays
+    """
+    board = GameBoard(seed=template.seed)
+    for attr in [
+            "num_factories", "min_dist", "max_dist",
+            "stock_range_player", "stock_range_neutral"]:
+        if hasattr(template, attr):
+            setattr(board, attr, getattr(template, attr))
+
+    for fac in template.factories:
+        index = fac.id + offset
+        new_fac = Factory(
+            fid=fac.id,
+            team=int(team[index]),
+            production=int(production[index]),
+            stock=int(stock[index]),
+            position=fac.position,
+        )
+        new_fac.disabled_turns = int(disabled[index])
+        board.factories.append(new_fac)
+    board.index_factories()
+    board.distances = template.distances
+
+    for i in range(len(units)):
+        if units.is_bomb[i]:
+            unit_type, strength, unit_list = Bomb, None, board.bombs
+        else:
+            unit_type, strength = Troop, int(units.strength[i])
+            unit_list = board.troops
+
+        unit = unit_type(
+            strength,
+            board.get_factory(int(units.source[i]) - offset),
+            board.get_factory(int(units.destination[i]) - offset),
+            int(units.distance[i]),
+        )
+        unit.team = int(units.team[i])
+        unit.travelled = int(units.travelled[i])
+        unit_list.append(unit)
+
+    return board
+
+
+class ArrayGameBoard:
+    """
+    A struct-of-arrays copy of a ``GameBoard`` that gives the same results
+    as ``GameBoard.update`` for each turn.
+
+    Factory IDs must be dense, i.e. ``0 .. num_factories-1``. Factory state
+    lives in the ``team``, ``stock``, ``production`` and ``disabled`` arrays,
+    indexed by factory ID, and units in flight in ``units``.
+
+    Game loop with:
+
+    while not array_board.game_over:
+        array_board.update(orders)
+    """
+    def __init__(self, board):
+        factories = board.factories
+        if sorted(fac.id for fac in factories) != list(range(len(factories))):
+            raise ValueError("ArrayGameBoard needs dense factory IDs")
+
+        # Static data is shared with the original board
+        self.board = board
+        self.num_factories = len(factories)
+
+        by_id = sorted(factories, key=lambda fac: fac.id)
+        self.team = np.array([fac.team for fac in by_id], dtype=np.int64)
+        self.stock = np.array([fac.stock for fac in by_id], dtype=np.int64)
+        self.production = np.array(
+            [fac.production for fac in by_id], dtype=np.int64
+        )
+        self.disabled = np.array(
+            [fac.disabled_turns for fac in by_id], dtype=np.int64
+        )
+
+        self.units = UnitArrays.from_units(board.troops + board.bombs)
+
+        self.remaining_bombs = np.array(
+            [board.remaining_bombs[-1], board.remaining_bombs[1]],
+            dtype=np.int64,
+        )
+        self.max_turns = board.max_turns
+        self.current_turn = board.current_turn
+        self.game_over = board.game_over
+        self.winner = board.winner
+
+    def update(self, orders=None):
+        """
+        Execute game logic for one turn
+
+        Parameters
+        ----------
+        orders : dict, optional
+            Lists of ``Order`` objects keyed by team, as in
+            ``GameBoard.orders``
+        """
+        self.current_turn += 1
+
+        occupying, bombs_arriving, remaining = advance_units(
+            self.units, self.num_factories
+        )
+        self.units = self.units.select(remaining)
+
+        if orders:
+            self.execute_orders(orders)
+
+        produce(self.team, self.stock, self.production, self.disabled)
+        resolve_battles(self.team, self.stock, occupying)
+        resolve_bombs(self.stock, self.disabled, bombs_arriving)
+
+        self.check_end_conditions()
+
+    def execute_orders(self, orders):
+        """
+        Validate and execute orders in sequence, like ``Order.validate`` and
+        ``Order.execute``. New units are collected and added in one go.
+        """
+        new_units = execute_orders(
+            orders, self.team, self.stock, self.production,
+            self.remaining_bombs, self.board.distances,
+        )
+        if new_units:
+            self.units = self.units.concatenate(UnitArrays(*zip(*new_units)))
+
+    def check_end_conditions(self):
+        """
+        Same rules as ``GameBoard.check_end_conditions``
+        """
+        for team in [-1, 1]:
+            if (self.team == team).all():
+                enemy_troops = (self.units.team == -team) \
+                    & ~self.units.is_bomb
+                if enemy_troops.any():
+                    return
+                self.winner = team
+                self.game_over = True
+
+        if self.max_turns is not None and self.current_turn >= self.max_turns:
+            self.game_over = True
+
+            team_facs = np.count_nonzero(self.team == 1) \
+                - np.count_nonzero(self.team == -1)
+            self.winner = int(np.sign(team_facs))
+
+    def to_board(self):
+        """
+        Build a ``GameBoard`` with the current state, sharing the static map
+        data of the board this was created from.
+        """
+        board = arrays_to_board(
+            self.board, self.team, self.stock, self.production,
+            self.disabled, self.units,
+        )
+        board.max_turns = self.max_turns
+        board.current_turn = self.current_turn
+        board.game_over = self.game_over
+        board.winner = self.winner
+        board.remaining_bombs = {
+            -1: int(self.remaining_bombs[0]),
+            1: int(self.remaining_bombs[1]),
+        }
+        return board
@@ -0,0 +1,220 @@
+"""
+Batched multi-game simulator.
+
+``BatchSimulator`` stacks the factory and unit arrays of many independent
+boards and advances all of them in one call, using the kernels from
+``array_engine``. Each board's factories sit in a contiguous block of the
+stacked factory arrays, so factory ``fid`` of game ``g`` is at index
+``offsets[g] + fid``.
+"""
+import numpy as np
+
+from array_engine import (
+    ArrayGameBoard, UnitArrays, advance_units, arrays_to_board,
+    execute_orders, produce, resolve_battles, resolve_bombs,
+)
+
+NO_MAX_TURNS = np.iinfo(np.int64).max
+
+
+class BatchSimulator:
+    """
+    Step many independent games at once. Finished games are masked out
+    while the others continue: their final state is kept and they ignore
+    any further orders.
+
+    Parameters
+    ----------
+    boards : list of GameBoard
+        Boards to simulate. Factory IDs must be dense, as for
+        ``ArrayGameBoard``.
+
+    Game loop with:
+
+    while not simulator.game_over:
+        simulator.update(orders)
+    """
+    def __init__(self, boards):
+        self.boards = list(boards)
+        self.num_games = len(self.boards)
+
+        games = [ArrayGameBoard(board) for board in self.boards]
+        sizes = np.array([game.num_factories for game in games])
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        self.num_factories = int(sizes.sum())
+        # Game each stacked factory belongs to
+        self.factory_game = np.repeat(np.arange(self.num_games), sizes)
+        self.factory_counts = sizes
+
+        def stack(attr):
+            return np.concatenate(
+                [getattr(game, attr) for game in games]
+                + [np.zeros(0, dtype=np.int64)]
+            )
+
+        self.team = stack("team")
+        self.stock = stack("stock")
+        self.production = stack("production")
+        self.disabled = stack("disabled")
+
+        self.units = UnitArrays()
+        for game, offset in zip(games, self.offsets):
+            units = game.units
+            units.source += offset
+            units.destination += offset
+            self.units = self.units.concatenate(units)
+
+        self.remaining_bombs = np.array(
+            [game.remaining_bombs for game in games], dtype=np.int64,
+        ).reshape(self.num_games, 2)
+        self.current_turn = np.array(
+            [game.current_turn for game in games], dtype=np.int64,
+        )
+        self.max_turns = np.array(
+            [
+                NO_MAX_TURNS if game.max_turns is None else game.max_turns
+                for game in games
+            ],
+            dtype=np.int64,
+        )
+        self.active = np.array(
+            [not game.game_over for game in games], dtype=bool,
+        )
+        self.winner = [game.winner for game in games]
+
+        # Snapshots of games as they finish
+        self.final_boards = {
+            index: board
+            for index, board in enumerate(self.boards)
+            if board.game_over
+        }
+        unit_game = self.factory_game[self.units.source]
+        self.units = self.units.select(self.active[unit_game])
+
+    @property
+    def game_over(self):
+        return not self.active.any()
+
+    def update(self, orders=None):
+        """
+        Execute game logic for one turn of every active game
+
+        Parameters
+        ----------
+        orders : list of dict, optional
+            Orders for each game, in the format of ``GameBoard.orders``. Use
+            ``None`` or an empty dict for games with no orders. Orders for
+            finished games are ignored.
+        """
+        active_factories = self.active[self.factory_game]
+        self.current_turn[self.active] += 1
+
+        occupying, bombs_arriving, remaining = advance_units(
+            self.units, self.num_factories
+        )
+        self.units = self.units.select(remaining)
+
+        if orders is not None:
+            self.execute_orders(orders)
+
+        produce(
+            self.team, self.stock, self.production, self.disabled,
+            active=active_factories,
+        )
+        resolve_battles(self.team, self.stock, occupying)
+        resolve_bombs(self.stock, self.disabled, bombs_arriving)
+
+        self.check_end_conditions()
+
+    def execute_orders(self, orders):
+        new_units = []
+        for index in np.flatnonzero(self.active):
+            game_orders = orders[index]
+            if not game_orders:
+                continue
+
+            new_units.extend(execute_orders(
+                game_orders, self.team, self.stock, self.production,
+                self.remaining_bombs[index], self.boards[index].distances,
+                offset=int(self.offsets[index]),
+            ))
+
+        if new_units:
+            self.units = self.units.concatenate(UnitArrays(*zip(*new_units)))
+
+    def check_end_conditions(self):
+        """
+        Same rules as ``GameBoard.check_end_conditions``, for every active
+        game at once. Games that finish are snapshotted and their units
+        removed from the stacked arrays.
+        """
+        def per_game(mask, game_index):
+            return np.bincount(
+                game_index[mask], minlength=self.num_games
+            )
+
+        team_one = per_game(self.team == 1, self.factory_game)
+        team_two = per_game(self.team == -1, self.factory_game)
+        all_one = team_one == self.factory_counts
+        all_two = team_two == self.factory_counts
+
+        troops = ~self.units.is_bomb
+        unit_game = self.factory_game[self.units.source]
+        one_troops = per_game(troops & (self.units.team == 1), unit_game) > 0
+        two_troops = per_game(troops & (self.units.team == -1), unit_game) > 0
+
+        # Games where one team holds everything but enemy troops remain
+        blocked = (all_one & two_troops) | (all_two & one_troops)
+        won_one = all_one & ~two_troops
+        won_two = all_two & ~one_troops
+        timed_out = (self.current_turn >= self.max_turns) & ~blocked
+
+        finished = self.active & (won_one | won_two | timed_out)
+        if not finished.any():
+            return
+
+        for index in np.flatnonzero(finished):
+            if timed_out[index]:
+                winner = int(np.sign(team_one[index] - team_two[index]))
+            else:
+                winner = 1 if won_one[index] else -1
+            self.winner[index] = winner
+
+        self.active &= ~finished
+        for index in np.flatnonzero(finished):
+            self.final_boards[index] = self._build_board(index)
+
+        self.units = self.units.select(self.active[unit_game])
+
+    def to_board(self, index):
+        """
+        Build a ``GameBoard`` with the current (or, for finished games,
+        final) state of one game
+
+        Parameters
+        ----------
+        index : int
+            Index of the game in ``boards``
+        """
+        if index in self.final_boards:
+            return self.final_boards[index]
+        return self._build_board(index)
+
+    def _build_board(self, index):
+        template = self.boards[index]
+        offset = int(self.offsets[index])
+        unit_game = self.factory_game[self.units.source]
+
+        board = arrays_to_board(
+            template, self.team, self.stock, self.production, self.disabled,
+            self.units.select(unit_game == index), offset=offset,
+        )
+        board.max_turns = template.max_turns
+        board.current_turn = int(self.current_turn[index])
+        board.game_over = not self.active[index]
+        board.winner = self.winner[index]
+        board.remaining_bombs = {
+            -1: int(self.remaining_bombs[index, 0]),
+            1: int(self.remaining_bombs[index, 1]),
+        }
+        return board
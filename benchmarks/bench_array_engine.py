@@ -0,0 +1,56 @@
+"""
+Turns per second for the object model (``GameBoard``) against the
+struct-of-arrays engine (``ArrayGameBoard``).
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_array_engine
+"""
+import time
+
+from array_engine import ArrayGameBoard
+from benchmarks.common import ring_board
+from order import Move
+
+TURNS = 200
+
+
+def send_troops(board, troops_per_factory):
+    for factory in board.factories:
+        for i in range(troops_per_factory):
+            target = board.factories[
+                (factory.id + i + 1) % len(board.factories)
+            ]
+            Move(factory.id, target.id, 1).execute(board)
+    # Keep units in flight for the whole run
+    for unit in board.troops:
+        unit.distance = TURNS + 1
+
+
+def main():
+    print("{:>10} {:>7} {:>16} {:>16}".format(
+        "factories", "units", "GameBoard t/s", "ArrayGameBoard t/s"))
+
+    for num_factories, troops_per_factory in [(15, 2), (100, 10), (1000, 10)]:
+        rates = []
+        for engine in ["object", "array"]:
+            best = float("inf")
+            for _ in range(3):
+                board = ring_board(num_factories)
+                send_troops(board, troops_per_factory)
+                if engine == "array":
+                    board = ArrayGameBoard(board)
+
+                start = time.perf_counter()
+                for _ in range(TURNS):
+                    board.update()
+                best = min(best, time.perf_counter() - start)
+
+            rates.append(TURNS / best)
+
+        print("{:>10} {:>7} {:>16.0f} {:>16.0f}".format(
+            num_factories, num_factories * troops_per_factory, *rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Board-turns per second when stepping many games one by one against stepping
+them together with ``BatchSimulator``.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_batch
+"""
+import time
+
+from batch import BatchSimulator
+from game import GameBoard
+from order import Move
+
+TURNS = 100
+
+
+def make_boards(num_games):
+    boards = []
+    for seed in range(num_games):
+        board = GameBoard(seed=seed)
+        board.init_game(max_turns=None)
+        # Some traffic between the player bases and everything else
+        for factory in board.factories:
+            for target in board.factories:
+                if factory.team != 0 and factory.id != target.id:
+                    Move(factory.id, target.id, 1).execute(board)
+        boards.append(board)
+    return boards
+
+
+def main():
+    print("{:>6} {:>18} {:>18}".format(
+        "games", "one by one t/s", "batched t/s"))
+
+    for num_games in [10, 100, 1000]:
+        boards = make_boards(num_games)
+
+        start = time.perf_counter()
+        for board in boards:
+            for _ in range(TURNS):
+                board.update()
+        single = num_games * TURNS / (time.perf_counter() - start)
+
+        simulator = BatchSimulator(make_boards(num_games))
+        start = time.perf_counter()
+        for _ in range(TURNS):
+            simulator.update()
+        batched = num_games * TURNS / (time.perf_counter() - start)
+
+        print("{:>6} {:>18.0f} {:>18.0f}".format(num_games, single, batched))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Board copies per second through JSON, ``GameBoard.clone`` and
+``GameBoard.snapshot``/``restore``.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_clone
+"""
+from benchmarks.common import best_time
+from bots import GreedyBot
+from game import GameBoard
+from order import Order
+
+NUMBER = 1000
+
+
+def mid_game_board():
+    game = GameBoard(seed=0)
+    game.init_game(num_factory_range=(15, 15))
+    bots = {team: GreedyBot(team) for team in [-1, 1]}
+    for _ in range(15):
+        for team, bot in bots.items():
+            game.orders[team] = [
+                Order.from_string(order) for order in bot.get_orders(game)
+            ]
+        game.update()
+    return game
+
+
+def main():
+    game = mid_game_board()
+    snapshot = game.snapshot()
+    print("{} factories, {} troops, {} bombs".format(
+        len(game.factories), len(game.troops), len(game.bombs)
+    ))
+
+    methods = [
+        ("to_json/from_json", lambda: GameBoard.from_json(game.to_json())),
+        ("clone", game.clone),
+        ("snapshot", game.snapshot),
+        ("restore", lambda: game.restore(snapshot)),
+    ]
+    for name, method in methods:
+        seconds = best_time(method, number=NUMBER)
+        print("{:<18} {:>10.0f} /s".format(name, 1 / seconds))
+
+
+if __name__ == "__main__":
+    main()
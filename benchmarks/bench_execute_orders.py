@@ -0,0 +1,70 @@
+"""
+Order execution per turn: ``validate`` and ``execute`` on each order in turn
+against ``GameBoard.execute_orders``, which resolves the turn's orders in
+groups.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_execute_orders
+"""
+import random
+
+from benchmarks.common import best_time, ring_board
+from order import Inc, Move, SendBomb
+
+NUMBER = 20
+
+
+def random_orders(board, num_orders, rng):
+    orders = {-1: [], 1: []}
+    for _ in range(num_orders):
+        source = rng.choice(board.factories)
+        target = rng.choice(board.factories)
+        choice = rng.random()
+        if choice < 0.85:
+            order = Move(source.id, target.id, rng.randint(1, 20))
+        elif choice < 0.9:
+            order = SendBomb(source.id, target.id)
+        else:
+            order = Inc(source.id)
+        orders[source.team].append(order)
+    return orders
+
+
+def sequential(board, orders):
+    for team, team_orders in orders.items():
+        for order in team_orders:
+            if order.validate(board, team):
+                order.execute(board)
+
+
+def grouped(board, orders):
+    board.orders = orders
+    board.execute_orders()
+
+
+def main():
+    rng = random.Random(0)
+    print("{:>8} {:>16} {:>16}".format(
+        "orders", "sequential (ms)", "grouped (ms)"
+    ))
+    for num_factories, num_orders in [(15, 30), (100, 1000), (500, 10000)]:
+        board = ring_board(num_factories, stock=1000)
+        orders = random_orders(board, num_orders, rng)
+
+        def run(method):
+            fresh = board.clone()
+            method(fresh, {team: list(o) for team, o in orders.items()})
+
+        times = [
+            best_time(lambda: run(method), number=NUMBER)
+            - best_time(lambda: board.clone(), number=NUMBER)
+            for method in [sequential, grouped]
+        ]
+        print("{:>8} {:>16.3f} {:>16.3f}".format(
+            num_orders, *(1000 * t for t in times)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Turn time as the factory count and order volume grow.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_factory_lookup
+"""
+from benchmarks.common import best_time, ring_board
+from order import Inc, Move
+
+
+def queue_orders(board, orders_per_factory):
+    for factory in board.factories:
+        for i in range(orders_per_factory):
+            target = board.factories[
+                (factory.id + i + 1) % len(board.factories)
+            ]
+            board.orders[factory.team].append(
+                Move(factory.id, target.id, 1)
+            )
+        board.orders[factory.team].append(Inc(factory.id))
+
+
+def main():
+    print("{:>10} {:>8} {:>14} {:>12}".format(
+        "factories", "orders", "turn time [us]", "us / order"))
+
+    for num_factories in [10, 100, 1000]:
+        for orders_per_factory in [1, 10]:
+            board = ring_board(num_factories)
+            num_orders = num_factories * (orders_per_factory + 1)
+
+            def turn():
+                queue_orders(board, orders_per_factory)
+                board.update()
+
+            seconds = best_time(turn, repeat=3, number=3)
+            print("{:>10} {:>8} {:>14.1f} {:>12.3f}".format(
+                num_factories,
+                num_orders,
+                seconds * 1e6,
+                seconds * 1e6 / num_orders,
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Strength of enemy troops arriving at each factory next turn: scanning
+``GameBoard.troops`` against the board's incoming index.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_incoming
+"""
+import random
+
+from benchmarks.bench_schedule import fill_board
+from benchmarks.common import best_time, ring_board
+
+NUMBER = 20
+
+
+def scan(board, turn):
+    return [
+        sum(
+            troop.strength for troop in board.troops
+            if troop.destination is factory and troop.team != factory.team
+            and troop.travelled + turn - board.current_turn == troop.distance
+        )
+        for factory in board.factories
+    ]
+
+
+def index(board, turn):
+    return [
+        board.incoming_troops(factory.id, turn)[-factory.team]
+        for factory in board.factories
+    ]
+
+
+def main():
+    rng = random.Random(0)
+    print("{:>10} {:>12} {:>12}".format(
+        "in flight", "scan (ms)", "index (ms)"
+    ))
+    for num_units in [100, 1000, 10000]:
+        board = ring_board(100, radius=50.0)
+        fill_board(board, num_units, num_units // 20, rng)
+        turn = board.current_turn + 1
+        assert scan(board, turn) == index(board, turn)
+
+        times = [
+            best_time(lambda: method(board, turn), number=NUMBER)
+            for method in [scan, index]
+        ]
+        print("{:>10} {:>12.3f} {:>12.3f}".format(
+            num_units, *(1000 * t for t in times)
+        ))
+
+
+if __name__ == "__main__":
+    main()
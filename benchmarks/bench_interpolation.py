@@ -0,0 +1,68 @@
+"""
+Unit position and heading interpolation for rendering: one NumPy calculation
+per unit, as the renderer used to do, against ``interpolate_units`` for all
+units at once.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_interpolation
+"""
+import math
+
+import numpy as np
+
+from array_engine import UnitArrays, factory_positions, interpolate_units
+from benchmarks.common import best_time, ring_board
+from order import Move
+
+NUMBER = 20
+
+
+def board_with_troops(num_troops):
+    board = ring_board(40, radius=20.0, stock=10000)
+    factories = board.factories
+    for i in range(num_troops):
+        source = factories[i % len(factories)]
+        target = factories[(i * 7 + 11) % len(factories)]
+        board.orders[source.team].append(Move(source.id, target.id, 1))
+    board.update()
+    return board
+
+
+def per_unit(board, progress):
+    result = []
+    for unit in board.troops + board.bombs:
+        position = np.array(unit.get_position())
+        direction = np.array(unit.destination.position) \
+            - np.array(unit.source.position)
+        position += direction * progress / unit.distance
+        heading = math.degrees(math.atan2(direction[0], direction[1])) + 180
+        result.append((position, heading))
+    return result
+
+
+def vectorized(board, progress):
+    return interpolate_units(
+        UnitArrays.from_units(board.troops + board.bombs),
+        factory_positions(board),
+        progress=progress,
+    )
+
+
+def main():
+    print("{:>8} {:>14} {:>14}".format(
+        "units", "per unit (ms)", "batched (ms)"
+    ))
+    for num_troops in [100, 1000, 10000]:
+        board = board_with_troops(num_troops)
+        times = [
+            best_time(lambda: method(board, 0.5), number=NUMBER)
+            for method in [per_unit, vectorized]
+        ]
+        print("{:>8} {:>14.3f} {:>14.3f}".format(
+            len(board.troops), *(1000 * t for t in times)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Board serialization round trips per second.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_json
+"""
+import json
+
+from benchmarks.bench_clone import mid_game_board
+from benchmarks.common import best_time
+from game import GameBoard
+
+NUMBER = 1000
+
+
+def uncached_to_json(game):
+    """
+    ``GameBoard.to_json`` as it was before the static data was cached, with
+    the links rebuilt on every call
+    """
+    return {
+        "seed": game.seed,
+        "links": [list(link) for link in game.links],
+        "remaining_bombs": {
+            str(k): v for k, v in game.remaining_bombs.items()
+        },
+        "game_over": game.game_over,
+        "winner": game.winner,
+        "max_turns": game.max_turns,
+        "current_turn": game.current_turn,
+        "num_factories": game.num_factories,
+        "min_dist": game.min_dist,
+        "max_dist": game.max_dist,
+        "stock_range_player": list(game.stock_range_player),
+        "stock_range_neutral": list(game.stock_range_neutral),
+        "factories": [factory.to_json() for factory in game.factories],
+        "troops": [troop.to_json() for troop in game.troops],
+        "bombs": [bomb.to_json() for bomb in game.bombs],
+    }
+
+
+def main():
+    game = mid_game_board()
+    full = json.dumps(game.to_json())
+    full_bytes = game.to_json_bytes()
+    state_bytes = game.to_json_bytes(include_static=False)
+
+    print("{} factories, {} troops".format(
+        len(game.factories), len(game.troops)))
+    print("json.dumps(to_json()):               {} bytes".format(len(full)))
+    print("to_json_bytes(include_static=False): {} bytes".format(
+        len(state_bytes)))
+
+    methods = [
+        ("json.dumps(uncached to_json())",
+            lambda: json.dumps(uncached_to_json(game))),
+        ("json.dumps(to_json())", lambda: json.dumps(game.to_json())),
+        ("to_json_bytes()", game.to_json_bytes),
+        ("to_json_bytes(static=False)",
+            lambda: game.to_json_bytes(include_static=False)),
+        ("from_json(json.loads())",
+            lambda: GameBoard.from_json(json.loads(full))),
+        ("from_json_bytes()", lambda: GameBoard.from_json_bytes(full_bytes)),
+        ("from_json_bytes(static=game)",
+            lambda: GameBoard.from_json_bytes(state_bytes, static=game)),
+    ]
+    for name, method in methods:
+        seconds = best_time(method, number=NUMBER)
+        print("{:<30} {:>10.0f} /s".format(name, 1 / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Memory per factory and unit, and turn time with many troops in flight.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_memory
+"""
+import time
+import tracemalloc
+
+from benchmarks.common import ring_board
+from factory import Factory
+from unit import Troop
+
+COUNT = 10000
+TURNS = 100
+
+
+def bytes_per_object(make):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding them
+    return (after - before) / len(objects) - 8
+
+
+def main():
+    source = Factory(0, 1, 0, 0, (0, 0))
+    destination = Factory(1, -1, 0, 0, (3, 4))
+
+    print("bytes per Factory: {:.0f}".format(
+        bytes_per_object(lambda i: Factory(0, 1, 0, 0, (0, 0)))
+    ))
+    print("bytes per Troop:   {:.0f}".format(
+        bytes_per_object(lambda i: Troop(1, source, destination, 5))
+    ))
+
+    board = ring_board(50)
+    for factory in board.factories:
+        for i in range(20):
+            target = board.factories[(factory.id + i + 1) % 50]
+            troop = Troop(1, factory, target, TURNS + 1)
+            board.troops.append(troop)
+
+    start = time.perf_counter()
+    for _ in range(TURNS):
+        board.update()
+    elapsed = time.perf_counter() - start
+    print("turn time with {} troops: {:.1f} us".format(
+        len(board.troops), elapsed / TURNS * 1e6
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Order parsing throughput: one ``Order.from_string`` call per order against
+``parse_order_line`` on a whole line, building ``Order`` objects or compact
+tuples.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_orders
+"""
+import random
+
+from benchmarks.common import best_time
+from order import Order, parse_order_line
+
+NUM_LINES = 1000
+ORDERS_PER_LINE = 20
+
+
+def random_line(rng):
+    orders = []
+    for _ in range(ORDERS_PER_LINE):
+        choice = rng.random()
+        if choice < 0.7:
+            orders.append("MOVE {} {} {}".format(
+                rng.randint(0, 14), rng.randint(0, 14), rng.randint(1, 50)
+            ))
+        elif choice < 0.8:
+            orders.append("BOMB {} {}".format(
+                rng.randint(0, 14), rng.randint(0, 14)
+            ))
+        elif choice < 0.95:
+            orders.append("INC {}".format(rng.randint(0, 14)))
+        else:
+            orders.append("WAIT")
+    return ";".join(orders)
+
+
+def per_order(lines):
+    for line in lines:
+        [Order.from_string(order) for order in line.split(";")]
+
+
+def batch(lines):
+    for line in lines:
+        parse_order_line(line)
+
+
+def batch_compact(lines):
+    for line in lines:
+        parse_order_line(line, compact=True)
+
+
+def main():
+    rng = random.Random(0)
+    lines = [random_line(rng) for _ in range(NUM_LINES)]
+    num_orders = NUM_LINES * ORDERS_PER_LINE
+
+    for name, method in [
+            ("Order.from_string", per_order),
+            ("parse_order_line", batch),
+            ("parse_order_line compact", batch_compact)]:
+        seconds = best_time(lambda: method(lines))
+        print("{:<26} {:>10.0f} orders/s".format(name, num_orders / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Map generation rate for the sequential and NumPy-batched placement paths.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_placement
+"""
+import random
+
+from benchmarks.common import best_time
+from placement import place_positions
+
+SETTINGS = [
+    # (num_factories, min_dist, max_dist)
+    (15, 1, 20),
+    (31, 1, 20),
+    (11, 3, 20),
+    (41, 1, 40),
+    (81, 1, 60),
+]
+
+
+def main():
+    print("{:>10} {:>9} {:>9} {:>12} {:>12}".format(
+        "factories", "min_dist", "max_dist", "seq maps/s", "batch maps/s"))
+
+    for num_factories, min_dist, max_dist in SETTINGS:
+        rates = []
+        for batch_size in [None, 32]:
+            random_source = random.Random(0)
+
+            def place():
+                place_positions(
+                    num_factories,
+                    min_dist,
+                    max_dist,
+                    random_source=random_source,
+                    max_attempts=100000,
+                    batch_size=batch_size,
+                )
+
+            rates.append(1.0 / best_time(place, repeat=3, number=20))
+
+        print("{:>10} {:>9} {:>9} {:>12.0f} {:>12.0f}".format(
+            num_factories, min_dist, max_dist, *rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Queries per second for "what does every factory look like in k turns if
+nobody gives any more orders": cloning the board and calling ``update`` k
+times, against ``GameBoard.project``.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_projection
+"""
+import random
+
+from benchmarks.bench_schedule import fill_board
+from benchmarks.common import best_time, ring_board
+
+NUMBER = 20
+
+
+def simulate(board, turns):
+    clone = board.clone()
+    for _ in range(turns):
+        clone.update()
+    return {fac.id: (fac.team, fac.stock) for fac in clone.factories}
+
+
+def project(board, turns):
+    return board.project(turns)
+
+
+def main():
+    rng = random.Random(0)
+    print("{:>10} {:>10} {:>6} {:>16} {:>16}".format(
+        "factories", "in flight", "turns", "simulate (q/s)", "project (q/s)"
+    ))
+    for num_factories, num_units in [(20, 50), (100, 1000), (100, 10000)]:
+        board = ring_board(num_factories, radius=float(num_factories))
+        fill_board(board, num_units, num_units // 20, rng)
+        for turns in [5, 20]:
+            assert simulate(board, turns) == project(board, turns)
+            rates = [
+                1 / best_time(lambda: method(board, turns), number=NUMBER)
+                for method in [simulate, project]
+            ]
+            print("{:>10} {:>10} {:>6} {:>16.0f} {:>16.0f}".format(
+                num_factories, num_units, turns, *rates
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Renderer frame rate with many units on screen, drawing with dirty rects or
+redrawing the whole screen every frame. Uses SDL's dummy video driver, so no
+display is needed.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_render
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from app import App  # noqa: E402
+from benchmarks.common import best_time, ring_board  # noqa: E402
+from order import Move  # noqa: E402
+
+NUMBER = 50
+
+
+def crowded_app(num_troops):
+    app = App()
+    app.game = ring_board(12, radius=9.0, stock=10000)
+    factories = app.game.factories
+    for i in range(num_troops):
+        source = factories[i % len(factories)]
+        target = factories[(i * 5 + 3) % len(factories)]
+        app.game.orders[source.team].append(Move(source.id, target.id, 1))
+        if i % len(factories) == len(factories) - 1:
+            app.game.update()
+    app.game.update()
+    return app
+
+
+def main():
+    print("{:>8} {:>12} {:>12}".format("troops", "full fps", "dirty fps"))
+    for num_troops in [10, 100, 300]:
+        app = crowded_app(num_troops)
+        app.pygame_init()
+
+        def full():
+            app._dirty_rects = None
+            app.render()
+
+        full_time = best_time(full, number=NUMBER)
+        app.render()
+        dirty_time = best_time(app.render, number=NUMBER)
+        print("{:>8} {:>12.0f} {:>12.0f}".format(
+            len(app.game.troops), 1 / full_time, 1 / dirty_time
+        ))
+        app.cleanup()
+
+
+if __name__ == "__main__":
+    main()
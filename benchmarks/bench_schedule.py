@@ -0,0 +1,60 @@
+"""
+Per-turn cost against the number of units in flight. Units move with the
+board's clock and are kept in buckets by arrival turn, so a turn only costs
+as much as the units arriving on it.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_schedule
+"""
+import random
+
+from benchmarks.common import best_time, ring_board
+from unit import Bomb, Troop
+
+NUMBER = 50
+
+
+def fill_board(board, num_units, arrivals, rng):
+    """
+    Put ``num_units`` units in flight, ``arrivals`` of them arriving next
+    turn and the rest spread over their journeys
+    """
+    for i in range(num_units):
+        source, destination = rng.sample(board.factories, 2)
+        unit_type = Bomb if rng.random() < 0.05 else Troop
+        unit = unit_type(
+            None if unit_type is Bomb else rng.randint(1, 20),
+            source, destination,
+            board.distances[source.id][destination.id],
+        )
+        unit.team = source.team
+        if i < arrivals:
+            unit.travelled = unit.distance - 1
+        else:
+            unit.travelled = rng.randrange(unit.distance - 1)
+        (board.bombs if unit_type is Bomb else board.troops).append(unit)
+    board.schedule_units()
+
+
+def turn(board):
+    board.unmake_turn(board.make_turn())
+
+
+def main():
+    rng = random.Random(0)
+    print("{:>10} {:>10} {:>16}".format(
+        "in flight", "arrivals", "make+unmake (ms)"
+    ))
+    for num_units, arrivals in [
+            (1000, 20), (10000, 20), (100000, 20), (100000, 2000)]:
+        board = ring_board(200, radius=100.0)
+        fill_board(board, num_units, arrivals, rng)
+        elapsed = best_time(lambda: turn(board), number=NUMBER)
+        print("{:>10} {:>10} {:>16.3f}".format(
+            num_units, arrivals, 1000 * elapsed
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Load test for the game server with loopback clients: matches and turns per
+second with many concurrent matches in one server process, sending full
+boards or turn deltas.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_server
+"""
+import asyncio
+import time
+
+from bots import GreedyBot, RandomBot
+from client import play_remote
+from server import GameServer
+
+MAX_TURNS = 50
+
+
+async def run(num_matches, delta):
+    server = GameServer(
+        ports=(0, 0), game_options={"max_turns": MAX_TURNS}, delta=delta,
+    )
+    await server.start()
+    port_one, port_two = server.ports
+
+    start = time.perf_counter()
+    clients = []
+    for i in range(num_matches):
+        clients.append(play_remote(GreedyBot, port=port_one, seed=i))
+        clients.append(play_remote(RandomBot, port=port_two, seed=i))
+    await asyncio.gather(*clients)
+    await server.wait_for_matches(num_matches)
+    elapsed = time.perf_counter() - start
+
+    turns = sum(match.game.current_turn for match in server.results)
+    await server.close()
+    return num_matches / elapsed, turns / elapsed
+
+
+def main():
+    print("{:>6} {:>8} {:>12} {:>12}".format(
+        "mode", "matches", "matches/s", "turns/s"
+    ))
+    for delta in [False, True]:
+        for num_matches in [1, 10, 100, 250]:
+            matches_per_second, turns_per_second = asyncio.run(
+                run(num_matches, delta)
+            )
+            print("{:>6} {:>8} {:>12.1f} {:>12.0f}".format(
+                "delta" if delta else "full", num_matches,
+                matches_per_second, turns_per_second,
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Cold start cost of the simulation core, as paid by every process-pool worker:
+time to start an interpreter and import the game modules.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_startup
+"""
+import subprocess
+import sys
+
+from benchmarks.common import best_time
+
+IMPORTS = [
+    ("interpreter only", "pass"),
+    ("game, order, bots", "import game, order, bots"),
+    ("game + numpy", "import game, numpy"),
+    ("app", "import app"),
+]
+
+
+def main():
+    for name, code in IMPORTS:
+        def start():
+            subprocess.run([sys.executable, "-c", code], check=True)
+
+        print("{:<20} {:>8.1f} ms".format(
+            name, 1000 * best_time(start, repeat=10)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import math
+import time
+
+from factory import Factory
+from game import GameBoard
+
+
+def ring_board(num_factories, radius=10.0, stock=50):
+    """
+    Build a board with ``num_factories`` factories spaced around a ring,
+    bypassing the random placement (which can't fit large factory counts).
+    Factories alternate between the two players.
+    """
+    board = GameBoard()
+    board.num_factories = num_factories
+    board.min_dist = 0
+    board.max_dist = 2 * radius + 1
+    board.stock_range_player = (stock, stock)
+    board.stock_range_neutral = (0, 0)
+    board.max_turns = None
+
+    for fid in range(num_factories):
+        angle = 2 * math.pi * fid / num_factories
+        board.factories.append(
+            Factory(
+                fid=fid,
+                team=1 if fid % 2 == 0 else -1,
+                production=1,
+                stock=stock,
+                position=(radius * math.cos(angle), radius * math.sin(angle)),
+            )
+        )
+
+    board.index_factories()
+    board.link_factories()
+    return board
+
+
+def best_time(func, repeat=5, number=1):
+    """
+    Return the best time of ``repeat`` runs of ``number`` calls to ``func``,
+    in seconds per call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
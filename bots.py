@@ -0,0 +1,135 @@
+import random
+from abc import ABC, abstractmethod
+
+
+class Bot(ABC):
+    """
+    A bot policy playing one team in one game. Bots see the game board and
+    reply with order strings, as a remote player would.
+
+    Parameters
+    ----------
+    team : int
+        -1 or 1
+    seed : int, optional
+        Seed for any randomness in the policy
+    """
+    def __init__(self, team, seed=None):
+        self.team = team
+        self.random = random.Random(seed)
+
+    def get_orders(self, game):
+        """
+        Decide this turn's orders.
+
+        Parameters
+        ----------
+        game : GameBoard
+            Current game state
+
+        Returns
+        -------
+        list of Unicode
+            Order strings, see ``Order.from_string``
+        """
+        # Use the template method pattern so we can preserve the docstring
+        return self._get_orders(game)
+
+    @abstractmethod
+    def _get_orders(self, game):
+        pass
+
+    def own_factories(self, game):
+        return [fac for fac in game.factories if fac.team == self.team]
+
+
+class WaitBot(Bot):
+    """
+    Never does anything
+    """
+    def _get_orders(self, game):
+        return ["WAIT"]
+
+
+class RandomBot(Bot):
+    """
+    Sends random amounts of troops to random factories, and occasionally
+    upgrades or bombs
+    """
+    def _get_orders(self, game):
+        orders = []
+        for factory in self.own_factories(game):
+            target = self.random.choice(game.factories)
+            choice = self.random.random()
+            if choice < 0.5:
+                count = self.random.randint(0, factory.stock)
+                orders.append("MOVE {} {} {}".format(
+                    factory.id, target.id, count
+                ))
+            elif choice < 0.6:
+                orders.append("INC {}".format(factory.id))
+            elif choice < 0.62:
+                orders.append("BOMB {} {}".format(factory.id, target.id))
+        return orders
+
+
+class GreedyBot(Bot):
+    """
+    Upgrades when it can spare the troops, and otherwise attacks the nearest
+    factory it can overwhelm
+    """
+    def _get_orders(self, game):
+        orders = []
+        for factory in self.own_factories(game):
+            available = factory.stock
+
+            if factory.production < 3 and available >= 20:
+                orders.append("INC {}".format(factory.id))
+                available -= 10
+
+            targets = [
+                fac for fac in game.factories
+                if fac.team != self.team and fac.stock < available
+            ]
+            if targets:
+                target = min(
+                    targets,
+                    key=lambda fac: game.distances[factory.id][fac.id],
+                )
+                orders.append("MOVE {} {} {}".format(
+                    factory.id, target.id, target.stock + 1
+                ))
+        return orders
+
+
+class ScriptedBot(Bot):
+    """
+    Upgrades everything, then once at full production floods every other
+    factory with troops and bombs one every ten turns. Handy for exercising
+    the game logic and renderer.
+    """
+    def _get_orders(self, game):
+        orders = []
+        for factory in self.own_factories(game):
+            orders.append("INC {}".format(factory.id))
+            if factory.production < 3:
+                continue
+
+            targets = list(game.factories)
+            self.random.shuffle(targets)
+            if game.current_turn % 10 == 0:
+                orders.append("BOMB {} {}".format(factory.id, targets[0].id))
+            for target in targets:
+                if target.id != factory.id:
+                    orders.append("MOVE {} {} {}".format(
+                        factory.id, target.id, target.stock + 1
+                    ))
+        return orders
+
+
+BOTS = {
+    "wait": WaitBot,
+    "random": RandomBot,
+    "greedy": GreedyBot,
+    "scripted": ScriptedBot,
+}
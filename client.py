@@ -0,0 +1,79 @@
+"""
+Asyncio bot client for the game server, see ``server.py`` for the protocol.
+
+Run from the repository root with, for example:
+
+    python client.py greedy --port 23833
+"""
+import argparse
+import asyncio
+import json
+
+from bots import BOTS
+from game import GameBoard
+from server import PLAYER_ONE_PORT
+
+
+async def play_remote(bot_type, host="127.0.0.1", port=PLAYER_ONE_PORT,
+                      seed=None):
+    """
+    Connect to a game server and play one game.
+
+    Parameters
+    ----------
+    bot_type : type
+        ``bots.Bot`` subclass to play with
+    host : str, optional
+    port : int, optional
+    seed : int, optional
+        Seed for the bot
+
+    Returns
+    -------
+    GameBoard
+        The final board sent by the server
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        hello = json.loads(await reader.readline())
+        bot = bot_type(hello["team"], seed=seed)
+        delta = hello.get("delta", False)
+
+        game = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if delta and game is not None:
+                game.apply_delta_json(json.loads(line))
+            else:
+                game = GameBoard.from_json_bytes(line)
+            if game.game_over:
+                break
+
+            orders = ";".join(bot.get_orders(game))
+            writer.write(orders.encode("utf-8") + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boyo in the Shell client")
+    parser.add_argument("bot", choices=sorted(BOTS))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PLAYER_ONE_PORT)
+    args = parser.parse_args()
+
+    game = asyncio.run(play_remote(BOTS[args.bot], args.host, args.port))
+    print("Winner: {}".format(game.winner))
+
+
+if __name__ == "__main__":
+    main()
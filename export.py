@@ -0,0 +1,224 @@
+"""
+Offline frame exporter.
+
+Renders a recorded game (see ``replay.py``), or a set of ``GameBoard.to_json``
+snapshots, to numbered PNG frames with the ``App`` drawing code, on
+off-screen surfaces with no display. Frames are split into chunks rendered
+in parallel on a process pool. Turn frames into a video with e.g.
+
+    ffmpeg -framerate 30 -i frames/frame_%06d.png highlights.mp4
+
+PNG compression dominates the time taken per frame. Use ``--format bmp`` for
+much faster export at the cost of disk space.
+
+Run from the repository root with, for example:
+
+    python export.py game.replay frames --frames-per-turn 10 --workers 4
+    python export.py snapshots/*.json frames
+"""
+import argparse
+import json
+import os
+import time
+
+from app import App, load_pygame
+from game import GameBoard
+from replay import MAGIC, ReplayReader
+from tournament import run_tasks
+
+FRAME_NAME = "frame_{:06d}.{}"
+IMAGE_FORMATS = ("png", "bmp", "tga", "jpg")
+
+# Chunks per worker, so faster workers pick up more of the work
+CHUNKS_PER_WORKER = 4
+
+# Renderer for this process, created on first use
+_renderer = None
+
+
+def get_renderer():
+    """
+    Return this process's off-screen ``App``, creating it on first use
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = App(game=GameBoard())
+        _renderer.offscreen_init()
+    return _renderer
+
+
+def render_frame(game, path, progress=0.0):
+    """
+    Render one frame of ``game`` to a PNG file.
+
+    Parameters
+    ----------
+    game : GameBoard
+    path : str
+    progress : float, optional
+        Fraction of the next turn gone by, to show units between turns
+    """
+    renderer = get_renderer()
+    renderer.game = game
+    renderer.timer = progress * renderer.turn_time
+    renderer.draw_frame()
+    load_pygame().image.save(renderer._display_surf, path)
+
+
+def render_replay_chunk(replay_path, out_dir, first, last, frames_per_turn,
+                        first_index, image_format="png"):
+    """
+    Render turns ``first`` to ``last`` (inclusive) of a replay, numbering
+    frames from ``first_index``. Returns the number of frames rendered.
+    """
+    index = first_index
+    with ReplayReader(replay_path) as reader:
+        for game in reader.boards(first):
+            # The last turn is only shown once, as there's no next turn to
+            # slide towards
+            steps = 1 if game.current_turn == reader.last_turn \
+                else frames_per_turn
+            for step in range(steps):
+                path = os.path.join(
+                    out_dir, FRAME_NAME.format(index, image_format)
+                )
+                render_frame(game, path, progress=step / frames_per_turn)
+                index += 1
+            if game.current_turn >= last:
+                break
+    return index - first_index
+
+
+def render_snapshot_chunk(snapshot_paths, out_dir, first_index,
+                          image_format="png"):
+    """
+    Render one frame per ``GameBoard.to_json`` snapshot file, numbering
+    frames from ``first_index``. Returns the number of frames rendered.
+    """
+    for index, snapshot_path in enumerate(snapshot_paths, first_index):
+        with open(snapshot_path) as f:
+            game = GameBoard.from_json(json.load(f))
+        path = os.path.join(out_dir, FRAME_NAME.format(index, image_format))
+        render_frame(game, path)
+    return len(snapshot_paths)
+
+
+def _chunks(items, num_chunks):
+    size = max(1, -(-len(items) // max(1, num_chunks)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _num_chunks(workers):
+    return CHUNKS_PER_WORKER * (workers or os.cpu_count() or 1)
+
+
+def export_replay(replay_path, out_dir, frames_per_turn=1, workers=None,
+                  image_format="png"):
+    """
+    Render every turn of a replay to PNG frames.
+
+    Parameters
+    ----------
+    replay_path : str
+    out_dir : str
+        Directory to write frames to. Created if it doesn't exist.
+    frames_per_turn : int, optional
+        Frames for each turn, with units sliding between turns
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs. With
+        ``workers=0`` frames are rendered in this process.
+    image_format : str, optional
+        One of ``IMAGE_FORMATS``
+
+    Returns
+    -------
+    num_frames : int
+    frames_per_second : float
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    with ReplayReader(replay_path) as reader:
+        turns = list(range(reader.first_turn, reader.last_turn + 1))
+
+    tasks = []
+    for chunk in _chunks(turns, _num_chunks(workers)):
+        first_index = (chunk[0] - turns[0]) * frames_per_turn
+        tasks.append((render_replay_chunk, (
+            replay_path, out_dir, chunk[0], chunk[-1], frames_per_turn,
+            first_index, image_format,
+        )))
+
+    start = time.perf_counter()
+    num_frames = sum(run_tasks(tasks, workers))
+    elapsed = time.perf_counter() - start
+    return num_frames, num_frames / elapsed if elapsed > 0 else 0.0
+
+
+def export_snapshots(snapshot_paths, out_dir, workers=None,
+                     image_format="png"):
+    """
+    Render ``GameBoard.to_json`` snapshot files to PNG frames, in order.
+
+    Parameters
+    ----------
+    snapshot_paths : list of str
+    out_dir : str
+    workers : int, optional
+        See ``export_replay``
+    image_format : str, optional
+        See ``export_replay``
+
+    Returns
+    -------
+    num_frames : int
+    frames_per_second : float
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    first_index = 0
+    for chunk in _chunks(list(snapshot_paths), _num_chunks(workers)):
+        tasks.append((
+            render_snapshot_chunk,
+            (chunk, out_dir, first_index, image_format),
+        ))
+        first_index += len(chunk)
+
+    start = time.perf_counter()
+    num_frames = sum(run_tasks(tasks, workers))
+    elapsed = time.perf_counter() - start
+    return num_frames, num_frames / elapsed if elapsed > 0 else 0.0
+
+
+def is_replay(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("inputs", nargs="+",
+                        help="a replay file, or board JSON snapshots")
+    parser.add_argument("out_dir")
+    parser.add_argument("--frames-per-turn", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, 0 to render in-process")
+    parser.add_argument("--format", choices=IMAGE_FORMATS, default="png",
+                        help="image format of the frames")
+    args = parser.parse_args()
+
+    if len(args.inputs) == 1 and is_replay(args.inputs[0]):
+        num_frames, fps = export_replay(
+            args.inputs[0], args.out_dir,
+            frames_per_turn=args.frames_per_turn, workers=args.workers,
+            image_format=args.format,
+        )
+    else:
+        num_frames, fps = export_snapshots(
+            args.inputs, args.out_dir, workers=args.workers,
+            image_format=args.format,
+        )
+    print("{} frames, {:.1f} frames/s".format(num_frames, fps))
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,11 @@ class Factory(Jsonizable):
     position : (float, float)
         x and y coordinates of this base
     """
+    __slots__ = (
+        "id", "team", "stock", "position", "production", "disabled_turns",
+        "occupying_troops", "bombs_arriving",
+    )
+
     def __init__(self, fid, team, production, stock, position):
         self.id = fid
 
@@ -45,12 +50,9 @@ class Factory(Jsonizable):
         self.production = production
         self.disabled_turns = 0
 
-        # List holding net strength of troops that have moved into the factory
-        # this turn
-        self.occupying_troops = {
-            -1: 0,
-            1: 0,
-        }
+        # Net strength of troops that have moved into the factory this turn,
+        # indexed by team. Index 0 (neutral) is unused.
+        self.occupying_troops = [0, 0, 0]
 
         # Number of bombs currently arriving
         self.bombs_arriving = 0
@@ -93,7 +95,9 @@ class Factory(Jsonizable):
             self.team = winner
             self.stock = abs(self.stock)
 
-        self.occupying_troops = {-1: 0, 1: 0}
+        # Reset in place rather than allocating new counters every turn
+        self.occupying_troops[-1] = 0
+        self.occupying_troops[1] = 0
 
     def resolve_bombs(self):
         """
@@ -120,23 +124,62 @@ class Factory(Jsonizable):
             self.stock -= 10
             self.production += 1
 
-    def to_json(self):
-        return {
+    def copy(self):
+        """
+        Return a copy of this factory's between-turn state. The position is
+        shared, as it never changes.
+        """
+        fac = Factory.__new__(Factory)
+        fac.id = self.id
+        fac.team = self.team
+        fac.stock = self.stock
+        fac.position = self.position
+        fac.production = self.production
+        fac.disabled_turns = self.disabled_turns
+        fac.occupying_troops = [0, 0, 0]
+        fac.bombs_arriving = 0
+        return fac
+
+    def to_json(self, include_position=True):
+        """
+        Parameters
+        ----------
+        include_position : bool, optional
+            Include the factory's position, which never changes during a game
+        """
+        obj = {
             "id": self.id,
             "team": self.team,
             "stock": self.stock,
-            "position": list(self.position),
             "disabled_turns": self.disabled_turns,
             "production": self.production,
         }
+        if include_position:
+            obj["position"] = list(self.position)
+        return obj
+
+    def to_delta_json(self):
+        """
+        The factory's per-turn state, without the position, see
+        ``GameBoard.delta_json``
+        """
+        return self.to_json(include_position=False)
 
     @classmethod
-    def from_json(cls, obj):
+    def from_json(cls, obj, position=None):
+        """
+        Parameters
+        ----------
+        obj : dict
+        position : (float, float), optional
+            Position of the factory, if it's not in ``obj``
+        """
         fac = cls(
             fid=obj["id"],
             team=obj["team"],
             production=obj["production"],
             stock=obj["stock"],
-            position=tuple(obj["position"]),
+            position=tuple(obj["position"]) if position is None else position,
         )
+        fac.disabled_turns = obj["disabled_turns"]
         return fac
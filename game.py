@@ -1,10 +1,241 @@
 import itertools
-import math
+import json
 import random
 
 from factory import Factory, factory_dist
 from jsonize import Jsonizable
-from unit import Troop, Bomb
+from order import Inc, Move, Msg, SendBomb, Wait
+from placement import DEFAULT_MAX_ATTEMPTS, place_positions
+from unit import Bomb, Clock, Troop
+
+
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# How ``GameBoard.execute_orders`` groups each order type
+_ORDER_GROUPS = {
+    Move: "stock",
+    Inc: "stock",
+    SendBomb: "bomb",
+    Wait: None,
+    Msg: None,
+}
+
+# Most arrivals in one turn that ``_remove_units`` finds by scanning
+_SCAN_ARRIVALS = 32
+
+
+class _TrackedList(list):
+    """
+    A list that notes when items are replaced or removed, which the board
+    can't see from its identity and length. Appending and extending aren't
+    tracked, so they're as fast as on a plain list.
+    """
+    __slots__ = ("changed",)
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.changed = False
+
+    def __setitem__(self, index, value):
+        self.changed = True
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self.changed = True
+        super().__delitem__(index)
+
+    def insert(self, index, value):
+        self.changed = True
+        super().insert(index, value)
+
+    def pop(self, index=-1):
+        self.changed = True
+        return super().pop(index)
+
+    def remove(self, value):
+        self.changed = True
+        super().remove(value)
+
+    def clear(self):
+        self.changed = True
+        super().clear()
+
+
+def _remove_units(units, arrived):
+    """
+    Remove arrived units from a list of units in flight, in place
+
+    Returns
+    -------
+    list of (int, Unit)
+        The arrived units with their indices before removal, in order. Units
+        that had been replaced in the list are missing.
+    """
+    if not arrived:
+        return []
+
+    # Units arriving together were mostly sent around the same time, so they
+    # sit together near the front of the list. Find them with identity scans
+    # unless that turns out to cost as much as a pass over the whole list.
+    if len(arrived) <= _SCAN_ARRIVALS:
+        removed = []
+        scanned = 0
+        for unit in arrived:
+            try:
+                index = units.index(unit)
+            except ValueError:
+                # Replaced in the list without rescheduling
+                break
+            scanned += index
+            if scanned > len(units):
+                break
+            removed.append((index, unit))
+        else:
+            removed.sort(key=lambda entry: entry[0])
+            for index, _ in reversed(removed):
+                del units[index]
+            return removed
+
+    removed = [(i, unit) for i, unit in enumerate(units) if not unit.active]
+    units[:] = [unit for unit in units if unit.active]
+    return removed
+
+
+def _restore_units(units, removed):
+    """
+    Put units taken out by ``_remove_units`` back at their indices, in place
+
+    Parameters
+    ----------
+    units : list of Unit
+    removed : list of (int, Unit)
+        As returned by ``_remove_units``
+    """
+    # Shifting the list once per unit is cheap for a few units, like the
+    # scans in ``_remove_units``. Past that, only the part of the list from
+    # the first index is rebuilt, in one go.
+    if len(removed) <= _SCAN_ARRIVALS:
+        for index, unit in removed:
+            units.insert(index, unit)
+        return
+
+    first = removed[0][0]
+    tail = units[first:]
+    merged = []
+    kept = 0
+    for index, unit in removed:
+        count = index - first - len(merged)
+        merged.extend(tail[kept:kept + count])
+        kept += count
+        merged.append(unit)
+    merged.extend(tail[kept:])
+    units[first:] = merged
+
+
+def _remove_indices(units, removed):
+    """
+    Remove the units at the indices given by ``_remove_units`` again, in
+    place
+    """
+    if len(removed) <= _SCAN_ARRIVALS:
+        for index, _ in reversed(removed):
+            del units[index]
+        return
+
+    first = removed[0][0]
+    indices = {index for index, _ in removed}
+    units[first:] = [
+        unit for index, unit in enumerate(units[first:], first)
+        if index not in indices
+    ]
+
+
+def _check_turns(turns):
+    if turns < 0:
+        raise ValueError("Can't project {} turns".format(turns))
+
+
+def _idle(factory, turns):
+    """
+    Run ``turns`` turns of a factory with nothing arriving
+    """
+    if turns <= 0:
+        return
+    idle = min(turns, factory.disabled_turns)
+    factory.disabled_turns -= idle
+    if factory.team != 0:
+        factory.stock += factory.production * (turns - idle)
+
+
+def _land(factory, entry):
+    """
+    Run one turn of a factory with an incoming index entry arriving
+    """
+    factory.bombs_arriving = entry[0]
+    factory.occupying_troops[1] = entry[1]
+    factory.occupying_troops[-1] = entry[-1]
+    factory.produce()
+    factory.resolve_battles()
+    factory.resolve_bombs()
+
+
+class TurnDelta:
+    """
+    Changes made to a board by one turn, recorded by ``GameBoard.make_turn``.
+
+    Attributes
+    ----------
+    turn : int
+        The turn number after the turn was made
+    factories : list of (int, tuple, tuple)
+        Factory ID, and (team, stock, production, disabled_turns) before and
+        after the turn, for each factory that changed
+    arrived_troops, arrived_bombs : list of (int, Unit)
+        Units that reached their destination, with their index in the unit
+        list before the turn
+    spawned_troops, spawned_bombs : list of Unit
+        Units created by orders this turn
+    orders : list of (int, Order)
+        Valid orders executed this turn, with the team that gave them
+    remaining_bombs : (dict, dict)
+        Bombs left per team before and after the turn
+    result : ((bool, int), (bool, int))
+        ``game_over`` and ``winner`` before and after the turn
+    """
+    def __init__(self):
+        self.turn = None
+        self.factories = []
+        self.arrived_troops = []
+        self.arrived_bombs = []
+        self.spawned_troops = []
+        self.spawned_bombs = []
+        self.orders = []
+        self.remaining_bombs = None
+        self.result = None
+
+        self._factories_before = None
+
+    def record_before(self, game):
+        self._factories_before = [
+            (fac.team, fac.stock, fac.production, fac.disabled_turns)
+            for fac in game.factories
+        ]
+        self.remaining_bombs = (dict(game.remaining_bombs), None)
+        self.result = ((game.game_over, game.winner), None)
+
+    def record_after(self, game):
+        self.turn = game.current_turn
+
+        for fac, before in zip(game.factories, self._factories_before):
+            after = (fac.team, fac.stock, fac.production, fac.disabled_turns)
+            if after != before:
+                self.factories.append((fac.id, before, after))
+        self._factories_before = None
+
+        self.remaining_bombs = (
+            self.remaining_bombs[0], dict(game.remaining_bombs)
+        )
+        self.result = (self.result[0], (game.game_over, game.winner))
 
 
 class GameBoard(Jsonizable):
@@ -15,17 +246,47 @@ class GameBoard(Jsonizable):
 
     while not game_board.game_over:
         game_board.update()
+
+    Parameters
+    ----------
+    seed : int, optional
+        Seed for the board's random number generator. Boards with the same
+        seed and ``init_game`` arguments are identical. Drawn from the global
+        ``random`` module if not given.
     """
-    def __init__(self):
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        # Every random choice the board makes comes from its own generator,
+        # so boards can be generated in parallel and replayed exactly
+        self.random = random.Random(seed)
+
         self.factories = []
-        self.links = []
+        # Dense factory table indexed by factory ID, see ``index_factories``
+        self.factory_table = []
+        self._indexed_factories = (self.factories, 0)
+        # Factory-factory travel times, indexed by factory ID
+        self.distances = ()
+        self._links = None
+        # Serialized static data, see ``static_json``
+        self._static_json = None
+        self._static_bytes = None
         self.troops = []
         self.bombs = []
+        # Turn counter shared with the units in flight, see ``Unit.clock``
+        self.clock = Clock()
+        # Units in flight by the turn they arrive on, see ``update``
+        self._arrivals = {}
+        # Arrival turn -> factory ID -> what's arriving there, see
+        # ``incoming_troops``
+        self._incoming = {}
+        self._scheduled = None
         self.remaining_bombs = {-1: 2, 1: 2}
         self.orders = {-1: [], 1: []}
         self.game_over = False
+        self.winner = None
         self.max_turns = None
-        self.current_turn = 0
 
     def init_game(
             self,
@@ -34,41 +295,68 @@ class GameBoard(Jsonizable):
             max_dist=20,
             stock_range_player=(15, 30),
             stock_range_neutral=(0, 10),
-            max_turns=200):
-        self.num_factories = random.randint(*num_factory_range)
+            max_turns=200,
+            max_placement_attempts=DEFAULT_MAX_ATTEMPTS,
+            placement_batch_size=None):
+        self.num_factories = self.random.randint(*num_factory_range)
         self.min_dist = min_dist
         self.max_dist = max_dist
         self.stock_range_player = stock_range_player
         self.stock_range_neutral = stock_range_neutral
         self.max_turns = max_turns
 
-        self.place_factories()
+        self.place_factories(
+            max_attempts=max_placement_attempts,
+            batch_size=placement_batch_size,
+        )
+        self.index_factories()
         self.link_factories()
 
-    def place_factories(self):
+    def place_factories(self, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                        batch_size=None):
         """
         Randomize the factory locations, respecting min and max distances.
         Enforce rotational symmetry. If we have an odd number of factories
         place a neutral one in the middle.
+
+        Parameters
+        ----------
+        max_attempts : int, optional
+            Maximum number of candidate factory pairs to try
+        batch_size : int, optional
+            If given, generate candidate positions in NumPy batches of this
+            size, using a NumPy ``Generator`` seeded from the board's
+            generator. See ``placement.place_positions``.
+
+        Raises
+        ------
+        ValueError
+            If the factories can't be placed within ``max_attempts``
         """
+        positions = place_positions(
+            self.num_factories,
+            self.min_dist,
+            self.max_dist,
+            random_source=self.random,
+            max_attempts=max_attempts,
+            batch_size=batch_size,
+        )
+
+        factories = []
         if self.num_factories % 2 == 1:
-            self.factories.append(
+            factories.append(
                 Factory(
                     fid=0,
                     team=0,
                     production=self.random_production(),
                     stock=self.random_stock(neutral=True),
-                    position=(0, 0),
+                    position=positions[0],
                 )
             )
 
-        def new_factory_pair(neutral):
-            # Generate a new factory in one hemisphere.
-            dist = random.random() * self.max_dist/2.0
-            angle = random.random() * math.pi
-
-            pos_x = math.cos(angle) * dist
-            pos_y = math.sin(angle) * dist
+        for pos_x, pos_y in positions[len(factories)::2]:
+            # The first pair are the player bases, the rest are neutral
+            neutral = len(factories) >= 2
 
             stock = self.random_stock(neutral=neutral)
 
@@ -79,60 +367,387 @@ class GameBoard(Jsonizable):
 
             team = 0 if neutral else 1
 
-            start_id = len(self.factories)
-            new_factory = Factory(
-                fid=start_id,
-                team=team,
-                production=production,
-                stock=stock,
-                position=(pos_x, pos_y)
+            start_id = len(factories)
+            factories.append(
+                Factory(
+                    fid=start_id,
+                    team=team,
+                    production=production,
+                    stock=stock,
+                    position=(pos_x, pos_y)
+                )
             )
-            rotated_factory = Factory(
-                fid=start_id+1,
-                team=-team,
-                production=production,
-                stock=stock,
-                position=(-pos_x, -pos_y)
+            factories.append(
+                Factory(
+                    fid=start_id+1,
+                    team=-team,
+                    production=production,
+                    stock=stock,
+                    position=(-pos_x, -pos_y)
+                )
             )
 
-            return [new_factory, rotated_factory]
-
-        def all_links_ok(factories):
-            """
-            Returns true if all distances are between min_dist and max_dist.
-            TODO: This is a very lazy implementation that should be improved.
-            """
-            for a, b in itertools.combinations(factories, 2):
-                if not self.min_dist < factory_dist(a, b) < self.max_dist:
-                    return False
-            return True
-
-        # Randomize player bases
-        while len(self.factories) < 2:
-            factories = self.factories + new_factory_pair(neutral=False)
-            if all_links_ok(factories):
-                self.factories = factories
-
-        # Fill the rest with neutrals
-        while len(self.factories) < self.num_factories:
-            factories = self.factories + new_factory_pair(neutral=True)
-            if all_links_ok(factories):
-                self.factories = factories
-
-    def link_factories(self):
-        """
-        Create a list of factory-factory distances, mainly for exporting to
-        JSON
-        """
-        self.links = []
-        for a, b in itertools.combinations(self.factories, 2):
-            dist = factory_dist(a, b)
-            self.links.append(
-                (a.id, b.id, dist)
-            )
-            self.links.append(
-                (b.id, a.id, dist)
-            )
+        self.factories = factories
+
+    def link_factories(self, links=None):
+        """
+        Build the immutable distance matrix between factories. It's computed
+        once per board, so ``distances[a][b]`` is the number of turns it takes
+        to get from factory ``a`` to factory ``b``.
+
+        Parameters
+        ----------
+        links : list, optional
+            Known (source ID, destination ID, distance) links, e.g. from JSON,
+            to fill the matrix from instead of the factory positions
+        """
+        size = max((fac.id for fac in self.factories), default=-1) + 1
+        rows = [[0] * size for _ in range(size)]
+        if links is None:
+            for a, b in itertools.combinations(self.factories, 2):
+                dist = factory_dist(a, b)
+                rows[a.id][b.id] = dist
+                rows[b.id][a.id] = dist
+        else:
+            for source, destination, dist in links:
+                rows[source][destination] = dist
+
+        self.distances = tuple(tuple(row) for row in rows)
+        self._links = None if links is None \
+            else [tuple(link) for link in links]
+        self._static_json = None
+        self._static_bytes = None
+
+    @property
+    def links(self):
+        """
+        List of (source ID, destination ID, distance) factory links, mainly
+        for exporting to JSON. Derived from the distance matrix on first use.
+        """
+        if self._links is None:
+            self._links = []
+            for a, b in itertools.combinations(self.factories, 2):
+                dist = self.distances[a.id][b.id]
+                self._links.append(
+                    (a.id, b.id, dist)
+                )
+                self._links.append(
+                    (b.id, a.id, dist)
+                )
+        return self._links
+
+    def index_factories(self):
+        """
+        Rebuild the dense factory table used by ``get_factory``. Factory IDs
+        are small non-negative integers, so the table is a list with the
+        factory at the position of its ID and ``None`` in any gaps.
+        """
+        size = max((fac.id for fac in self.factories), default=-1) + 1
+        self.factory_table = [None] * size
+        for factory in self.factories:
+            self.factory_table[factory.id] = factory
+
+        self._indexed_factories = (self.factories, len(self.factories))
+        self.factories.changed = False
+
+    def _check_index(self):
+        indexed, count = self._indexed_factories
+        factories = self._factories
+        if indexed is not factories or count != len(factories) \
+                or factories.changed:
+            # The factory list was replaced or changed since indexing
+            self.index_factories()
+
+    @property
+    def factories(self):
+        return self._factories
+
+    @factories.setter
+    def factories(self, factories):
+        self._factories = _TrackedList(factories)
+
+    @property
+    def troops(self):
+        return self._troops
+
+    @troops.setter
+    def troops(self, troops):
+        self._troops = _TrackedList(troops)
+
+    @property
+    def bombs(self):
+        return self._bombs
+
+    @bombs.setter
+    def bombs(self, bombs):
+        self._bombs = _TrackedList(bombs)
+
+    @property
+    def current_turn(self):
+        return self.clock.turn
+
+    @current_turn.setter
+    def current_turn(self, turn):
+        # Renumber the turns without moving the units in flight
+        shift = turn - self.clock.turn
+        for unit in itertools.chain(self.troops, self.bombs):
+            if unit.clock is self.clock:
+                unit.spawn_turn += shift
+        self.clock.turn = turn
+        self._scheduled = None
+
+    def schedule_units(self):
+        """
+        Rebuild the arrival schedule from ``troops`` and ``bombs``. Units in
+        flight are kept in buckets by the turn they arrive on, so a turn only
+        has to look at the units arriving on it. Units that aren't on this
+        board's clock are moved onto it, keeping how far they've travelled.
+
+        This is done automatically when ``troops`` or ``bombs`` is replaced,
+        changes length or has units replaced or removed, and when a unit's
+        ``travelled`` is set. Call it after any other change to the units in
+        flight, such as changing a unit's strength, team or destination.
+        """
+        clock = self.clock
+        self._arrivals = {}
+        self._incoming = {}
+        for unit in itertools.chain(self.troops, self.bombs):
+            if unit.clock is not clock:
+                travelled = unit.travelled
+                unit.clock = clock
+                unit.travelled = travelled
+            self._schedule(unit)
+        clock.moved = False
+        self._mark_scheduled()
+
+    def _mark_scheduled(self):
+        troops = self._troops
+        bombs = self._bombs
+        troops.changed = bombs.changed = False
+        self._scheduled = (troops, len(troops), bombs, len(bombs))
+
+    def _check_schedule(self):
+        scheduled = self._scheduled
+        troops = self._troops
+        bombs = self._bombs
+        if scheduled is None \
+                or self.clock.moved \
+                or troops.changed \
+                or bombs.changed \
+                or scheduled[0] is not troops \
+                or scheduled[1] != len(troops) \
+                or scheduled[2] is not bombs \
+                or scheduled[3] != len(bombs):
+            # Units were moved by hand, or the unit lists were replaced or
+            # changed since scheduling
+            self.schedule_units()
+
+    def _schedule(self, unit):
+        turn = unit.arrival_turn
+        self._arrivals.setdefault(turn, []).append(unit)
+
+        # Number of bombs, then troop strength indexed by team like
+        # ``Factory.occupying_troops``
+        incoming = self._incoming.setdefault(turn, {})
+        entry = incoming.get(unit.destination.id)
+        if entry is None:
+            entry = incoming[unit.destination.id] = [0, 0, 0]
+        if isinstance(unit, Bomb):
+            entry[0] += 1
+        elif unit.team:
+            entry[unit.team] += unit.strength
+
+    def _unschedule(self, unit):
+        turn = unit.arrival_turn
+        bucket = self._arrivals[turn]
+        bucket.remove(unit)
+        if not bucket:
+            del self._arrivals[turn]
+
+        incoming = self._incoming[turn]
+        entry = incoming[unit.destination.id]
+        if isinstance(unit, Bomb):
+            entry[0] -= 1
+        elif unit.team:
+            entry[unit.team] -= unit.strength
+        if entry == [0, 0, 0]:
+            del incoming[unit.destination.id]
+            if not incoming:
+                del self._incoming[turn]
+
+    def incoming_troops(self, factory_id, turn=None):
+        """
+        Strength of the troops in flight to a factory, by team
+
+        Parameters
+        ----------
+        factory_id : int
+        turn : int, optional
+            Only count troops arriving on this turn. By default every troop
+            in flight to the factory is counted.
+
+        Returns
+        -------
+        dict
+            Strength for teams -1 and 1
+        """
+        strength = {-1: 0, 1: 0}
+        for entry in self._incoming_entries(factory_id, turn):
+            strength[-1] += entry[-1]
+            strength[1] += entry[1]
+        return strength
+
+    def incoming_bombs(self, factory_id, turn=None):
+        """
+        Number of bombs in flight to a factory
+
+        Parameters
+        ----------
+        factory_id : int
+        turn : int, optional
+            Only count bombs arriving on this turn. By default every bomb in
+            flight to the factory is counted.
+        """
+        return sum(
+            entry[0] for entry in self._incoming_entries(factory_id, turn)
+        )
+
+    def incoming_turns(self, factory_id):
+        """
+        Turns on which troops or bombs in flight arrive at a factory, in
+        order
+
+        Parameters
+        ----------
+        factory_id : int
+
+        Returns
+        -------
+        list of int
+        """
+        self.get_factory(factory_id)
+        self._check_schedule()
+        return sorted(
+            turn for turn, incoming in self._incoming.items()
+            if factory_id in incoming
+        )
+
+    def project(self, turns, factory_ids=None):
+        """
+        Predict the factories ``turns`` turns from now if no more orders are
+        given. Nothing else affects a factory but the units already on their
+        way to it, so each factory is projected on its own from the incoming
+        index, jumping straight over the turns nothing arrives on. The result
+        is the same as cloning the board and calling ``update`` ``turns``
+        times.
+
+        Parameters
+        ----------
+        turns : int
+        factory_ids : list of int, optional
+            Factories to project, by default all of them
+
+        Returns
+        -------
+        dict
+            Factory ID -> (team, stock)
+
+        Raises
+        ------
+        ValueError
+            If ``turns`` is negative or a factory doesn't exist
+        """
+        _check_turns(turns)
+        if factory_ids is None:
+            factories = self.factories
+        else:
+            factories = [self.get_factory(fid) for fid in factory_ids]
+
+        self._check_schedule()
+        now = self.clock.turn
+        # Arrivals within the horizon for each factory
+        events = {factory.id: [] for factory in factories}
+        for turn, incoming in self._incoming.items():
+            if now < turn <= now + turns:
+                for fac_id, entry in incoming.items():
+                    if fac_id in events:
+                        events[fac_id].append((turn, entry))
+
+        projected = {}
+        for factory in factories:
+            fac = factory.copy()
+            turn = now
+            for arrival_turn, entry in sorted(events[fac.id]):
+                _idle(fac, arrival_turn - turn - 1)
+                _land(fac, entry)
+                turn = arrival_turn
+            _idle(fac, now + turns - turn)
+            projected[fac.id] = (fac.team, fac.stock)
+        return projected
+
+    def factory_timeline(self, factory_id, turns):
+        """
+        Predict a factory's team and stock on each of the next ``turns``
+        turns if no more orders are given, see ``project``
+
+        Parameters
+        ----------
+        factory_id : int
+        turns : int
+
+        Returns
+        -------
+        list of (int, int)
+            Team and stock after each turn
+
+        Raises
+        ------
+        ValueError
+            If ``turns`` is negative or the factory doesn't exist
+        """
+        _check_turns(turns)
+        fac = self.get_factory(factory_id).copy()
+        self._check_schedule()
+        now = self.clock.turn
+
+        timeline = []
+        for turn in range(now + 1, now + turns + 1):
+            entry = self._incoming.get(turn, {}).get(factory_id)
+            if entry is None:
+                _idle(fac, 1)
+            else:
+                _land(fac, entry)
+            timeline.append((fac.team, fac.stock))
+        return timeline
+
+    def _incoming_entries(self, factory_id, turn):
+        self.get_factory(factory_id)
+        self._check_schedule()
+        if turn is not None:
+            entry = self._incoming.get(turn, {}).get(factory_id)
+            return [] if entry is None else [entry]
+        return [
+            incoming[factory_id] for incoming in self._incoming.values()
+            if factory_id in incoming
+        ]
+
+    def add_unit(self, unit):
+        """
+        Send a troop or bomb, leaving on the current turn
+
+        Parameters
+        ----------
+        unit : Unit
+        """
+        self._check_schedule()
+        unit.clock = self.clock
+        unit.spawn_turn = self.clock.turn
+        if isinstance(unit, Bomb):
+            self.bombs.append(unit)
+        else:
+            self.troops.append(unit)
+        self._schedule(unit)
+        self._mark_scheduled()
 
     def get_factory(self, factory_id):
         """
@@ -141,50 +756,100 @@ class GameBoard(Jsonizable):
         Parameters
         ----------
         factory_id : int
+
+        Raises
+        ------
+        ValueError
+            If there's no factory with that ID
         """
-        for factory in self.factories:
-            if factory.id == factory_id:
-                return factory
-        else:
+        self._check_index()
+        return self._lookup_factory(factory_id)
+
+    def _lookup_factory(self, factory_id):
+        # ``get_factory`` without checking the index is up to date, for
+        # callers that check it once for many lookups
+        try:
+            factory = self.factory_table[factory_id] if factory_id >= 0 \
+                else None
+        except (IndexError, TypeError):
+            factory = None
+
+        if factory is None:
             msg = "Factory {} not found"
             raise ValueError(msg.format(factory_id))
 
+        return factory
+
     def random_production(self):
         """
         Convenience method to return a random initial production for a factory.
         Currently does not depend on any property of the factory or game board.
         """
-        return random.randint(0, 3)
+        return self.random.randint(0, 3)
 
     def random_stock(self, neutral):
         """
         Convenience method to return a random initial factory stock.
         """
         if neutral:
-            return random.randint(*self.stock_range_neutral)
+            return self.random.randint(*self.stock_range_neutral)
         else:
-            return random.randint(*self.stock_range_player)
+            return self.random.randint(*self.stock_range_player)
 
-    def update(self):
+    def update(self, delta=None):
         """
         Execute game logic for one turn
+
+        Parameters
+        ----------
+        delta : TurnDelta, optional
+            If given, record the changes made this turn into it so they can
+            be undone with ``unmake_turn``
         """
-        self.current_turn += 1
+        if delta is not None:
+            delta.record_before(self)
 
-        for troop in self.troops:
-            troop.move()
+        self._check_schedule()
+        self.clock.turn += 1
 
-        self.troops = [troop for troop in self.troops if troop.active]
+        # Units in flight move with the clock, so only the units arriving
+        # this turn need any work. What they bring to each factory is already
+        # totalled up in the incoming index.
+        self._check_index()
+        table = self.factory_table
+        for fac_id, entry in self._incoming.pop(self.clock.turn, {}).items():
+            factory = table[fac_id]
+            factory.bombs_arriving += entry[0]
+            factory.occupying_troops[1] += entry[1]
+            factory.occupying_troops[-1] += entry[-1]
 
-        for bomb in self.bombs:
-            bomb.move()
-        self.bombs = [bomb for bomb in self.bombs if bomb.active]
+        arrived_troops = []
+        arrived_bombs = []
+        for unit in self._arrivals.pop(self.clock.turn, ()):
+            unit.active = False
+            if isinstance(unit, Bomb):
+                arrived_bombs.append(unit)
+            else:
+                arrived_troops.append(unit)
 
-        for team, orders in self.orders.items():
-            for order in orders:
-                if order.validate(self, team):
-                    order.execute(self)
-        self.orders = {-1: [], 1: []}
+        num_arrived = len(arrived_troops) + len(arrived_bombs)
+        arrived_troops = _remove_units(self.troops, arrived_troops)
+        arrived_bombs = _remove_units(self.bombs, arrived_bombs)
+        if delta is not None:
+            delta.arrived_troops = arrived_troops
+            delta.arrived_bombs = arrived_bombs
+        self._mark_scheduled()
+        if len(arrived_troops) + len(arrived_bombs) != num_arrived:
+            # Arrived units had been taken out of the lists by other means
+            self._scheduled = None
+
+        num_troops = len(self.troops)
+        num_bombs = len(self.bombs)
+        self.execute_orders(delta)
+
+        if delta is not None:
+            delta.spawned_troops = self.troops[num_troops:]
+            delta.spawned_bombs = self.bombs[num_bombs:]
 
         for factory in self.factories:
             factory.produce()
@@ -193,6 +858,216 @@ class GameBoard(Jsonizable):
 
         self.check_end_conditions()
 
+        if delta is not None:
+            delta.record_after(self)
+        self._mark_scheduled()
+
+    def execute_orders(self, delta=None):
+        """
+        Validate and execute the pending orders of both teams, then clear
+        them.
+
+        The results are the same as calling ``validate`` and ``execute`` on
+        each order in turn, but the work is done per turn rather than per
+        order. Orders are grouped by type, and factories are looked up once.
+        Ownership is checked for each group, and bombs are checked against
+        the team's budget in one go. Each factory's stock is then drained by
+        its moves and upgrades in the order they were given, and the new
+        units are added together. Turns with order types other than those
+        in ``order.py`` are executed one order at a time.
+
+        Parameters
+        ----------
+        delta : TurnDelta, optional
+            Record the valid orders into it
+        """
+        for team, orders in self.orders.items():
+            if all(type(order) in _ORDER_GROUPS for order in orders):
+                valid = self._execute_grouped(team, orders)
+            else:
+                valid = self._execute_sequential(team, orders)
+            if delta is not None:
+                delta.orders.extend((team, order) for order in valid)
+        self.orders = {-1: [], 1: []}
+
+    def _execute_sequential(self, team, orders):
+        valid = []
+        for order in orders:
+            if order.validate(self, team):
+                order.execute(self)
+                valid.append(order)
+        return valid
+
+    def _execute_grouped(self, team, orders):
+        self._check_index()
+        self._check_schedule()
+        lookup = self._lookup_factory
+
+        # Sort into groups, resolving factories once per order. Moves and
+        # upgrades both use stock, so they share a group.
+        stock_orders = []
+        bomb_orders = []
+        valid = [False] * len(orders)
+        for i, order in enumerate(orders):
+            group = _ORDER_GROUPS[type(order)]
+            if group == "stock":
+                if type(order) is Move:
+                    source = lookup(order.source)
+                    destination = lookup(order.destination)
+                    if source is destination or not order.valid_count():
+                        continue
+                else:
+                    source = lookup(order.target)
+                    destination = None
+                stock_orders.append((i, source, destination))
+            elif group == "bomb":
+                source = lookup(order.source)
+                destination = lookup(order.destination)
+                if source is not destination:
+                    bomb_orders.append((i, source, destination))
+            else:
+                valid[i] = True
+
+        # Only factories owned by the team can give orders
+        stock_orders = [
+            entry for entry in stock_orders if entry[1].team == team
+        ]
+        bomb_orders = [
+            entry for entry in bomb_orders if entry[1].team == team
+        ][:self.remaining_bombs[team]]
+        self.remaining_bombs[team] -= len(bomb_orders)
+
+        # Drain each factory's stock in order
+        by_factory = {}
+        for entry in stock_orders:
+            by_factory.setdefault(entry[1].id, []).append(entry)
+
+        strengths = {}
+        for entries in by_factory.values():
+            factory = entries[0][1]
+            stock = factory.stock
+            for i, _, destination in entries:
+                valid[i] = True
+                if destination is None:
+                    factory.stock = stock
+                    factory.upgrade()
+                    stock = factory.stock
+                    continue
+                strength = min(stock, orders[i].count)
+                if strength:
+                    stock -= strength
+                    strengths[i] = strength
+            factory.stock = stock
+
+        distances = self.distances
+        clock = self.clock
+        troops = [
+            Troop(
+                strengths[i], source, destination,
+                distances[source.id][destination.id], clock,
+            )
+            for i, source, destination in stock_orders
+            if i in strengths
+        ]
+        for i, source, destination in bomb_orders:
+            valid[i] = True
+        bombs = [
+            Bomb(
+                None, source, destination,
+                distances[source.id][destination.id], clock,
+            )
+            for _, source, destination in bomb_orders
+        ]
+        for unit in itertools.chain(troops, bombs):
+            self._schedule(unit)
+        self.troops.extend(troops)
+        self.bombs.extend(bombs)
+        self._mark_scheduled()
+
+        return [order for order, ok in zip(orders, valid) if ok]
+
+    def make_turn(self):
+        """
+        Execute one turn with the pending orders, like ``update``, and return
+        a ``TurnDelta`` that can undo it
+        """
+        delta = TurnDelta()
+        self.update(delta)
+        return delta
+
+    def unmake_turn(self, delta):
+        """
+        Undo a turn made with ``make_turn``. Turns must be undone in reverse
+        order. Pending orders are cleared.
+
+        Parameters
+        ----------
+        delta : TurnDelta
+        """
+        if delta.turn != self.current_turn:
+            msg = "Can't undo turn {} on turn {}"
+            raise ValueError(msg.format(delta.turn, self.current_turn))
+
+        self._check_schedule()
+        for units, spawned, arrived in [
+                (self.troops, delta.spawned_troops, delta.arrived_troops),
+                (self.bombs, delta.spawned_bombs, delta.arrived_bombs)]:
+            del units[len(units) - len(spawned):]
+            for unit in spawned:
+                self._unschedule(unit)
+            _restore_units(units, arrived)
+            for _, unit in arrived:
+                unit.active = True
+                self._schedule(unit)
+
+        for fac_id, before, _ in delta.factories:
+            fac = self.get_factory(fac_id)
+            fac.team, fac.stock, fac.production, fac.disabled_turns = before
+
+        self.remaining_bombs = dict(delta.remaining_bombs[0])
+        self.game_over, self.winner = delta.result[0]
+        self.clock.turn -= 1
+        self._mark_scheduled()
+        self.orders = {-1: [], 1: []}
+
+    def redo_turn(self, delta):
+        """
+        Reapply a turn undone with ``unmake_turn`` without re-running the
+        game logic
+
+        Parameters
+        ----------
+        delta : TurnDelta
+        """
+        if delta.turn != self.current_turn + 1:
+            msg = "Can't redo turn {} on turn {}"
+            raise ValueError(msg.format(delta.turn, self.current_turn))
+
+        self._check_schedule()
+        self.clock.turn += 1
+        for units, spawned, arrived in [
+                (self.troops, delta.spawned_troops, delta.arrived_troops),
+                (self.bombs, delta.spawned_bombs, delta.arrived_bombs)]:
+            _remove_indices(units, arrived)
+            for _, unit in arrived:
+                unit.active = False
+                self._unschedule(unit)
+            for unit in spawned:
+                unit.clock = self.clock
+                unit.spawn_turn = self.clock.turn
+                unit.active = True
+                self._schedule(unit)
+            units.extend(spawned)
+
+        for fac_id, _, after in delta.factories:
+            fac = self.get_factory(fac_id)
+            fac.team, fac.stock, fac.production, fac.disabled_turns = after
+
+        self.remaining_bombs = dict(delta.remaining_bombs[1])
+        self.game_over, self.winner = delta.result[1]
+        self._mark_scheduled()
+        self.orders = {-1: [], 1: []}
+
     def check_end_conditions(self):
         fac_teams = [fac.team for fac in self.factories]
 
@@ -217,80 +1092,333 @@ class GameBoard(Jsonizable):
 
             if team_facs[-1] > team_facs[1]:
                 self.winner = -1
-            elif team_facs[1] > team_facs[1]:
+            elif team_facs[1] > team_facs[-1]:
                 self.winner = 1
             else:
                 self.winner = 0
 
-    def to_json(self):
-        obj = {}
+    def clone(self):
+        """
+        Return an independent copy of the board for search. Static data
+        (factory positions, distances, links, settings and the random
+        generator, which is only used to set up the board) is shared with
+        this board and only the per-turn state is copied. Pending orders are
+        not copied.
+        """
+        board = GameBoard.__new__(GameBoard)
+        board.__dict__.update(self.__dict__)
+
+        board.factories = [factory.copy() for factory in self.factories]
+        board.index_factories()
+        table = board.factory_table
+        board.clock = Clock(self.clock.turn)
+        clock = board.clock
+        board.troops = [troop.copy(table, clock) for troop in self.troops]
+        board.bombs = [bomb.copy(table, clock) for bomb in self.bombs]
+        board.schedule_units()
+        board.remaining_bombs = dict(self.remaining_bombs)
+        board.orders = {-1: [], 1: []}
 
-        obj["links"] = [list(link) for link in self.links]
-        obj["remaining_bombs"] = {
-            str(k): v for k, v in self.remaining_bombs.items()
-        }
-        obj["game_over"] = self.game_over
-        obj["max_turns"] = self.max_turns
-        obj["current_turn"] = self.current_turn
+        return board
+
+    def snapshot(self):
+        """
+        Return the per-turn state of the board as nested tuples, to be put
+        back later with ``restore``. Cheaper than ``clone`` when a search
+        only needs to rewind a single board.
+        """
+        factories = tuple(
+            (fac.team, fac.stock, fac.production, fac.disabled_turns)
+            for fac in self.factories
+        )
+        units = tuple(
+            (
+                type(unit), unit.strength, unit.source.id,
+                unit.destination.id, unit.team, unit.distance, unit.travelled,
+            )
+            for unit in self.troops + self.bombs
+        )
+        return (
+            factories,
+            units,
+            len(self.troops),
+            tuple(self.remaining_bombs.items()),
+            self.current_turn,
+            self.game_over,
+            self.winner,
+        )
+
+    def restore(self, snapshot):
+        """
+        Put back the state saved by ``snapshot``. The snapshot must be from
+        this board (or a clone of it). Pending orders are cleared.
+        """
+        (
+            factories, units, num_troops, remaining_bombs, current_turn,
+            self.game_over, self.winner,
+        ) = snapshot
+        # The units are all replaced, so there's nothing to renumber
+        self.clock.turn = current_turn
+
+        for fac, state in zip(self.factories, factories):
+            fac.team, fac.stock, fac.production, fac.disabled_turns = state
+
+        table = self.factory_table
+        restored = []
+        for unit_type, strength, source, destination, team, distance, \
+                travelled in units:
+            unit = unit_type.__new__(unit_type)
+            unit.strength = strength
+            unit.active = True
+            unit.source = table[source]
+            unit.destination = table[destination]
+            unit.team = team
+            unit.distance = distance
+            unit.clock = self.clock
+            unit.travelled = travelled
+            restored.append(unit)
+
+        self.troops = restored[:num_troops]
+        self.bombs = restored[num_troops:]
+        self.schedule_units()
+        self.remaining_bombs = dict(remaining_bombs)
+        self.orders = {-1: [], 1: []}
+
+    def static_json(self):
+        """
+        JSON for the parts of the board that never change during a game: the
+        seed, settings and factory links. Computed once and cached, so the
+        returned object is shared and must not be modified.
+        """
+        if self._static_json is None:
+            self._static_json = {
+                "seed": self.seed,
+                "links": [list(link) for link in self.links],
+                "num_factories": self.num_factories,
+                "min_dist": self.min_dist,
+                "max_dist": self.max_dist,
+                "stock_range_player": list(self.stock_range_player),
+                "stock_range_neutral": list(self.stock_range_neutral),
+            }
+        return self._static_json
 
-        obj["num_factories"] = self.num_factories
-        obj["min_dist"] = self.min_dist
-        obj["max_dist"] = self.max_dist
-        obj["stock_range_player"] = list(self.stock_range_player)
-        obj["stock_range_neutral"] = list(self.stock_range_neutral)
-        obj["max_turns"] = self.max_turns
+    def state_json(self, include_positions=True):
+        """
+        JSON for the per-turn state of the board
 
-        obj["factories"] = [factory.to_json() for factory in self.factories]
-        obj["troops"] = [troop.to_json() for troop in self.troops]
-        obj["bombs"] = [bomb.to_json() for bomb in self.bombs]
+        Parameters
+        ----------
+        include_positions : bool, optional
+            Include factory positions, which never change during a game
+        """
+        return {
+            "remaining_bombs": {
+                str(k): v for k, v in self.remaining_bombs.items()
+            },
+            "game_over": self.game_over,
+            "winner": self.winner,
+            "max_turns": self.max_turns,
+            "current_turn": self.current_turn,
+            "factories": [
+                factory.to_json(include_positions)
+                for factory in self.factories
+            ],
+            "troops": [troop.to_json() for troop in self.troops],
+            "bombs": [bomb.to_json() for bomb in self.bombs],
+        }
 
+    def to_json(self, include_static=True):
+        """
+        Parameters
+        ----------
+        include_static : bool, optional
+            Include the static map data (see ``static_json``) and factory
+            positions. Boards serialized without it need a ``static`` board to
+            deserialize.
+        """
+        obj = self.state_json(include_static)
+        if include_static:
+            obj.update(self.static_json())
         return obj
 
+    def to_json_bytes(self, include_static=True):
+        """
+        Serialize the board straight to compact JSON bytes. The static part
+        is encoded once per board and reused.
+
+        Parameters
+        ----------
+        include_static : bool, optional
+            See ``to_json``
+        """
+        state = _COMPACT_ENCODER.encode(
+            self.state_json(include_static)
+        ).encode("utf-8")
+        if not include_static:
+            return state
+
+        if self._static_bytes is None:
+            self._static_bytes = _COMPACT_ENCODER.encode(
+                self.static_json()
+            ).encode("utf-8")
+        return self._static_bytes[:-1] + b"," + state[1:]
+
+    def delta_json(self, delta):
+        """
+        JSON for the changes made by the turn just played, for a client that
+        has the board from before the turn (see ``apply_delta_json``). Only
+        factories that changed and units that arrived or were sent are
+        included, so it's much smaller than ``to_json``.
+
+        Parameters
+        ----------
+        delta : TurnDelta
+            As returned by ``make_turn`` for the last turn
+        """
+        return {
+            "turn": delta.turn,
+            "factories": [
+                self.get_factory(fac_id).to_delta_json()
+                for fac_id, _, _ in delta.factories
+            ],
+            "arrived_troops": [index for index, _ in delta.arrived_troops],
+            "arrived_bombs": [index for index, _ in delta.arrived_bombs],
+            "spawned_troops": [
+                troop.to_delta_json() for troop in delta.spawned_troops
+            ],
+            "spawned_bombs": [
+                bomb.to_delta_json() for bomb in delta.spawned_bombs
+            ],
+            "remaining_bombs": {
+                str(k): v for k, v in self.remaining_bombs.items()
+            },
+            "game_over": self.game_over,
+            "winner": self.winner,
+        }
+
+    def delta_json_bytes(self, delta):
+        """
+        ``delta_json`` as compact JSON bytes
+        """
+        return _COMPACT_ENCODER.encode(self.delta_json(delta)).encode("utf-8")
+
+    def apply_delta_json(self, obj):
+        """
+        Advance the board by one turn from ``delta_json``, without running
+        the game logic
+
+        Parameters
+        ----------
+        obj : dict
+            As returned by ``delta_json``, for the turn after the current one
+        """
+        delta = TurnDelta()
+        delta.turn = obj["turn"]
+        delta.factories = [
+            (fac["id"], None, (
+                fac["team"], fac["stock"], fac["production"],
+                fac["disabled_turns"],
+            ))
+            for fac in obj["factories"]
+        ]
+        delta.arrived_troops = [
+            (index, self.troops[index]) for index in obj["arrived_troops"]
+        ]
+        delta.arrived_bombs = [
+            (index, self.bombs[index]) for index in obj["arrived_bombs"]
+        ]
+
+        for spawned, unit_type, key in [
+                (delta.spawned_troops, Troop, "spawned_troops"),
+                (delta.spawned_bombs, Bomb, "spawned_bombs")]:
+            for unit_json in obj[key]:
+                unit = unit_type(
+                    unit_json["strength"],
+                    self.get_factory(unit_json["source"]),
+                    self.get_factory(unit_json["destination"]),
+                    unit_json["distance"],
+                )
+                unit.team = unit_json["team"]
+                spawned.append(unit)
+
+        delta.remaining_bombs = (None, {
+            int(k): v for k, v in obj["remaining_bombs"].items()
+        })
+        delta.result = (None, (obj["game_over"], obj["winner"]))
+        self.redo_turn(delta)
+
     @classmethod
-    def from_json(cls, obj):
-        board = cls()
+    def from_json(cls, obj, static=None):
+        """
+        Parameters
+        ----------
+        obj : dict
+            As returned by ``to_json``
+        static : GameBoard, optional
+            A board from the same game to share static map data with.
+            Required if ``obj`` was serialized with ``include_static=False``.
+        """
+        if static is None:
+            board = cls(seed=obj.get("seed"))
+            board.num_factories = obj["num_factories"]
+            board.min_dist = obj["min_dist"]
+            board.max_dist = obj["max_dist"]
+            board.stock_range_player = tuple(obj["stock_range_player"])
+            board.stock_range_neutral = tuple(obj["stock_range_neutral"])
+        else:
+            board = cls.__new__(cls)
+            board.__dict__.update(static.__dict__)
+            board.orders = {-1: [], 1: []}
+            board.troops = []
+            board.bombs = []
+            board.clock = Clock()
 
-        board.links = [tuple(link) for link in obj["links"]]
-        board.remaining_bombs = obj["remaining_bombs"]
+        board.remaining_bombs = {
+            int(k): v for k, v in obj["remaining_bombs"].items()
+        }
         board.game_over = obj["game_over"]
+        board.winner = obj.get("winner")
         board.max_turns = obj["max_turns"]
         board.current_turn = obj["current_turn"]
 
-        board.num_factories = obj["num_factories"]
-        board.min_dist = obj["min_dist"]
-        board.max_dist = obj["max_dist"]
-        board.stock_range_player = tuple(obj["stock_range_player"])
-        board.stock_range_neutral = tuple(obj["stock_range_neutral"])
-        board.max_turns = obj["max_turns"]
-
-        board.factories = [
-            Factory.from_json(fac) for fac in obj["factories"]
-        ]
+        if static is None:
+            board.factories = [
+                Factory.from_json(fac) for fac in obj["factories"]
+            ]
+            board.index_factories()
+            board.link_factories(links=obj.get("links"))
+        else:
+            board.factories = [
+                Factory.from_json(
+                    fac, position=static.get_factory(fac["id"]).position
+                )
+                for fac in obj["factories"]
+            ]
+            board.index_factories()
 
-        board.troops = []
-        for troop_json in obj["troops"]:
-            troop = Troop(
-                troop_json["strength"],
-                board.get_factory(troop_json["source"]),
-                board.get_factory(troop_json["destination"]),
-            )
-            troop.active = troop_json["active"]
-            troop.team = troop_json["team"]
-            troop.distance = troop_json["distance"]
-            troop.travelled = troop_json["travelled"]
-            board.troops.append(troop)
-
-        board.bombs = []
-        for bomb_json in obj["bombs"]:
-            bomb = Bomb(
-                bomb_json["strength"],
-                board.get_factory(bomb_json["source"]),
-                board.get_factory(bomb_json["destination"]),
-            )
-            bomb.active = bomb_json["active"]
-            bomb.team = bomb_json["team"]
-            bomb.distance = bomb_json["distance"]
-            bomb.travelled = bomb_json["travelled"]
-            board.bombs.append(bomb)
+        for units, unit_type, key in [
+                ("troops", Troop, "troops"), ("bombs", Bomb, "bombs")]:
+            unit_list = []
+            for unit_json in obj[key]:
+                unit = unit_type(
+                    unit_json["strength"],
+                    board.get_factory(unit_json["source"]),
+                    board.get_factory(unit_json["destination"]),
+                    unit_json["distance"],
+                    board.clock,
+                )
+                unit.active = unit_json["active"]
+                unit.team = unit_json["team"]
+                unit.travelled = unit_json["travelled"]
+                unit_list.append(unit)
+            setattr(board, units, unit_list)
+        board.schedule_units()
 
         return board
+
+    @classmethod
+    def from_json_bytes(cls, data, static=None):
+        """
+        Deserialize a board from JSON bytes, see ``from_json``
+        """
+        return cls.from_json(json.loads(data), static=static)
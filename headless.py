@@ -0,0 +1,144 @@
+"""
+Headless game runner.
+
+Plays games between two bots as fast as possible, with no display and
+without importing pygame, and prints summary stats. Handy for CI and for
+running simulations on machines without a display.
+
+Run from the repository root with, for example:
+
+    python headless.py scripted greedy --games 100 --workers 4
+"""
+import argparse
+import json
+import statistics
+import time
+
+from bots import BOTS
+from tournament import play_game, run_tasks
+
+
+def run_games(bot_one, bot_two, num_games, seed=0, workers=0,
+              game_options=None):
+    """
+    Play a number of games between the same two bots.
+
+    Parameters
+    ----------
+    bot_one : str
+        Name (see ``bots.BOTS``) of the bot playing team 1
+    bot_two : str
+        Name of the bot playing team -1
+    num_games : int
+    seed : int, optional
+        Base seed. Game ``i`` is seeded with ``seed + 2 * i``.
+    workers : int, optional
+        Number of worker processes, or 0 to play in this process
+    game_options : dict, optional
+        Keyword arguments for ``GameBoard.init_game``
+
+    Returns
+    -------
+    results : list of dict
+        Result of each game, see ``tournament.play_game``
+    elapsed : float
+        Wall time in seconds
+    """
+    seeds = [seed + 2 * i for i in range(num_games)]
+
+    start = time.perf_counter()
+    results = run_tasks(
+        [
+            (play_game, (bot_one, bot_two, game_seed, game_options))
+            for game_seed in seeds
+        ],
+        workers,
+    )
+    elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+
+def summarize(results, elapsed):
+    """
+    Summary stats for a set of games
+
+    Parameters
+    ----------
+    results : list of dict
+        As returned by ``run_games``
+    elapsed : float
+        Wall time taken to play them, in seconds
+
+    Returns
+    -------
+    dict
+    """
+    turns = [result["turns"] for result in results]
+    winners = [result["winner"] for result in results]
+    total_turns = sum(turns)
+    return {
+        "games": len(results),
+        "team_one_wins": winners.count(1),
+        "team_two_wins": winners.count(-1),
+        "draws": winners.count(0),
+        "mean_turns": statistics.mean(turns) if turns else 0.0,
+        "min_turns": min(turns, default=0),
+        "max_turns": max(turns, default=0),
+        "invalid_orders": sum(result["invalid_orders"] for result in results),
+        "seconds": elapsed,
+        "games_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "turns_per_second": total_turns / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def format_summary(bot_one, bot_two, summary):
+    lines = [
+        "{} (team 1) vs {} (team -1), {} games".format(
+            bot_one, bot_two, summary["games"]
+        ),
+        "wins: {} {}, {} {}, draws {}".format(
+            bot_one, summary["team_one_wins"],
+            bot_two, summary["team_two_wins"],
+            summary["draws"],
+        ),
+        "turns: mean {:.1f}, min {}, max {}".format(
+            summary["mean_turns"], summary["min_turns"], summary["max_turns"]
+        ),
+        "invalid orders: {}".format(summary["invalid_orders"]),
+        "{:.2f} s, {:.1f} games/s, {:.0f} turns/s".format(
+            summary["seconds"], summary["games_per_second"],
+            summary["turns_per_second"],
+        ),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("bot_one", choices=sorted(BOTS),
+                        help="bot playing team 1")
+    parser.add_argument("bot_two", choices=sorted(BOTS),
+                        help="bot playing team -1")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="worker processes, 0 to play in-process")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--json", action="store_true",
+                        help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    results, elapsed = run_games(
+        args.bot_one, args.bot_two, args.games, seed=args.seed,
+        workers=args.workers, game_options={"max_turns": args.max_turns},
+    )
+    summary = summarize(results, elapsed)
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(format_summary(args.bot_one, args.bot_two, summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ class Jsonizable(ABC):
     Class to serialize and deserialize game objects BETWEEN TURNS.
     No mid-turn data (e.g. orders, occupying troops, etc) should be relied on.
     """
+    # Let subclasses use __slots__
+    __slots__ = ()
 
     @abstractmethod
     def to_json(self):
@@ -18,7 +20,12 @@ class Jsonizable(ABC):
 
 
 def json_encoder(obj):
+    """
+    ``default`` hook for ``json.dump`` and ``json.dumps``, e.g.
+
+    json.dumps(game_board, default=json_encoder)
+    """
     if isinstance(obj, Jsonizable):
-        return obj._to_json()
+        return obj.to_json()
     else:
-        raise ValueError("Cannot encode an object that isn't Jsonizable")
+        raise TypeError("Cannot encode an object that isn't Jsonizable")
@@ -1,6 +1,47 @@
 from abc import ABC, abstractmethod
 from unit import Bomb, Troop
 
+# Number of arguments of each order keyword. MSG takes free text instead.
+_ORDER_ARITY = {
+    "MOVE": 3,
+    "BOMB": 2,
+    "INC": 1,
+    "WAIT": 0,
+}
+
+
+def _parse(order_string):
+    """
+    Split an order string into its keyword and arguments, e.g.
+    "MOVE 1 2 10" --> ("MOVE", (1, 2, 10))
+
+    Raises
+    ------
+    ValueError
+        If the order is invalid
+    """
+    tokens = order_string.split()
+    if not tokens:
+        raise ValueError("Empty order.")
+
+    keyword = tokens[0].upper()
+    if keyword == "MSG":
+        # Messages keep their text as-is, apart from surrounding whitespace
+        # such as the newline ending a line of orders
+        parts = order_string.split(None, 1)
+        return keyword, (parts[1].strip() if len(parts) > 1 else "",)
+
+    arity = _ORDER_ARITY.get(keyword)
+    if arity is None:
+        raise ValueError("Order {} unknown.".format(keyword))
+
+    args = tokens[1:]
+    # Checking all the arguments at once is much faster than trying int()
+    # on each one
+    if len(args) != arity or (args and not "".join(args).isdecimal()):
+        raise ValueError("Wrong arguments for order {}.".format(keyword))
+    return keyword, tuple(map(int, args))
+
 
 class Order(ABC):
     def validate(self, game, team):
@@ -41,6 +82,21 @@ class Order(ABC):
     def _execute(self, move):
         pass
 
+    def to_string(self):
+        """
+        Return the order string for this order, the inverse of
+        ``from_string``.
+
+        Returns
+        -------
+        Unicode
+        """
+        return self._to_string()
+
+    @abstractmethod
+    def _to_string(self):
+        pass
+
     @classmethod
     def from_string(_, order_string):
         """
@@ -48,7 +104,7 @@ class Order(ABC):
 
         "MOVE 1 2 10" --> ``Move(source=1, destination=2, count=10)``
 
-        "BOMB 3 4" --> ``Bomb(soure=3, destination=4)``
+        "BOMB 3 4" --> ``SendBomb(source=3, destination=4)``
 
         "INC 2" --> ``Inc(target=2)``
 
@@ -63,34 +119,11 @@ class Order(ABC):
         Raises
         ------
         ValueError
-            If the order is invalid
+            If the order is invalid. Arguments other than messages must be
+            non-negative integers.
         """
-        str_order = order_string.split()[0].upper()
-        str_args = order_string.split()[1:]
-
-        args = []
-        for arg in str_args:
-            try:
-                new_arg = int(arg)
-            except ValueError:
-                new_arg = arg
-
-            args.append(new_arg)
-
-        possible_orders = {
-            "MOVE": Move,
-            "BOMB": Bomb,
-            "INC": Inc,
-            "WAIT": Wait,
-            "MSG": Msg,
-        }
-
-        if str_order in possible_orders:
-            order = possible_orders[str_order]
-        else:
-            raise ValueError("Order {} unknown.".format(str_order))
-
-        return order(args)
+        keyword, args = _parse(order_string)
+        return ORDER_TYPES[keyword](*args)
 
 
 class Move(Order):
@@ -104,18 +137,25 @@ class Move(Order):
     destination : int
         Destination factory ID
     count : int
-        Number of troops to move
+        Number of troops to move. Must not be negative.
     """
     def __init__(self, source, destination, count):
         self.source = source
         self.destination = destination
         self.count = count
 
+    def valid_count(self):
+        """
+        Whether the troop count is a whole number of troops that can be sent
+        and written back as an order string
+        """
+        return isinstance(self.count, int) and self.count >= 0
+
     def _validate(self, game, team):
         source_factory = game.get_factory(self.source)
         target_factory = game.get_factory(self.destination)
 
-        if team == game.get_factory(self.source).team \
+        if team == source_factory.team and self.valid_count() \
                 and source_factory.id != target_factory.id:
             return True
         else:
@@ -132,8 +172,18 @@ class Move(Order):
 
         target_factory = game.get_factory(self.destination)
 
-        new_troop = Troop(troop_strength, source_factory, target_factory)
-        game.troops.append(new_troop)
+        new_troop = Troop(
+            troop_strength,
+            source_factory,
+            target_factory,
+            game.distances[source_factory.id][target_factory.id],
+        )
+        game.add_unit(new_troop)
+
+    def _to_string(self):
+        return "MOVE {} {} {}".format(
+            self.source, self.destination, self.count
+        )
 
 
 class SendBomb(Order):
@@ -156,7 +206,7 @@ class SendBomb(Order):
         target_factory = game.get_factory(self.destination)
 
         different_factory = source_factory.id != target_factory.id
-        right_team = team == game.get_factory(self.source).team
+        right_team = team == source_factory.team
         enough_bombs = game.remaining_bombs[team] > 0
 
         if right_team and enough_bombs and different_factory:
@@ -169,8 +219,13 @@ class SendBomb(Order):
         target = game.get_factory(self.destination)
 
         game.remaining_bombs[factory.team] -= 1
-        new_bomb = Bomb(None, factory, target)
-        game.bombs.append(new_bomb)
+        new_bomb = Bomb(
+            None, factory, target, game.distances[factory.id][target.id]
+        )
+        game.add_unit(new_bomb)
+
+    def _to_string(self):
+        return "BOMB {} {}".format(self.source, self.destination)
 
 
 class Inc(Order):
@@ -195,6 +250,9 @@ class Inc(Order):
         factory = game.get_factory(self.target)
         factory.upgrade()
 
+    def _to_string(self):
+        return "INC {}".format(self.target)
+
 
 class Wait(Order):
     """
@@ -209,6 +267,9 @@ class Wait(Order):
     def _execute(self, game):
         pass
 
+    def _to_string(self):
+        return "WAIT"
+
 
 class Msg(Order):
     """
@@ -227,3 +288,54 @@ class Msg(Order):
 
     def _execute(self, game):
         pass  # TODO: implement
+
+    def _to_string(self):
+        return "MSG {}".format(self.message).rstrip()
+
+
+ORDER_TYPES = {
+    "MOVE": Move,
+    "BOMB": SendBomb,
+    "INC": Inc,
+    "WAIT": Wait,
+    "MSG": Msg,
+}
+
+
+def parse_order_line(line, compact=False):
+    """
+    Parse a line of orders separated by semicolons, e.g.
+    "MOVE 1 2 10;BOMB 3 4;INC 2". Blank orders are skipped.
+
+    Parameters
+    ----------
+    line : Unicode
+    compact : bool, optional
+        Return orders as tuples of the keyword and arguments, e.g.
+        ``("MOVE", 1, 2, 10)``, rather than ``Order`` objects
+
+    Returns
+    -------
+    orders : list of Order or tuple
+        Valid orders, in order
+    errors : list of (int, Unicode, Unicode)
+        Position in the line, order string and error message of each invalid
+        order
+    """
+    orders = []
+    errors = []
+    for index, order_string in enumerate(line.split(";")):
+        order_string = order_string.strip()
+        if not order_string:
+            continue
+        try:
+            keyword, args = _parse(order_string)
+        except ValueError as err:
+            errors.append((index, order_string, str(err)))
+            continue
+
+        if compact:
+            orders.append((keyword,) + args)
+        else:
+            orders.append(ORDER_TYPES[keyword](*args))
+    return orders, errors
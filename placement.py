@@ -0,0 +1,177 @@
+import math
+import random
+
+DEFAULT_MAX_ATTEMPTS = 10000
+
+
+def pair_ok(pos, placed, min_dist, max_dist):
+    """
+    Return True if a factory at ``pos`` and its rotated twin at ``-pos`` are
+    a valid distance from each other and from every placed position.
+
+    Distances are truncated to whole turns the same way as
+    ``factory.factory_dist``.
+
+    Parameters
+    ----------
+    pos : (float, float)
+        Candidate position
+    placed : list of (float, float)
+        Positions of factories already on the board
+    min_dist : int
+        All distances must be strictly greater than this
+    max_dist : int
+        All distances must be strictly less than this
+    """
+    x, y = pos
+    if not min_dist < int(math.sqrt((2*x)**2 + (2*y)**2)) < max_dist:
+        return False
+
+    for (px, py) in placed:
+        if not min_dist < int(math.sqrt((x-px)**2 + (y-py)**2)) < max_dist:
+            return False
+        if not min_dist < int(math.sqrt((-x-px)**2 + (-y-py)**2)) < max_dist:
+            return False
+
+    return True
+
+
+def random_candidate(random_source, max_dist):
+    """
+    Return a random position in the upper hemisphere of the board
+    """
+    dist = random_source.random() * max_dist/2.0
+    angle = random_source.random() * math.pi
+    return (math.cos(angle) * dist, math.sin(angle) * dist)
+
+
+def place_positions(
+        num_factories,
+        min_dist,
+        max_dist,
+        random_source=random,
+        max_attempts=DEFAULT_MAX_ATTEMPTS,
+        batch_size=None):
+    """
+    Randomize factory positions with rotational symmetry, respecting min and
+    max distances. If ``num_factories`` is odd, the first position is the
+    middle of the board. The rest come in pairs ``(x, y), (-x, -y)``.
+
+    Placement is incremental: a candidate pair is only checked against the
+    factories already placed, never the whole board.
+
+    Parameters
+    ----------
+    num_factories : int
+        Total number of factories to place
+    min_dist : int
+        All factory distances must be strictly greater than this
+    max_dist : int
+        All factory distances must be strictly less than this
+    random_source : random.Random, optional
+        Source of randomness. The global ``random`` module by default.
+    max_attempts : int, optional
+        Maximum number of candidate pairs to try before giving up
+    batch_size : int, optional
+        If given, generate and check candidates in NumPy batches of this size
+
+    Returns
+    -------
+    list of (float, float)
+
+    Raises
+    ------
+    ValueError
+        If the positions can't be placed within ``max_attempts`` candidates
+    """
+    if not min_dist + 1 < max_dist:
+        msg = "No whole-turn distance is between min_dist {} and max_dist {}"
+        raise ValueError(msg.format(min_dist, max_dist))
+
+    placed = [(0, 0)] if num_factories % 2 == 1 else []
+
+    if batch_size is None:
+        attempts = _place_sequential(
+            placed, num_factories, min_dist, max_dist, random_source,
+            max_attempts,
+        )
+    else:
+        attempts = _place_batched(
+            placed, num_factories, min_dist, max_dist, random_source,
+            max_attempts, batch_size,
+        )
+
+    if len(placed) < num_factories:
+        msg = (
+            "Could only place {} of {} factories with distances between {} "
+            "and {} after {} attempts"
+        )
+        raise ValueError(msg.format(
+            len(placed), num_factories, min_dist, max_dist, attempts
+        ))
+
+    return placed
+
+
+def _place_sequential(
+        placed, num_factories, min_dist, max_dist, random_source,
+        max_attempts):
+    attempts = 0
+    while len(placed) < num_factories and attempts < max_attempts:
+        attempts += 1
+        pos = random_candidate(random_source, max_dist)
+        if pair_ok(pos, placed, min_dist, max_dist):
+            placed.append(pos)
+            placed.append((-pos[0], -pos[1]))
+    return attempts
+
+
+def _place_batched(
+        placed, num_factories, min_dist, max_dist, random_source,
+        max_attempts, batch_size):
+    import numpy as np
+
+    generator = np.random.default_rng(random_source.getrandbits(64))
+
+    def in_range(sq_dist):
+        # Truncate to whole turns like ``factory_dist``
+        turns = np.sqrt(sq_dist).astype(np.int64)
+        return (min_dist < turns) & (turns < max_dist)
+
+    attempts = 0
+    while len(placed) < num_factories and attempts < max_attempts:
+        size = min(batch_size, max_attempts - attempts)
+        dist = generator.random(size) * max_dist/2.0
+        angle = generator.random(size) * math.pi
+        xs = np.cos(angle) * dist
+        ys = np.sin(angle) * dist
+
+        # Candidates against their own twins and every placed factory
+        ok = in_range((2*xs)**2 + (2*ys)**2)
+        if placed:
+            placed_arr = np.array(placed)
+            px = placed_arr[:, 0]
+            py = placed_arr[:, 1]
+            ok &= in_range(
+                (xs[:, None] - px)**2 + (ys[:, None] - py)**2
+            ).all(axis=1)
+            ok &= in_range(
+                (-xs[:, None] - px)**2 + (-ys[:, None] - py)**2
+            ).all(axis=1)
+
+        # Candidates that passed still need checking against pairs accepted
+        # earlier in this batch
+        num_placed = len(placed)
+        used = size
+        for index in np.flatnonzero(ok):
+            pos = (float(xs[index]), float(ys[index]))
+            if pair_ok(pos, placed[num_placed:], min_dist, max_dist):
+                placed.append(pos)
+                placed.append((-pos[0], -pos[1]))
+                if len(placed) >= num_factories:
+                    used = index + 1
+                    break
+
+        attempts += int(used)
+
+    return attempts
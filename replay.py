@@ -0,0 +1,386 @@
+"""
+Streaming binary replay format.
+
+A replay file is the magic bytes followed by length-prefixed records, each a
+``RECORD`` header (record kind, payload length) and the payload:
+
+- ``HEADER``: JSON with the static map, ``GameBoard.static_json`` and the
+  factory positions. Written once, first.
+- ``KEYFRAME``: the turn number then the JSON of ``GameBoard.to_json``
+  without the static map. Written at the start and every
+  ``keyframe_interval`` turns, so readers can seek without replaying the
+  whole game.
+- ``TURN``: a packed ``TurnDelta`` for one turn (see ``encode_turn``).
+
+Records are only ever appended, so a game can be recorded as it's played and
+a file cut off mid-record is still readable up to the last full record.
+"""
+import json
+import mmap
+import struct
+
+from factory import Factory
+from game import GameBoard, TurnDelta
+from order import Order
+from unit import Bomb, Troop
+
+MAGIC = b"BOYOREP2"
+
+HEADER = 0
+KEYFRAME = 1
+TURN = 2
+
+RECORD = struct.Struct("<BI")
+TURN_NUMBER = struct.Struct("<I")
+# turn, game_over, winner, bombs left for -1 and 1, then the number of
+# changed factories, arrived troops, arrived bombs and spawned units
+TURN_HEADER = struct.Struct("<I?bbbHHHH")
+# id, team, stock, production, disabled_turns
+FACTORY = struct.Struct("<HbiBB")
+INDEX = struct.Struct("<I")
+# is_bomb, source, destination, team, strength, distance
+SPAWN = struct.Struct("<?HHbiH")
+
+NO_WINNER = -128
+
+
+def encode_turn(delta):
+    """
+    Pack a ``TurnDelta`` into bytes.
+
+    Parameters
+    ----------
+    delta : TurnDelta
+
+    Returns
+    -------
+    bytes
+    """
+    game_over, winner = delta.result[1]
+    remaining_bombs = delta.remaining_bombs[1]
+    spawned = delta.spawned_troops + delta.spawned_bombs
+
+    parts = [TURN_HEADER.pack(
+        delta.turn,
+        game_over,
+        NO_WINNER if winner is None else winner,
+        remaining_bombs[-1],
+        remaining_bombs[1],
+        len(delta.factories),
+        len(delta.arrived_troops),
+        len(delta.arrived_bombs),
+        len(spawned),
+    )]
+
+    for fac_id, _, (team, stock, production, disabled) in delta.factories:
+        parts.append(FACTORY.pack(fac_id, team, stock, production, disabled))
+
+    for index, _ in delta.arrived_troops + delta.arrived_bombs:
+        parts.append(INDEX.pack(index))
+
+    for unit in spawned:
+        parts.append(SPAWN.pack(
+            isinstance(unit, Bomb),
+            unit.source.id,
+            unit.destination.id,
+            unit.team,
+            unit.strength or 0,
+            unit.distance,
+        ))
+
+    # JSON rather than one order per line, as messages can contain newlines
+    orders = [[team, order.to_string()] for team, order in delta.orders]
+    parts.append(json.dumps(orders).encode("utf-8"))
+
+    return b"".join(parts)
+
+
+def decode_turn(payload, game):
+    """
+    Unpack a turn into a ``TurnDelta`` that can be applied to ``game`` with
+    ``GameBoard.redo_turn``. Factory states before the turn aren't stored, so
+    the delta can't be used with ``unmake_turn``.
+
+    Parameters
+    ----------
+    payload : bytes
+        As returned by ``encode_turn``
+    game : GameBoard
+        The game as it was before the turn
+    """
+    (
+        turn, game_over, winner, bombs_one, bombs_two, num_factories,
+        num_arrived_troops, num_arrived_bombs, num_spawned,
+    ) = TURN_HEADER.unpack_from(payload)
+    offset = TURN_HEADER.size
+
+    delta = TurnDelta()
+    delta.turn = turn
+    delta.result = (None, (game_over, None if winner == NO_WINNER else winner))
+    delta.remaining_bombs = (None, {-1: bombs_one, 1: bombs_two})
+
+    for _ in range(num_factories):
+        fac_id, *after = FACTORY.unpack_from(payload, offset)
+        delta.factories.append((fac_id, None, tuple(after)))
+        offset += FACTORY.size
+
+    for units, arrived, count in [
+            (game.troops, delta.arrived_troops, num_arrived_troops),
+            (game.bombs, delta.arrived_bombs, num_arrived_bombs)]:
+        for _ in range(count):
+            (index,) = INDEX.unpack_from(payload, offset)
+            arrived.append((index, units[index]))
+            offset += INDEX.size
+
+    for _ in range(num_spawned):
+        is_bomb, source, destination, team, strength, distance = \
+            SPAWN.unpack_from(payload, offset)
+        offset += SPAWN.size
+
+        if is_bomb:
+            unit_type, strength, spawned = Bomb, None, delta.spawned_bombs
+        else:
+            unit_type, spawned = Troop, delta.spawned_troops
+        unit = unit_type(
+            strength,
+            game.get_factory(source),
+            game.get_factory(destination),
+            distance,
+        )
+        unit.team = team
+        spawned.append(unit)
+
+    for team, order_string in json.loads(bytes(payload[offset:])):
+        delta.orders.append((team, Order.from_string(order_string)))
+
+    return delta
+
+
+def header_json(game):
+    """
+    JSON for the parts of a game that never change: ``GameBoard.static_json``
+    and the factory positions
+    """
+    header = dict(game.static_json())
+    header["positions"] = [
+        [fac.id, list(fac.position)] for fac in game.factories
+    ]
+    return header
+
+
+def static_board(header):
+    """
+    Build a board with the static map from a replay header, for keyframes to
+    be deserialized against. Its per-turn state is meaningless.
+    """
+    board = GameBoard(seed=header["seed"])
+    board.num_factories = header["num_factories"]
+    board.min_dist = header["min_dist"]
+    board.max_dist = header["max_dist"]
+    board.stock_range_player = tuple(header["stock_range_player"])
+    board.stock_range_neutral = tuple(header["stock_range_neutral"])
+    board.factories = [
+        Factory(fid, 0, 0, 0, tuple(position))
+        for fid, position in header["positions"]
+    ]
+    board.index_factories()
+    board.link_factories(links=header["links"])
+    return board
+
+
+class ReplayWriter:
+    """
+    Record a game as it's played.
+
+    Parameters
+    ----------
+    file : str or binary file
+        Path or file object to append the replay to
+    keyframe_interval : int, optional
+        Write a full keyframe every this many turns
+
+    Record a game with:
+
+    with ReplayWriter(path) as writer:
+        writer.start(game)
+        while not game.game_over:
+            writer.write_turn(game, game.make_turn())
+    """
+    def __init__(self, file, keyframe_interval=20):
+        if isinstance(file, str):
+            self.file = open(file, "ab")
+            self._owns_file = True
+        else:
+            self.file = file
+            self._owns_file = False
+        self.keyframe_interval = keyframe_interval
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def write_record(self, kind, payload):
+        self.file.write(RECORD.pack(kind, len(payload)))
+        self.file.write(payload)
+
+    def start(self, game):
+        """
+        Write the header and a first keyframe. Nothing but a keyframe is
+        written when appending to an existing replay.
+        """
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+            self.write_record(
+                HEADER, json.dumps(header_json(game)).encode("utf-8")
+            )
+        self.write_keyframe(game)
+
+    def write_keyframe(self, game):
+        self.write_record(
+            KEYFRAME,
+            TURN_NUMBER.pack(game.current_turn)
+            + game.to_json_bytes(include_static=False),
+        )
+        self.file.flush()
+
+    def write_turn(self, game, delta):
+        """
+        Write a turn, after it's been made with ``GameBoard.make_turn``
+
+        Parameters
+        ----------
+        game : GameBoard
+        delta : TurnDelta
+        """
+        self.write_record(TURN, encode_turn(delta))
+        if game.current_turn % self.keyframe_interval == 0:
+            self.write_keyframe(game)
+        else:
+            self.file.flush()
+
+
+class ReplayReader:
+    """
+    Memory-mapped reader for replay files, with random access to any turn
+    through the keyframes.
+
+    Parameters
+    ----------
+    path : str
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("{} is not a replay file".format(path))
+
+        self.header = None
+        # Turn number -> payload offset and length
+        self._keyframes = {}
+        self._turns = {}
+
+        offset = len(MAGIC)
+        while offset + RECORD.size <= len(self._map):
+            kind, length = RECORD.unpack_from(self._map, offset)
+            start = offset + RECORD.size
+            if start + length > len(self._map):
+                # Cut off while writing
+                break
+
+            if kind == HEADER:
+                self.header = json.loads(self._map[start:start + length])
+            elif kind == KEYFRAME:
+                (turn,) = TURN_NUMBER.unpack_from(self._map, start)
+                self._keyframes[turn] = (start, length)
+            elif kind == TURN:
+                (turn,) = TURN_NUMBER.unpack_from(self._map, start)
+                self._turns[turn] = (start, length)
+
+            offset = start + length
+
+        if self.header is None or not self._keyframes:
+            self.close()
+            raise ValueError("{} has no header or keyframe".format(path))
+        # Static map shared by every board read from the replay
+        self.static = static_board(self.header)
+
+        self.first_turn = min(self._keyframes)
+        self.last_turn = max([self.first_turn] + list(self._turns))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _payload(self, location):
+        start, length = location
+        return self._map[start:start + length]
+
+    def keyframe(self, turn):
+        """
+        Return the board stored in the keyframe for ``turn``
+        """
+        payload = self._payload(self._keyframes[turn])
+        return GameBoard.from_json_bytes(
+            payload[TURN_NUMBER.size:], static=self.static
+        )
+
+    def board_at(self, turn):
+        """
+        Return the board as it was after ``turn``, replayed from the nearest
+        keyframe before it
+
+        Parameters
+        ----------
+        turn : int
+        """
+        if not self.first_turn <= turn <= self.last_turn:
+            msg = "Turn {} is not in the replay ({} to {})"
+            raise ValueError(msg.format(turn, self.first_turn, self.last_turn))
+
+        start = max(key for key in self._keyframes if key <= turn)
+        game = self.keyframe(start)
+        for next_turn in range(start + 1, turn + 1):
+            self.apply_turn(game, next_turn)
+        return game
+
+    def turn_delta(self, game, turn):
+        """
+        Return the ``TurnDelta`` for ``turn``, decoded against ``game`` as it
+        was before the turn
+        """
+        return decode_turn(self._payload(self._turns[turn]), game)
+
+    def apply_turn(self, game, turn):
+        """
+        Advance ``game`` by one recorded turn. ``game`` must be at
+        ``turn - 1``.
+        """
+        game.redo_turn(self.turn_delta(game, turn))
+
+    def boards(self, start=None):
+        """
+        Yield the board after each turn from ``start`` (the first turn by
+        default) to the end. The same board object is advanced and yielded
+        every time.
+        """
+        game = self.board_at(self.first_turn if start is None else start)
+        yield game
+        for turn in range(game.current_turn + 1, self.last_turn + 1):
+            self.apply_turn(game, turn)
+            yield game
@@ -1,8 +1,438 @@
-import socket
+"""
+Asyncio game server.
+
+Bots connect to ``PLAYER_ONE_PORT`` (team 1) or ``PLAYER_TWO_PORT`` (team -1)
+and are paired into matches as they arrive. The protocol is line based:
+
+- The server sends ``{"team": <team>}`` once, then one line of board JSON
+  (``GameBoard.to_json_bytes``) at the start of every turn.
+- The bot replies to every board with one line of orders separated by
+  semicolons, e.g. ``MOVE 1 2 10;INC 2``. An empty line means no orders.
+  Each turn has a latency budget: a bot that hasn't replied in time (or has
+  disconnected) waits that turn.
+- When the game is over, the server sends the final board and closes the
+  connection.
+
+In delta mode the hello is ``{"team": <team>, "delta": true}``. The first
+board is sent in full, static map included, and every later line is only the
+changes made by the last turn (``GameBoard.delta_json``), to be applied with
+``GameBoard.apply_delta_json``.
+
+Every match runs as a task on one event loop, so a single process can host
+many matches without a thread per player.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+
+from game import GameBoard
+from order import Wait, parse_order_line
 
 PLAYER_ONE_PORT = 23833
 PLAYER_TWO_PORT = 23834
 
+DEFAULT_TURN_TIMEOUT = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def parse_orders(line):
+    """
+    Parse a line of semicolon-separated orders, skipping invalid ones.
+
+    Parameters
+    ----------
+    line : Unicode
+
+    Returns
+    -------
+    list of Order
+    """
+    orders, _ = parse_order_line(line)
+    return orders
+
+
+def known_factory_orders(game, team, orders):
+    """
+    Drop orders from a remote player that refer to factories that aren't on
+    the board, which would otherwise stop the game when executed.
+
+    Parameters
+    ----------
+    game : GameBoard
+    team : int
+    orders : list of Order
+
+    Returns
+    -------
+    orders : list of Order
+        The orders that only refer to factories on the board
+    dropped : int
+        Number of orders dropped
+    """
+    known = []
+    for order in orders:
+        try:
+            order.validate(game, team)
+        except ValueError:
+            continue
+        known.append(order)
+    return known, len(orders) - len(known)
+
+
+class PlayerStats:
+    """
+    Response times and timeouts for one player
+    """
+    def __init__(self):
+        self.response_times = []
+        self.timeouts = 0
+        self.invalid_orders = 0
+
+    def record(self, seconds):
+        self.response_times.append(seconds)
+
+    def record_timeout(self):
+        self.timeouts += 1
+
+    def record_invalid(self, count):
+        self.invalid_orders += count
+
+    def percentile(self, percent):
+        """
+        Nearest-rank percentile of the response times, in seconds, or None if
+        there are none
+        """
+        if not self.response_times:
+            return None
+        ordered = sorted(self.response_times)
+        rank = max(1, math.ceil(percent / 100.0 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    def summary(self):
+        return {
+            "responses": len(self.response_times),
+            "timeouts": self.timeouts,
+            "invalid_orders": self.invalid_orders,
+            "p50": self.p50,
+            "p99": self.p99,
+        }
+
 
 class PlayerConnection:
-    pass
+    """
+    Server side of a connection to one bot
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+    writer : asyncio.StreamWriter
+    team : int
+        -1 or 1
+    """
+    def __init__(self, reader, writer, team):
+        self.reader = reader
+        self.writer = writer
+        self.team = team
+        self.connected = True
+        self.stats = PlayerStats()
+
+        # Replies still owed for turns that timed out
+        self._late_replies = 0
+
+    async def send_line(self, data):
+        if not self.connected:
+            return
+        try:
+            self.writer.write(data + b"\n")
+            await self.writer.drain()
+        except ConnectionError:
+            self.connected = False
+
+    async def send_hello(self, delta=False):
+        hello = {"team": self.team}
+        if delta:
+            hello["delta"] = True
+        await self.send_line(json.dumps(hello).encode("utf-8"))
+
+    async def send_state(self, data, timeout=None):
+        """
+        Send a board or turn delta line, giving up (and dropping the
+        connection) if the bot isn't reading within ``timeout`` seconds
+        """
+        try:
+            await asyncio.wait_for(self.send_line(data), timeout)
+        except asyncio.TimeoutError:
+            self.connected = False
+
+    async def receive_orders(self, timeout):
+        """
+        Wait for the bot's orders for this turn.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds to wait before giving up on this turn
+
+        Returns
+        -------
+        list of Order
+            A single ``Wait`` if the bot didn't reply in time or has
+            disconnected
+        """
+        if not self.connected:
+            return [Wait()]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            line = await asyncio.wait_for(
+                self._read_reply(), max(0.0, timeout)
+            )
+        except asyncio.TimeoutError:
+            self._late_replies += 1
+            self.stats.record_timeout()
+            return [Wait()]
+
+        if line is None:
+            return [Wait()]
+
+        self.stats.record(loop.time() - start)
+        return parse_orders(line)
+
+    async def _read_reply(self):
+        # Skip replies to earlier turns that came in too late
+        while True:
+            data = await self.reader.readline()
+            if not data:
+                self.connected = False
+                return None
+            if self._late_replies:
+                self._late_replies -= 1
+                continue
+            return data.decode("utf-8", errors="replace")
+
+    async def close(self):
+        self.connected = False
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class Match:
+    """
+    A game between two connected bots
+
+    Parameters
+    ----------
+    players : list of PlayerConnection
+        One player per team
+    game : GameBoard
+        Initialized game board
+    turn_timeout : float, optional
+        Latency budget per turn, in seconds. Sending the board and waiting
+        for replies must fit in it.
+    delta : bool, optional
+        Send turn deltas instead of the full board after the first turn
+    """
+    def __init__(self, players, game, turn_timeout=DEFAULT_TURN_TIMEOUT,
+                 delta=False):
+        self.players = players
+        self.game = game
+        self.turn_timeout = turn_timeout
+        self.delta = delta
+
+    @property
+    def stats(self):
+        """
+        ``PlayerStats`` for each team
+        """
+        return {player.team: player.stats for player in self.players}
+
+    async def run(self):
+        """
+        Play the game to the end and close the connections.
+
+        Returns
+        -------
+        GameBoard
+            The finished game
+        """
+        game = self.game
+        # Last turn's changes, in delta mode
+        last_turn = None
+
+        def state():
+            if last_turn is None:
+                return game.to_json_bytes()
+            return game.delta_json_bytes(last_turn)
+
+        try:
+            await asyncio.gather(
+                *(player.send_hello(self.delta) for player in self.players)
+            )
+            loop = asyncio.get_running_loop()
+            while not game.game_over:
+                deadline = loop.time() + self.turn_timeout
+                data = state()
+                await asyncio.gather(*(
+                    player.send_state(data, max(0.0, deadline - loop.time()))
+                    for player in self.players
+                ))
+                replies = await asyncio.gather(*(
+                    player.receive_orders(deadline - loop.time())
+                    for player in self.players
+                ))
+                for player, orders in zip(self.players, replies):
+                    orders, dropped = known_factory_orders(
+                        game, player.team, orders
+                    )
+                    player.stats.record_invalid(dropped)
+                    game.orders[player.team] = orders
+                if self.delta:
+                    last_turn = game.make_turn()
+                else:
+                    game.update()
+
+            data = state()
+            await asyncio.gather(
+                *(player.send_state(data) for player in self.players)
+            )
+        finally:
+            await asyncio.gather(
+                *(player.close() for player in self.players)
+            )
+        return game
+
+
+class GameServer:
+    """
+    Accept bot connections on two ports and pair them into matches
+
+    Parameters
+    ----------
+    host : str, optional
+    ports : (int, int), optional
+        Ports for team 1 and team -1 players. Use 0 to pick free ports.
+    turn_timeout : float, optional
+        Latency budget per turn, in seconds
+    game_options : dict, optional
+        Keyword arguments for ``GameBoard.init_game``
+    delta : bool, optional
+        Play matches in delta mode, see ``Match``
+    """
+    def __init__(self, host="127.0.0.1",
+                 ports=(PLAYER_ONE_PORT, PLAYER_TWO_PORT),
+                 turn_timeout=DEFAULT_TURN_TIMEOUT, game_options=None,
+                 delta=False):
+        self.host = host
+        self.ports = ports
+        self.turn_timeout = turn_timeout
+        self.game_options = game_options or {}
+        self.delta = delta
+
+        # Finished matches
+        self.results = []
+        self._servers = []
+        self._waiting = {1: [], -1: []}
+        self._matches = set()
+
+    async def start(self):
+        for team, port in zip([1, -1], self.ports):
+            server = await asyncio.start_server(
+                self._connection_handler(team), self.host, port,
+            )
+            self._servers.append(server)
+
+        # Actual ports, in case free ports were picked
+        self.ports = tuple(
+            server.sockets[0].getsockname()[1] for server in self._servers
+        )
+
+    async def serve_forever(self):
+        await self.start()
+        await asyncio.gather(
+            *(server.serve_forever() for server in self._servers)
+        )
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        for task in list(self._matches):
+            task.cancel()
+        await asyncio.gather(*self._matches, return_exceptions=True)
+
+    async def wait_for_matches(self, count):
+        """
+        Wait until ``count`` matches have finished
+        """
+        while len(self.results) < count:
+            await asyncio.sleep(0.01)
+
+    def _connection_handler(self, team):
+        async def handle(reader, writer):
+            self._waiting[team].append(
+                PlayerConnection(reader, writer, team)
+            )
+            self._start_matches()
+        return handle
+
+    def _start_matches(self):
+        while self._waiting[1] and self._waiting[-1]:
+            players = [self._waiting[1].pop(0), self._waiting[-1].pop(0)]
+            game = GameBoard()
+            game.init_game(**self.game_options)
+
+            match = Match(
+                players, game, turn_timeout=self.turn_timeout,
+                delta=self.delta,
+            )
+            task = asyncio.ensure_future(match.run())
+            self._matches.add(task)
+            task.add_done_callback(self._match_done(match))
+
+    def _match_done(self, match):
+        def done(task):
+            self._matches.discard(task)
+            if task.cancelled():
+                return
+            if task.exception() is not None:
+                logger.error(
+                    "Match ended with an error",
+                    exc_info=task.exception(),
+                )
+                return
+            self.results.append(match)
+        return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boyo in the Shell server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--turn-timeout", type=float,
+                        default=DEFAULT_TURN_TIMEOUT)
+    parser.add_argument("--delta", action="store_true",
+                        help="send turn deltas instead of full boards")
+    args = parser.parse_args()
+
+    server = GameServer(
+        host=args.host, turn_timeout=args.turn_timeout, delta=args.delta,
+    )
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
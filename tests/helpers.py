@@ -0,0 +1,73 @@
+"""
+Helpers shared by the tests
+"""
+from order import Inc, Move, Msg, Order, SendBomb, Wait
+
+
+def set_bot_orders(game, bots):
+    """
+    Give each bot's orders for this turn to the board
+
+    Parameters
+    ----------
+    game : GameBoard
+    bots : dict
+        ``bots.Bot`` playing each team
+    """
+    for team, bot in bots.items():
+        game.orders[team] = [
+            Order.from_string(order) for order in bot.get_orders(game)
+        ]
+
+
+def play_turns(game, bots, turns):
+    """
+    Play ``turns`` turns with orders from ``bots``, see ``set_bot_orders``
+    """
+    for _ in range(turns):
+        set_bot_orders(game, bots)
+        game.update()
+
+
+def random_orders(board, rng, invalid=False):
+    """
+    Random orders for both teams from the factories they own.
+
+    Parameters
+    ----------
+    board : GameBoard
+    rng : random.Random
+    invalid : bool, optional
+        Also give orders from factories the team doesn't own, negative troop
+        counts and messages, to exercise order validation
+
+    Returns
+    -------
+    dict
+        Orders for each team
+    """
+    orders = {-1: [], 1: []}
+    for factory in board.factories:
+        if invalid:
+            teams = [-1, 1]
+        elif factory.team != 0:
+            teams = [factory.team]
+        else:
+            teams = []
+
+        for team in teams:
+            for _ in range(rng.randint(0, 3)):
+                target = rng.choice(board.factories)
+                choice = rng.random()
+                if choice < 0.6:
+                    count = rng.randint(-5 if invalid else 0, 30)
+                    orders[team].append(Move(factory.id, target.id, count))
+                elif choice < 0.7:
+                    orders[team].append(SendBomb(factory.id, target.id))
+                elif choice < 0.9:
+                    orders[team].append(Inc(factory.id))
+                elif invalid:
+                    orders[team].append(Msg("hi"))
+                else:
+                    orders[team].append(Wait())
+    return orders
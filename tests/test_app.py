@@ -0,0 +1,73 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from app import App, LRUCache, load_pygame  # noqa: E402
+from game import GameBoard  # noqa: E402
+from tests.helpers import play_turns  # noqa: E402
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        # Touch "a" so "b" is the least recently used
+        self.assertEqual(1, cache.get("a", lambda: None))
+        cache.get("c", lambda: 3)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get("a", lambda: None))
+        self.assertEqual(4, cache.get("b", lambda: 4))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(4, cache.misses)
+
+
+class TestDefaultBots(unittest.TestCase):
+    def test_reproducible(self):
+        states = []
+        for _ in range(2):
+            game = GameBoard(seed=7)
+            game.init_game()
+            app = App(game=game)
+            play_turns(game, app.bots, 30)
+            states.append(game.to_json())
+        self.assertEqual(states[0], states[1])
+
+
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.app = App()
+        self.app.pygame_init()
+
+    def tearDown(self):
+        self.app.cleanup()
+
+    def play_turn(self):
+        play_turns(self.app.game, self.app.bots, 1)
+
+    def test_dirty_rects_match_full_redraw(self):
+        pygame = load_pygame()
+        app = self.app
+
+        app.render()
+        for turn in range(40):
+            self.play_turn()
+            app.timer = 500.0 * (turn % 2)
+            app.render()
+        self.assertTrue(app.game.troops)
+        dirty = pygame.image.tostring(app._display_surf, "RGB")
+
+        app._dirty_rects = None
+        app.render()
+        full = pygame.image.tostring(app._display_surf, "RGB")
+        self.assertEqual(full, dirty)
+
+    def test_sprites_cached(self):
+        for _ in range(20):
+            self.play_turn()
+        self.app.render()
+        self.app.render()
+        self.assertGreater(self.app.sprite_cache.hits, 0)
+        self.assertGreater(self.app.text_cache.hits, 0)
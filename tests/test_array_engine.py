@@ -0,0 +1,120 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from array_engine import (
+    ArrayGameBoard, UnitArrays, factory_positions, interpolate_units,
+    resolve_battles, resolve_bombs, team_index,
+)
+from factory import Factory
+from game import GameBoard
+from order import Move
+from tests.helpers import random_orders
+
+
+class TestInterpolateUnits(unittest.TestCase):
+    def test_matches_units(self):
+        rng = random.Random(0)
+        board = GameBoard(seed=0)
+        board.init_game(max_turns=None)
+        for _ in range(10):
+            board.orders = random_orders(board, rng)
+            board.update()
+
+        units = board.troops + board.bombs
+        self.assertTrue(units)
+        arrays = UnitArrays.from_units(units)
+        positions = factory_positions(board)
+
+        unit_positions, headings = interpolate_units(arrays, positions)
+        for unit, position, heading in zip(units, unit_positions, headings):
+            np.testing.assert_allclose(unit.get_position(), position)
+            (x0, y0), (x1, y1) = (
+                unit.source.position, unit.destination.position
+            )
+            self.assertAlmostEqual(
+                math.degrees(math.atan2(x1 - x0, y1 - y0)) + 180, heading
+            )
+
+        # Halfway through the next turn
+        halfway, _ = interpolate_units(arrays, positions, progress=0.5)
+        for unit, position in zip(units, halfway):
+            unit.travelled += 0.5
+            np.testing.assert_allclose(unit.get_position(), position)
+
+
+class TestArrayGameBoard(unittest.TestCase):
+    def test_matches_game_board(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            board = GameBoard(seed=seed)
+            board.init_game(max_turns=100)
+            array_board = ArrayGameBoard(board)
+
+            while not board.game_over:
+                orders = random_orders(board, rng, invalid=True)
+                board.orders = orders
+                board.update()
+                array_board.update(orders)
+
+                self.assertEqual(
+                    board.to_json(), array_board.to_board().to_json()
+                )
+                self.assertEqual(board.game_over, array_board.game_over)
+                self.assertEqual(board.winner, array_board.winner)
+
+    def test_unknown_factory(self):
+        board = GameBoard()
+        board.init_game()
+        array_board = ArrayGameBoard(board)
+
+        with self.assertRaises(ValueError):
+            array_board.update({1: [Move(0, 100, 1)]})
+
+    def test_sparse_ids(self):
+        board = GameBoard()
+        board.factories = [Factory(1, 1, 0, 0, (0, 0))]
+        with self.assertRaises(ValueError):
+            ArrayGameBoard(board)
+
+
+class TestKernels(unittest.TestCase):
+    def test_resolve_battles(self):
+        # Same cases as ``TestFactory.test_resolve_battles``
+        test_battles = [
+            (0, 0, {-1: 0, 1: 1}, 1, 1),
+            (0, 0, {-1: 2, 1: 1}, -1, 1),
+            (0, 0, {-1: 1, 1: 1}, 0, 0),
+            (1, 10, {-1: 20, 1: 5}, -1, 5),
+            (-1, 10, {-1: 5, 1: 20}, 1, 5),
+            (1, 10, {-1: 10, 1: 0}, 1, 0),
+            (-1, 10, {-1: 0, 1: 10}, -1, 0),
+            (1, 5, {-1: 10, 1: 20}, 1, 15),
+            (-1, 5, {-1: 20, 1: 10}, -1, 15),
+        ]
+
+        team = np.array([case[0] for case in test_battles])
+        stock = np.array([case[1] for case in test_battles])
+        occupying = np.zeros((2, len(test_battles)), dtype=np.int64)
+        for i, case in enumerate(test_battles):
+            for occ_team, strength in case[2].items():
+                occupying[team_index(occ_team), i] = strength
+
+        resolve_battles(team, stock, occupying)
+
+        np.testing.assert_array_equal(
+            [case[3] for case in test_battles], team
+        )
+        np.testing.assert_array_equal(
+            [case[4] for case in test_battles], stock
+        )
+
+    def test_resolve_bombs(self):
+        stock = np.array([33, 13, 33, 5, 8])
+        disabled = np.array([0, 0, 0, 0, 2])
+        resolve_bombs(stock, disabled, np.array([1, 1, 2, 2, 0]))
+
+        np.testing.assert_array_equal([17, 3, 7, 0, 8], stock)
+        np.testing.assert_array_equal([5, 5, 5, 5, 2], disabled)
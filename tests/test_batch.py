@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from batch import BatchSimulator
+from game import GameBoard
+from order import Inc
+from tests.helpers import random_orders
+
+
+class TestBatchSimulator(unittest.TestCase):
+    def test_matches_game_boards(self):
+        boards = []
+        for seed, max_turns in enumerate([20, 50, 100, 100, 100]):
+            board = GameBoard(seed=seed)
+            board.init_game(max_turns=max_turns)
+            boards.append(board)
+
+        simulator = BatchSimulator(
+            [GameBoard.from_json(board.to_json()) for board in boards]
+        )
+        rng = random.Random(0)
+
+        while not simulator.game_over:
+            orders = []
+            for board in boards:
+                if board.game_over:
+                    orders.append(None)
+                    continue
+                board.orders = random_orders(board, rng, invalid=True)
+                orders.append(board.orders)
+                board.update()
+
+            simulator.update(orders)
+
+            for index, board in enumerate(boards):
+                self.assertEqual(
+                    board.to_json(), simulator.to_board(index).to_json()
+                )
+                self.assertEqual(
+                    board.game_over, simulator.to_board(index).game_over
+                )
+                self.assertEqual(board.winner, simulator.winner[index])
+
+        self.assertTrue(all(board.game_over for board in boards))
+
+    def test_finished_games_ignore_orders(self):
+        board = GameBoard(seed=1)
+        board.init_game(max_turns=1)
+        simulator = BatchSimulator([board])
+        simulator.update()
+        self.assertTrue(simulator.game_over)
+
+        final = simulator.to_board(0).to_json()
+        player = [fac for fac in board.factories if fac.team == 1][0]
+
+        simulator.update([{1: [Inc(player.id)], -1: []}])
+        self.assertEqual(final, simulator.to_board(0).to_json())
+        self.assertEqual(1, simulator.to_board(0).current_turn)
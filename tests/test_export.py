@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from export import export_replay, export_snapshots
+from tests.test_replay import record_game
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.replay = os.path.join(self.tmp_dir, "game.replay")
+        self.states = record_game(self.replay, seed=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def frames(self, name):
+        out_dir = os.path.join(self.tmp_dir, name)
+        frames = {}
+        for filename in sorted(os.listdir(out_dir)):
+            with open(os.path.join(out_dir, filename), "rb") as f:
+                frames[filename] = f.read()
+        return frames
+
+    def test_export_replay(self):
+        last_turn = max(self.states)
+        num_frames, fps = export_replay(
+            self.replay, os.path.join(self.tmp_dir, "serial"),
+            frames_per_turn=2, workers=0, image_format="bmp",
+        )
+        self.assertEqual(2 * last_turn + 1, num_frames)
+        self.assertGreater(fps, 0)
+
+        frames = self.frames("serial")
+        self.assertEqual(num_frames, len(frames))
+        self.assertIn("frame_000000.bmp", frames)
+
+        # Worker processes render the same frames
+        export_replay(
+            self.replay, os.path.join(self.tmp_dir, "pool"),
+            frames_per_turn=2, workers=2, image_format="bmp",
+        )
+        self.assertEqual(frames, self.frames("pool"))
+
+    def test_export_snapshots(self):
+        paths = []
+        for turn in [0, 10, 20]:
+            path = os.path.join(self.tmp_dir, "{}.json".format(turn))
+            with open(path, "w") as f:
+                json.dump(self.states[turn], f)
+            paths.append(path)
+
+        num_frames, _ = export_snapshots(
+            paths, os.path.join(self.tmp_dir, "snapshots"), workers=0,
+        )
+        self.assertEqual(3, num_frames)
+        self.assertEqual(
+            ["frame_000000.png", "frame_000001.png", "frame_000002.png"],
+            list(self.frames("snapshots")),
+        )
@@ -23,6 +23,12 @@ class TestFactoryDist(unittest.TestCase):
 
 
 class TestFactory(unittest.TestCase):
+    def test_slots(self):
+        factory = Factory(0, 1, 0, 0, (0, 0))
+        self.assertFalse(hasattr(factory, "__dict__"))
+        with self.assertRaises(AttributeError):
+            factory.new_attribute = 1
+
     def test_produce(self):
         for team in [-1, 1]:
             team_factory = Factory(0, team, 3, 10, (0, 0))
@@ -69,6 +75,16 @@ class TestFactory(unittest.TestCase):
                 factory.occupying_troops, {-1: 0, 1: 0}
             )
 
+    def test_occupying_troops_reused(self):
+        factory = Factory(0, 1, 0, 10, (0, 0))
+        counters = factory.occupying_troops
+        counters[-1] += 4
+        factory.resolve_battles()
+
+        self.assertEqual(6, factory.stock)
+        self.assertIs(counters, factory.occupying_troops)
+        self.assertEqual(0, counters[-1])
+
     def test_resolve_bombs(self):
         # (Factory, bombs_arriving, expt_stock)
         test_bombs = [
@@ -0,0 +1,632 @@
+import json
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from bots import GreedyBot, RandomBot, ScriptedBot
+from factory import Factory, factory_dist
+from game import (
+    GameBoard, TurnDelta, _remove_indices, _remove_units, _restore_units,
+)
+from order import Inc, Move, SendBomb
+from tests.helpers import play_turns, random_orders, set_bot_orders
+from unit import Troop
+
+
+class TestFactoryLookup(unittest.TestCase):
+    def test_get_factory(self):
+        game = GameBoard()
+        game.init_game()
+
+        for factory in game.factories:
+            self.assertIs(factory, game.get_factory(factory.id))
+
+    def test_get_missing_factory(self):
+        game = GameBoard()
+        game.init_game()
+
+        for factory_id in [-1, len(game.factories), "1", None]:
+            with self.assertRaises(ValueError):
+                game.get_factory(factory_id)
+
+    def test_factories_replaced(self):
+        game = GameBoard()
+        game.factories = [Factory(0, 1, 0, 0, (0, 0))]
+        self.assertIs(game.factories[0], game.get_factory(0))
+
+        # Replacing or extending the factory list is picked up
+        game.factories = [Factory(0, 1, 0, 0, (0, 0))]
+        self.assertIs(game.factories[0], game.get_factory(0))
+
+        game.factories.append(Factory(3, -1, 0, 0, (1, 1)))
+        self.assertIs(game.factories[1], game.get_factory(3))
+        with self.assertRaises(ValueError):
+            game.get_factory(2)
+
+        # As is replacing a factory in place
+        game.factories[0] = Factory(0, 1, 0, 50, (0, 0))
+        self.assertIs(game.factories[0], game.get_factory(0))
+
+    def test_move_from_replaced_factory(self):
+        game = GameBoard()
+        game.factories = [
+            Factory(0, 1, 0, 10, (0, 0)),
+            Factory(1, 0, 0, 10, (5, 0)),
+        ]
+        game.link_factories()
+        game.update()
+
+        game.factories[0] = Factory(0, 1, 0, 50, (0, 0))
+        game.orders[1] = [Move(0, 1, 10)]
+        game.update()
+        self.assertEqual(40, game.factories[0].stock)
+        self.assertIs(game.factories[0], game.troops[0].source)
+
+    def test_from_json_indexes_factories(self):
+        game = GameBoard()
+        game.init_game()
+
+        new_game = GameBoard.from_json(game.to_json())
+        for factory in new_game.factories:
+            self.assertIs(factory, new_game.get_factory(factory.id))
+
+
+class TestDistances(unittest.TestCase):
+    def test_distance_matrix(self):
+        game = GameBoard()
+        game.init_game()
+
+        for a in game.factories:
+            for b in game.factories:
+                self.assertEqual(
+                    factory_dist(a, b), game.distances[a.id][b.id]
+                )
+
+        with self.assertRaises(TypeError):
+            game.distances[0][1] = 5
+
+    def test_links_from_distances(self):
+        game = GameBoard()
+        game.init_game()
+
+        num_factories = len(game.factories)
+        self.assertEqual(num_factories * (num_factories - 1), len(game.links))
+        for source, destination, dist in game.links:
+            self.assertEqual(game.distances[source][destination], dist)
+
+    def test_orders_use_distances(self):
+        game = GameBoard()
+        game.factories = [
+            Factory(0, 1, 0, 10, (0, 0)),
+            Factory(1, -1, 0, 10, (3, 4)),
+        ]
+        game.index_factories()
+        game.link_factories()
+        # Distances are only computed once, when linking
+        game.distances = ((0, 7), (7, 0))
+
+        game.orders[1].append(Move(0, 1, 5))
+        game.orders[-1].append(SendBomb(1, 0))
+        game.update()
+
+        self.assertEqual(7, game.troops[0].distance)
+        self.assertEqual(7, game.bombs[0].distance)
+
+
+class TestEndConditions(unittest.TestCase):
+    def make_game(self, teams):
+        game = GameBoard()
+        game.factories = [
+            Factory(fid, team, 0, 0, (fid, 0))
+            for fid, team in enumerate(teams)
+        ]
+        game.index_factories()
+        game.link_factories()
+        return game
+
+    def test_capture_all(self):
+        for team in [-1, 1]:
+            game = self.make_game([team, team])
+            game.update()
+            self.assertTrue(game.game_over)
+            self.assertEqual(team, game.winner)
+
+    def test_max_turns(self):
+        for teams, expt_winner in [
+                ([1, 1, -1, 0], 1),
+                ([1, -1, -1, 0], -1),
+                ([1, -1, 0, 0], 0)]:
+            game = self.make_game(teams)
+            game.max_turns = 3
+
+            for _ in range(2):
+                game.update()
+                self.assertFalse(game.game_over)
+                self.assertIsNone(game.winner)
+
+            game.update()
+            self.assertTrue(game.game_over)
+            self.assertEqual(expt_winner, game.winner)
+
+
+class TestSeeding(unittest.TestCase):
+    def test_same_seed_same_board(self):
+        for batch_size in [None, 16]:
+            first, second = [GameBoard(seed=42) for _ in range(2)]
+            first.init_game(placement_batch_size=batch_size)
+            # Global random state doesn't leak into the board
+            random.seed(1)
+            second.init_game(placement_batch_size=batch_size)
+
+            self.assertEqual(first.to_json(), second.to_json())
+
+    def test_different_seeds(self):
+        first, second = GameBoard(seed=1), GameBoard(seed=2)
+        first.init_game()
+        second.init_game()
+        self.assertNotEqual(
+            first.to_json()["factories"], second.to_json()["factories"]
+        )
+
+    def test_seed_round_trip(self):
+        game = GameBoard()
+        game.init_game()
+
+        jsonized = game.to_json()
+        self.assertEqual(game.seed, jsonized["seed"])
+        self.assertEqual(game.seed, GameBoard.from_json(jsonized).seed)
+
+        # The seed is enough to regenerate the board
+        replayed = GameBoard(seed=jsonized["seed"])
+        replayed.init_game()
+        self.assertEqual(jsonized, replayed.to_json())
+
+    def test_parallel_generation(self):
+        def generate(seed):
+            game = GameBoard(seed=seed)
+            game.init_game()
+            return game.to_json()
+
+        expected = [generate(seed) for seed in range(20)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(expected, list(executor.map(generate, range(20))))
+
+
+class TestClone(unittest.TestCase):
+    def make_game(self):
+        game = GameBoard(seed=5)
+        game.init_game()
+        bots = {team: GreedyBot(team) for team in [-1, 1]}
+        play_turns(game, bots, 10)
+        return game, bots
+
+    def test_clone(self):
+        game, bots = self.make_game()
+        self.assertTrue(game.troops)
+
+        clone = game.clone()
+        self.assertEqual(game.to_json(), clone.to_json())
+
+        # Static data is shared, per-turn state isn't
+        self.assertIs(game.distances, clone.distances)
+        for fac, clone_fac in zip(game.factories, clone.factories):
+            self.assertIsNot(fac, clone_fac)
+            self.assertIs(clone_fac, clone.get_factory(fac.id))
+        for troop in clone.troops:
+            self.assertIs(troop.source, clone.get_factory(troop.source.id))
+
+        # Both play out the same way without affecting each other
+        expected = game.to_json()
+        play_turns(clone, bots, 20)
+        self.assertEqual(expected, game.to_json())
+        play_turns(game, bots, 20)
+        self.assertEqual(game.to_json(), clone.to_json())
+
+    def test_snapshot_restore(self):
+        game, bots = self.make_game()
+        expected = game.to_json()
+        snapshot = game.snapshot()
+
+        play_turns(game, bots, 20)
+        self.assertNotEqual(expected, game.to_json())
+
+        game.restore(snapshot)
+        self.assertEqual(expected, game.to_json())
+
+        # A restored board plays on like the original
+        clone = GameBoard.from_json(expected)
+        play_turns(game, bots, 20)
+        play_turns(clone, bots, 20)
+        self.assertEqual(clone.to_json(), game.to_json())
+
+
+class TestExecuteOrders(unittest.TestCase):
+    def test_matches_sequential(self):
+        rng = random.Random(0)
+        for seed in range(5):
+            game = GameBoard(seed=seed)
+            game.init_game(max_turns=60)
+            bots = {1: GreedyBot(1)}
+
+            while not game.game_over:
+                set_bot_orders(game, bots)
+                extra = random_orders(game, rng, invalid=True)
+                game.orders[-1] = extra[-1]
+                game.orders[1] += extra[1]
+
+                expected = game.clone()
+                expected_orders = []
+                for team, orders in game.orders.items():
+                    for order in orders:
+                        if order.validate(expected, team):
+                            order.execute(expected)
+                            expected_orders.append((team, order))
+
+                delta = TurnDelta()
+                game.execute_orders(delta)
+                self.assertEqual(expected.to_json(), game.to_json())
+                self.assertEqual(expected_orders, delta.orders)
+                self.assertEqual({-1: [], 1: []}, game.orders)
+
+                game.update()
+
+    def test_unknown_factory(self):
+        game = GameBoard()
+        game.init_game()
+        game.orders[1].append(Move(0, 99, 5))
+        with self.assertRaises(ValueError):
+            game.update()
+
+
+class TestMakeUnmake(unittest.TestCase):
+    def test_make_unmake_redo(self):
+        for seed in range(5):
+            game = GameBoard(seed=seed)
+            game.init_game(max_turns=60)
+            bots = {-1: RandomBot(-1, seed=seed), 1: GreedyBot(1)}
+
+            states = [game.to_json()]
+            deltas = []
+            while not game.game_over:
+                set_bot_orders(game, bots)
+                deltas.append(game.make_turn())
+                states.append(game.to_json())
+
+            self.assertTrue(any(delta.spawned_bombs for delta in deltas))
+            self.assertTrue(any(delta.arrived_troops for delta in deltas))
+
+            for delta, state in zip(reversed(deltas), reversed(states[:-1])):
+                game.unmake_turn(delta)
+                self.assertEqual(state, game.to_json())
+
+            for delta, state in zip(deltas, states[1:]):
+                game.redo_turn(delta)
+                self.assertEqual(state, game.to_json())
+
+    def test_only_changes_recorded(self):
+        game = GameBoard()
+        game.factories = [
+            Factory(0, 1, 1, 10, (0, 0)),
+            Factory(1, 0, 1, 10, (5, 0)),
+        ]
+        game.link_factories()
+
+        game.orders[1].append(Move(0, 1, 4))
+        game.orders[1].append(Inc(1))
+        delta = game.make_turn()
+
+        # Only the player factory changed, and the Inc was invalid
+        self.assertEqual([(0, (1, 10, 1, 0), (1, 7, 1, 0))], delta.factories)
+        self.assertEqual(1, len(delta.orders))
+        self.assertEqual(game.troops, delta.spawned_troops)
+
+    def test_delta_json(self):
+        for seed in range(5):
+            game = GameBoard(seed=seed)
+            game.init_game(max_turns=60)
+            bots = {-1: RandomBot(-1, seed=seed), 1: GreedyBot(1)}
+            client = GameBoard.from_json_bytes(game.to_json_bytes())
+
+            while not game.game_over:
+                set_bot_orders(game, bots)
+                delta = game.make_turn()
+                data = game.delta_json_bytes(delta)
+                client.apply_delta_json(json.loads(data))
+                self.assertEqual(game.to_json(), client.to_json())
+
+    def test_delta_json_wrong_turn(self):
+        game = GameBoard()
+        game.init_game()
+        client = GameBoard.from_json(game.to_json())
+        game.make_turn()
+        delta = game.make_turn()
+
+        with self.assertRaises(ValueError):
+            client.apply_delta_json(game.delta_json(delta))
+
+    def test_wrong_turn(self):
+        game = GameBoard()
+        game.init_game()
+        first = game.make_turn()
+        game.make_turn()
+
+        with self.assertRaises(ValueError):
+            game.unmake_turn(first)
+        with self.assertRaises(ValueError):
+            game.redo_turn(first)
+
+
+class TestArrivalSchedule(unittest.TestCase):
+    def make_game(self):
+        # A team 1 factory next to a neutral one, both with 10 stock
+        game = GameBoard()
+        game.factories = [
+            Factory(0, 1, 0, 10, (0, 0)),
+            Factory(1, 0, 0, 10, (5, 0)),
+        ]
+        game.link_factories()
+        return game
+
+    def test_matches_moving_units(self):
+        game = GameBoard(seed=3)
+        game.init_game(max_turns=80)
+        bots = {-1: ScriptedBot(-1, seed=3), 1: ScriptedBot(1, seed=4)}
+
+        most_arrivals = 0
+        while not game.game_over:
+            set_bot_orders(game, bots)
+            # Units that moving every unit one step would land this turn
+            expected = [
+                [(i, unit) for i, unit in enumerate(units)
+                 if unit.travelled + 1 == unit.distance]
+                for units in [game.troops, game.bombs]
+            ]
+            travelled = {
+                id(unit): unit.travelled for unit in game.troops + game.bombs
+            }
+
+            delta = game.make_turn()
+            self.assertEqual(expected[0], delta.arrived_troops)
+            self.assertEqual(expected[1], delta.arrived_bombs)
+            for unit in game.troops + game.bombs:
+                self.assertEqual(
+                    travelled.get(id(unit), -1) + 1, unit.travelled
+                )
+                self.assertLess(unit.travelled, unit.distance)
+            most_arrivals = max(most_arrivals, len(delta.arrived_troops))
+
+        self.assertGreater(most_arrivals, 1)
+
+    def test_remove_units(self):
+        source = Factory(0, 1, 0, 10, (0, 0))
+        destination = Factory(1, 0, 0, 10, (5, 0))
+        rng = random.Random(0)
+
+        # Few arrivals near the front, few at the back and many
+        for length, arrived_indices in [
+                (100, [3, 0, 7]),
+                (100, [99, 97, 98, 50]),
+                (100, rng.sample(range(100), 60))]:
+            units = [Troop(1, source, destination) for _ in range(length)]
+            arrived = [units[i] for i in arrived_indices]
+            for unit in arrived:
+                unit.active = False
+            expected = [unit for unit in units if unit.active]
+            original = list(units)
+
+            removed = _remove_units(units, arrived)
+            self.assertEqual(
+                sorted(arrived_indices), [index for index, _ in removed]
+            )
+            self.assertEqual(expected, units)
+
+            # Undone and redone as in ``unmake_turn`` and ``redo_turn``
+            _restore_units(units, removed)
+            self.assertEqual(original, units)
+            _remove_indices(units, removed)
+            self.assertEqual(expected, units)
+
+    def test_units_added_outside(self):
+        game = self.make_game()
+        game.make_turn()
+
+        troop = Troop(4, game.factories[0], game.factories[1])
+        troop.travelled = 1
+        game.troops.append(troop)
+        for travelled in range(2, troop.distance):
+            game.update()
+            self.assertEqual(travelled, troop.travelled)
+            self.assertIn(troop, game.troops)
+
+        game.update()
+        self.assertNotIn(troop, game.troops)
+        self.assertEqual(6, game.factories[1].stock)
+
+    def test_moved_by_hand(self):
+        game = self.make_game()
+        game.orders[1] = [Move(0, 1, 4)]
+        game.update()
+        troop = game.troops[0]
+
+        troop.travelled = troop.distance - 1
+        self.assertEqual(
+            {-1: 0, 1: 4}, game.incoming_troops(1, game.current_turn + 1)
+        )
+        game.update()
+        self.assertEqual([], game.troops)
+        self.assertEqual(6, game.factories[1].stock)
+
+    def test_replaced_in_place(self):
+        game = self.make_game()
+        game.orders[1] = [Move(0, 1, 4)]
+        game.update()
+
+        replacement = Troop(3, game.factories[0], game.factories[1])
+        replacement.team = 1
+        game.troops[0] = replacement
+        for _ in range(replacement.distance - 1):
+            game.update()
+        self.assertEqual([replacement], game.troops)
+        self.assertEqual(10, game.factories[1].stock)
+
+        game.update()
+        self.assertEqual([], game.troops)
+        self.assertEqual(0, game.factories[1].team)
+        self.assertEqual(7, game.factories[1].stock)
+
+    def test_renumber_turns(self):
+        game = self.make_game()
+        game.orders[1] = [Move(0, 1, 5)]
+        game.update()
+        troop = game.troops[0]
+
+        game.current_turn = 50
+        self.assertEqual(0, troop.travelled)
+        self.assertEqual(50 + troop.distance, troop.arrival_turn)
+
+        for _ in range(troop.distance - 1):
+            game.update()
+        self.assertIn(troop, game.troops)
+        game.update()
+        self.assertNotIn(troop, game.troops)
+
+
+class TestIncomingIndex(unittest.TestCase):
+    def check_index(self, game):
+        for factory in game.factories:
+            expected_troops = {}
+            expected_bombs = {}
+            for troop in game.troops:
+                if troop.destination is factory:
+                    strength = expected_troops.setdefault(
+                        troop.arrival_turn, {-1: 0, 1: 0}
+                    )
+                    strength[troop.team] += troop.strength
+            for bomb in game.bombs:
+                if bomb.destination is factory:
+                    expected_bombs[bomb.arrival_turn] = \
+                        expected_bombs.get(bomb.arrival_turn, 0) + 1
+
+            turns = sorted(set(expected_troops) | set(expected_bombs))
+            self.assertEqual(turns, game.incoming_turns(factory.id))
+            for turn in turns:
+                self.assertEqual(
+                    expected_troops.get(turn, {-1: 0, 1: 0}),
+                    game.incoming_troops(factory.id, turn),
+                )
+                self.assertEqual(
+                    expected_bombs.get(turn, 0),
+                    game.incoming_bombs(factory.id, turn),
+                )
+            self.assertEqual(
+                {
+                    team: sum(s[team] for s in expected_troops.values())
+                    for team in [-1, 1]
+                },
+                game.incoming_troops(factory.id),
+            )
+            self.assertEqual(
+                sum(expected_bombs.values()), game.incoming_bombs(factory.id)
+            )
+
+    def test_matches_units_in_flight(self):
+        game = GameBoard(seed=2)
+        game.init_game(max_turns=60)
+        bots = {-1: RandomBot(-1, seed=2), 1: GreedyBot(1)}
+
+        deltas = []
+        while not game.game_over:
+            set_bot_orders(game, bots)
+            deltas.append(game.make_turn())
+            self.check_index(game)
+        self.assertTrue(any(delta.spawned_bombs for delta in deltas))
+
+        for delta in reversed(deltas[-10:]):
+            game.unmake_turn(delta)
+            self.check_index(game)
+        for delta in deltas[-10:]:
+            game.redo_turn(delta)
+            self.check_index(game)
+
+        self.check_index(game.clone())
+        self.check_index(GameBoard.from_json(game.to_json()))
+
+    def test_unknown_factory(self):
+        game = GameBoard()
+        game.init_game()
+
+        with self.assertRaises(ValueError):
+            game.incoming_troops(len(game.factories))
+        with self.assertRaises(ValueError):
+            game.incoming_turns(-1)
+
+
+class TestProjection(unittest.TestCase):
+    def mid_game(self, seed):
+        game = GameBoard(seed=seed)
+        game.init_game()
+        bots = {-1: RandomBot(-1, seed=seed), 1: ScriptedBot(1, seed=seed)}
+        play_turns(game, bots, 25)
+        return game
+
+    def test_matches_update(self):
+        for seed in range(5):
+            game = self.mid_game(seed)
+            self.assertTrue(game.troops)
+
+            timelines = {
+                fac.id: game.factory_timeline(fac.id, 30)
+                for fac in game.factories
+            }
+            expected = game.clone()
+            for turns in range(31):
+                self.assertEqual(
+                    {fac.id: (fac.team, fac.stock)
+                     for fac in expected.factories},
+                    game.project(turns),
+                )
+                if turns:
+                    for fac in expected.factories:
+                        self.assertEqual(
+                            (fac.team, fac.stock),
+                            timelines[fac.id][turns - 1],
+                        )
+                expected.update()
+
+    def test_bombs(self):
+        game = GameBoard()
+        game.factories = [
+            Factory(0, 1, 1, 30, (0, 0)),
+            Factory(1, -1, 3, 40, (5, 0)),
+        ]
+        game.link_factories()
+        game.orders[1] = [SendBomb(0, 1), Move(0, 1, 20)]
+        game.update()
+
+        expected = game.clone()
+        for turns in range(1, 15):
+            expected.update()
+            self.assertEqual(
+                (expected.factories[1].team, expected.factories[1].stock),
+                game.project(turns, factory_ids=[1])[1],
+            )
+
+    def test_board_unchanged(self):
+        game = self.mid_game(0)
+        state = game.to_json()
+        game.project(20)
+        game.factory_timeline(0, 20)
+        self.assertEqual(state, game.to_json())
+
+    def test_invalid(self):
+        game = GameBoard()
+        game.init_game()
+
+        with self.assertRaises(ValueError):
+            game.project(-1)
+        with self.assertRaises(ValueError):
+            game.project(5, factory_ids=[len(game.factories)])
+        with self.assertRaises(ValueError):
+            game.factory_timeline(-1, 5)
+        with self.assertRaises(ValueError):
+            game.factory_timeline(0, -1)
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from headless import run_games, summarize
+
+
+class TestHeadless(unittest.TestCase):
+    def test_run_games(self):
+        results, elapsed = run_games(
+            "scripted", "greedy", 4, seed=3, game_options={"max_turns": 50},
+        )
+        self.assertEqual([3, 5, 7, 9], [result["seed"] for result in results])
+
+        summary = summarize(results, elapsed)
+        self.assertEqual(4, summary["games"])
+        self.assertEqual(
+            4,
+            summary["team_one_wins"] + summary["team_two_wins"]
+            + summary["draws"],
+        )
+        self.assertLessEqual(summary["max_turns"], 50)
+        self.assertEqual(0, summary["invalid_orders"])
+
+    def test_no_pygame(self):
+        code = (
+            "import sys, headless\n"
+            "headless.main(['scripted', 'wait', '--games', '1', '--json'])\n"
+            "assert 'pygame' not in sys.modules\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=root,
+                       stdout=subprocess.DEVNULL)
@@ -3,7 +3,7 @@ import json
 import unittest
 
 from game import GameBoard
-from jsonize import Jsonizable
+from jsonize import Jsonizable, json_encoder
 from unit import Bomb, Troop
 
 
@@ -120,3 +120,58 @@ class TestJsonizeGameObjects(unittest.TestCase):
             [fac.position for fac in test_game.factories],
             [fac.position for fac in new_game.factories]
         )
+
+
+class TestJsonEncoder(unittest.TestCase):
+    def test_encode_game(self):
+        test_game = GameBoard()
+        test_game.init_game()
+
+        self.assertEqual(
+            test_game.to_json(),
+            json.loads(json.dumps(test_game, default=json_encoder)),
+        )
+
+    def test_encode_not_jsonizable(self):
+        with self.assertRaises(TypeError):
+            json.dumps(object(), default=json_encoder)
+
+
+class TestJsonBytes(unittest.TestCase):
+    def make_game(self):
+        test_game = GameBoard()
+        test_game.init_game()
+
+        troop_source = test_game.factories[0]
+        troop_dest = test_game.factories[1]
+        test_game.troops.append(Troop(11, troop_source, troop_dest))
+        test_game.bombs.append(Bomb(None, troop_dest, troop_source))
+        test_game.factories[2].disabled_turns = 3
+        return test_game
+
+    def test_bytes_round_trip(self):
+        test_game = self.make_game()
+
+        jsonized = test_game.to_json_bytes()
+        self.assertEqual(test_game.to_json(), json.loads(jsonized))
+
+        new_game = GameBoard.from_json_bytes(jsonized)
+        self.assertEqual(test_game.to_json(), new_game.to_json())
+        self.assertEqual(test_game.distances, new_game.distances)
+
+        # Static data is only encoded once
+        self.assertEqual(jsonized, test_game.to_json_bytes())
+
+    def test_without_static(self):
+        test_game = self.make_game()
+
+        jsonized = test_game.to_json_bytes(include_static=False)
+        state = json.loads(jsonized)
+        self.assertEqual(test_game.to_json(include_static=False), state)
+        self.assertNotIn("links", state)
+        self.assertNotIn("position", state["factories"][0])
+
+        new_game = GameBoard.from_json_bytes(jsonized, static=test_game)
+        self.assertEqual(test_game.to_json(), new_game.to_json())
+        self.assertIs(test_game.distances, new_game.distances)
+        self.assertIsNot(test_game.factories[0], new_game.factories[0])
@@ -0,0 +1,79 @@
+import unittest
+
+from order import Inc, Move, Msg, Order, SendBomb, Wait, parse_order_line
+
+
+class TestOrderFromString(unittest.TestCase):
+    def test_from_string(self):
+        order = Order.from_string("MOVE 1 2 10")
+        self.assertIsInstance(order, Move)
+        self.assertEqual(
+            (1, 2, 10), (order.source, order.destination, order.count)
+        )
+
+        order = Order.from_string("bomb 3 4")
+        self.assertIsInstance(order, SendBomb)
+        self.assertEqual((3, 4), (order.source, order.destination))
+
+        order = Order.from_string("INC 2")
+        self.assertIsInstance(order, Inc)
+        self.assertEqual(2, order.target)
+
+        self.assertIsInstance(Order.from_string("WAIT"), Wait)
+
+        order = Order.from_string("MSG hello there 1")
+        self.assertIsInstance(order, Msg)
+        self.assertEqual("hello there 1", order.message)
+
+    def test_invalid_orders(self):
+        for order_string in [
+                "", "  ", "JUMP 1", "MOVE 1 2", "INC", "WAIT 1", "INC two",
+                "MOVE 1 2 -5", "MOVE 1 2 3 4"]:
+            with self.assertRaises(ValueError):
+                Order.from_string(order_string)
+
+
+class TestParseOrderLine(unittest.TestCase):
+    def test_parse_line(self):
+        orders, errors = parse_order_line(
+            "MOVE 1 2 10;BOMB 3 4; inc 2 ;;WAIT;MSG hi;\n"
+        )
+        self.assertEqual(
+            [Move, SendBomb, Inc, Wait, Msg],
+            [type(order) for order in orders],
+        )
+        self.assertEqual(
+            ["MOVE 1 2 10", "BOMB 3 4", "INC 2", "WAIT", "MSG hi"],
+            [order.to_string() for order in orders],
+        )
+        self.assertEqual([], errors)
+
+    def test_message_at_end_of_line(self):
+        orders, _ = parse_order_line("MOVE 1 2 3;MSG hello there \n")
+        self.assertEqual("hello there", orders[1].message)
+
+    def test_compact(self):
+        orders, _ = parse_order_line("MOVE 1 2 10;BOMB 3 4;INC 2;WAIT", True)
+        self.assertEqual(
+            [("MOVE", 1, 2, 10), ("BOMB", 3, 4), ("INC", 2), ("WAIT",)],
+            orders,
+        )
+
+    def test_errors_per_order(self):
+        orders, errors = parse_order_line("JUMP 3;INC 2;MOVE 1 x 3;WAIT")
+        self.assertEqual([Inc, Wait], [type(order) for order in orders])
+        self.assertEqual(
+            [(0, "JUMP 3"), (2, "MOVE 1 x 3")],
+            [(index, order_string) for index, order_string, _ in errors],
+        )
+        self.assertIn("JUMP", errors[0][2])
+
+
+class TestOrderToString(unittest.TestCase):
+    def test_round_trip(self):
+        for order_string in [
+                "MOVE 1 2 10", "BOMB 3 4", "INC 2", "WAIT", "MSG hi there",
+                "MSG"]:
+            self.assertEqual(
+                order_string, Order.from_string(order_string).to_string()
+            )
@@ -0,0 +1,77 @@
+import itertools
+import math
+import random
+import unittest
+
+from placement import pair_ok, place_positions
+
+
+def turns(a, b):
+    return int(math.sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2))
+
+
+class TestPlacePositions(unittest.TestCase):
+    def assert_valid(self, positions, num_factories, min_dist, max_dist):
+        self.assertEqual(num_factories, len(positions))
+
+        if num_factories % 2 == 1:
+            self.assertEqual((0, 0), positions[0])
+            pairs = positions[1:]
+        else:
+            pairs = positions
+
+        for pos, twin in zip(pairs[::2], pairs[1::2]):
+            self.assertEqual((-pos[0], -pos[1]), twin)
+
+        for a, b in itertools.combinations(positions, 2):
+            self.assertTrue(min_dist < turns(a, b) < max_dist)
+
+    def test_place_positions(self):
+        for batch_size in [None, 16]:
+            for num_factories in [2, 7, 14, 15, 31]:
+                positions = place_positions(
+                    num_factories, 1, 20,
+                    random_source=random.Random(num_factories),
+                    batch_size=batch_size,
+                )
+                self.assert_valid(positions, num_factories, 1, 20)
+
+    def test_reproducible(self):
+        for batch_size in [None, 16]:
+            first, second = [
+                place_positions(
+                    15, 1, 20,
+                    random_source=random.Random(3),
+                    batch_size=batch_size,
+                )
+                for _ in range(2)
+            ]
+            self.assertEqual(first, second)
+
+    def test_attempt_budget(self):
+        for batch_size in [None, 16]:
+            # Far too many factories to fit
+            with self.assertRaises(ValueError) as err:
+                place_positions(
+                    200, 2, 10,
+                    random_source=random.Random(0),
+                    max_attempts=500,
+                    batch_size=batch_size,
+                )
+            self.assertIn("after 500 attempts", str(err.exception))
+
+    def test_impossible_distances(self):
+        with self.assertRaises(ValueError):
+            place_positions(4, 5, 6)
+
+    def test_pair_ok(self):
+        # Twin at (-3, 0) is 6 turns away
+        self.assertTrue(pair_ok((3, 0), [], 1, 20))
+        self.assertFalse(pair_ok((3, 0), [], 6, 20))
+        self.assertFalse(pair_ok((3, 0), [], 1, 6))
+
+        # Too close to a placed factory
+        self.assertFalse(pair_ok((3, 0), [(3, 1.5)], 1, 20))
+        # Twin too close to a placed factory
+        self.assertFalse(pair_ok((3, 0), [(-3, 1.5)], 1, 20))
+        self.assertTrue(pair_ok((3, 0), [(0, 3), (0, -3)], 1, 20))
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from bots import GreedyBot, RandomBot
+from game import GameBoard
+from order import Move, Msg, Order
+from replay import ReplayReader, ReplayWriter
+from tests.helpers import set_bot_orders
+
+
+def record_game(path, seed, keyframe_interval=7):
+    game = GameBoard(seed=seed)
+    game.init_game(max_turns=50)
+    bots = {-1: RandomBot(-1, seed=seed), 1: GreedyBot(1)}
+
+    states = {game.current_turn: game.to_json()}
+    with ReplayWriter(path, keyframe_interval=keyframe_interval) as writer:
+        writer.start(game)
+        while not game.game_over:
+            set_bot_orders(game, bots)
+            writer.write_turn(game, game.make_turn())
+            states[game.current_turn] = game.to_json()
+
+    return states
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "game.replay")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_seek_any_turn(self):
+        for seed in range(3):
+            path = os.path.join(self.tmp_dir, "{}.replay".format(seed))
+            states = record_game(path, seed)
+
+            with ReplayReader(path) as reader:
+                self.assertEqual(0, reader.first_turn)
+                self.assertEqual(max(states), reader.last_turn)
+                self.assertEqual(seed, reader.header["seed"])
+
+                # Out of order, to go through different keyframes
+                for turn in sorted(states, key=lambda turn: -turn % 5):
+                    self.assertEqual(
+                        states[turn], reader.board_at(turn).to_json()
+                    )
+
+                for game in reader.boards(start=3):
+                    self.assertEqual(
+                        states[game.current_turn], game.to_json()
+                    )
+                    # The header is the one copy of the static map
+                    self.assertIs(reader.static.distances, game.distances)
+                self.assertEqual(reader.last_turn, game.current_turn)
+
+    def test_orders_recorded(self):
+        record_game(self.path, 0)
+        with ReplayReader(self.path) as reader:
+            game = reader.board_at(0)
+            delta = reader.turn_delta(game, 1)
+            self.assertTrue(delta.orders)
+            for team, order in delta.orders:
+                self.assertIn(team, [-1, 1])
+                self.assertIsInstance(order, Order)
+
+    def test_orders_built_directly(self):
+        game = GameBoard(seed=0)
+        game.init_game()
+        source = next(fac for fac in game.factories if fac.team == 1)
+        target = next(fac for fac in game.factories if fac is not source)
+
+        with ReplayWriter(self.path) as writer:
+            writer.start(game)
+            game.orders[1] = [
+                Move(source.id, target.id, -5),
+                Move(source.id, target.id, 2),
+                Msg("two\nlines"),
+            ]
+            writer.write_turn(game, game.make_turn())
+
+        with ReplayReader(self.path) as reader:
+            delta = reader.turn_delta(reader.board_at(0), 1)
+            # The negative move is invalid, so never recorded
+            self.assertEqual(
+                ["MOVE {} {} 2".format(source.id, target.id),
+                 "MSG two\nlines"],
+                [order.to_string() for _, order in delta.orders],
+            )
+            self.assertEqual(game.to_json(), reader.board_at(1).to_json())
+
+    def test_truncated_file(self):
+        states = record_game(self.path, 1, keyframe_interval=1000)
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as replay_file:
+            replay_file.truncate(size - 3)
+
+        with ReplayReader(self.path) as reader:
+            last_turn = reader.last_turn
+            self.assertEqual(max(states) - 1, last_turn)
+            self.assertEqual(
+                states[last_turn], reader.board_at(last_turn).to_json()
+            )
+
+    def test_not_a_replay(self):
+        with open(self.path, "wb") as replay_file:
+            replay_file.write(b"not a replay")
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path)
+
+    def test_append(self):
+        game = GameBoard(seed=4)
+        game.init_game()
+        states = {0: game.to_json()}
+
+        for _ in range(2):
+            # Each session only appends a keyframe, not another header
+            with ReplayWriter(self.path) as writer:
+                writer.start(game)
+                for _ in range(5):
+                    set_bot_orders(game, {1: GreedyBot(1)})
+                    writer.write_turn(game, game.make_turn())
+                    states[game.current_turn] = game.to_json()
+
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(10, reader.last_turn)
+            for turn, state in states.items():
+                self.assertEqual(state, reader.board_at(turn).to_json())
@@ -0,0 +1,178 @@
+import asyncio
+import unittest
+
+from bots import GreedyBot, RandomBot, WaitBot
+from client import play_remote
+from order import Inc, Move
+from server import GameServer, PlayerStats, parse_orders
+
+
+class TestParseOrders(unittest.TestCase):
+    def test_parse_orders(self):
+        orders = parse_orders("MOVE 1 2 10;JUMP 3; INC 2 ;\n")
+        self.assertEqual([Move, Inc], [type(order) for order in orders])
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(
+            ports=(0, 0),
+            turn_timeout=2.0,
+            game_options={"max_turns": 20},
+        )
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_concurrent_matches(self):
+        # Load test with many loopback clients at once
+        num_matches = 10
+        port_one, port_two = self.server.ports
+        clients = []
+        for i in range(num_matches):
+            clients.append(play_remote(GreedyBot, port=port_one, seed=i))
+            clients.append(play_remote(RandomBot, port=port_two, seed=i))
+
+        boards = await asyncio.wait_for(asyncio.gather(*clients), 60)
+        await asyncio.wait_for(self.server.wait_for_matches(num_matches), 10)
+
+        self.assertEqual(num_matches, len(self.server.results))
+        for board in boards:
+            self.assertTrue(board.game_over)
+        for match in self.server.results:
+            self.assertTrue(match.game.game_over)
+            for stats in match.stats.values():
+                self.assertEqual(0, stats.timeouts)
+                self.assertEqual(
+                    match.game.current_turn, len(stats.response_times)
+                )
+                self.assertLessEqual(stats.p50, stats.p99)
+
+    async def test_delta_mode(self):
+        self.server.delta = True
+        port_one, port_two = self.server.ports
+
+        boards = await asyncio.wait_for(
+            asyncio.gather(
+                play_remote(GreedyBot, port=port_one, seed=1),
+                play_remote(RandomBot, port=port_two, seed=2),
+            ),
+            30,
+        )
+        await asyncio.wait_for(self.server.wait_for_matches(1), 10)
+
+        # Both clients rebuilt the final board from the deltas
+        expected = self.server.results[0].game.to_json()
+        for board in boards:
+            self.assertEqual(expected, board.to_json())
+
+    async def test_slow_player(self):
+        self.server.turn_timeout = 0.05
+        self.server.game_options = {"max_turns": 10}
+        port_one, port_two = self.server.ports
+
+        async def silent_player():
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", port_two
+            )
+            # Read everything but never reply
+            while await reader.readline():
+                pass
+            writer.close()
+
+        board, _ = await asyncio.wait_for(
+            asyncio.gather(
+                play_remote(WaitBot, port=port_one), silent_player(),
+            ),
+            30,
+        )
+        self.assertTrue(board.game_over)
+        self.assertEqual(10, board.current_turn)
+
+        await asyncio.wait_for(self.server.wait_for_matches(1), 10)
+        stats = self.server.results[0].stats
+        self.assertEqual(0, stats[1].timeouts)
+        self.assertEqual(10, stats[-1].timeouts)
+        self.assertIsNone(stats[-1].p50)
+
+    async def test_late_player(self):
+        self.server.turn_timeout = 0.1
+        self.server.game_options = {"max_turns": 6}
+        port_one, port_two = self.server.ports
+
+        async def late_player():
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", port_two
+            )
+            await reader.readline()
+            turn = 0
+            while await reader.readline():
+                turn += 1
+                # Too slow on odd turns
+                if turn % 2:
+                    await asyncio.sleep(0.15)
+                writer.write(b"WAIT\n")
+                await writer.drain()
+            writer.close()
+
+        await asyncio.wait_for(
+            asyncio.gather(play_remote(WaitBot, port=port_one), late_player()),
+            30,
+        )
+        await asyncio.wait_for(self.server.wait_for_matches(1), 10)
+
+        stats = self.server.results[0].stats[-1]
+        # Late replies are dropped rather than used for the next turn
+        self.assertEqual(3, stats.timeouts)
+        self.assertEqual(3, len(stats.response_times))
+
+    async def test_unknown_factory(self):
+        self.server.game_options = {"max_turns": 5}
+        port_one, port_two = self.server.ports
+
+        async def bad_player():
+            reader, writer = await asyncio.open_connection(
+                "127.0.0.1", port_two
+            )
+            await reader.readline()
+            try:
+                while await reader.readline():
+                    writer.write(b"MOVE 999 0 5;BOMB 0 -1;INC 12345\n")
+                    await writer.drain()
+            except ConnectionError:
+                # Replied to the final board after the server hung up
+                pass
+            writer.close()
+
+        board, _ = await asyncio.wait_for(
+            asyncio.gather(play_remote(WaitBot, port=port_one), bad_player()),
+            30,
+        )
+        self.assertTrue(board.game_over)
+        self.assertEqual(5, board.current_turn)
+
+        await asyncio.wait_for(self.server.wait_for_matches(1), 10)
+        stats = self.server.results[0].stats[-1]
+        # The negative ID is already rejected by the order parser
+        self.assertEqual(5 * 2, stats.invalid_orders)
+
+
+class TestPlayerStats(unittest.TestCase):
+    def test_percentiles(self):
+        stats = PlayerStats()
+        self.assertIsNone(stats.p50)
+
+        for i in range(1, 101):
+            stats.record(i / 1000.0)
+        stats.record_timeout()
+
+        self.assertEqual(0.05, stats.p50)
+        self.assertEqual(0.099, stats.p99)
+        self.assertEqual(
+            {
+                "responses": 100, "timeouts": 1, "invalid_orders": 0,
+                "p50": 0.05, "p99": 0.099,
+            },
+            stats.summary(),
+        )
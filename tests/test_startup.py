@@ -0,0 +1,45 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous, so slow CI machines pass, but well under what importing NumPy
+# or pygame costs on top of interpreter startup
+IMPORT_BUDGET = 0.5
+
+CORE_MODULES = ["game", "factory", "unit", "order", "bots", "headless"]
+
+
+def import_in_subprocess(modules):
+    """
+    Import ``modules`` in a fresh interpreter and return the seconds it took
+    and the names of all modules loaded
+    """
+    code = (
+        "import importlib, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "for name in {!r}:\n"
+        "    importlib.import_module(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps([elapsed, sorted(sys.modules)]))\n"
+    ).format(modules)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return json.loads(output)
+
+
+class TestStartup(unittest.TestCase):
+    def test_core_imports(self):
+        elapsed, modules = import_in_subprocess(CORE_MODULES)
+        self.assertNotIn("numpy", modules)
+        self.assertNotIn("pygame", modules)
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+    def test_app_import_is_lazy(self):
+        _, modules = import_in_subprocess(["app"])
+        self.assertNotIn("pygame", modules)
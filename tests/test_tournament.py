@@ -0,0 +1,54 @@
+import unittest
+
+from bots import BOTS
+from tournament import Standings, play_game, run_tournament, schedule
+
+
+class TestTournament(unittest.TestCase):
+    def test_schedule(self):
+        games = schedule(["a", "b", "c"], 2, seed=10)
+        self.assertEqual(6, len(games))
+        self.assertEqual(("a", "b"), games[0][:2])
+        self.assertEqual(("b", "a"), games[1][:2])
+        # Bots use ``seed`` and ``seed + 1``, so seeds are spaced by two
+        self.assertEqual(
+            [10, 12, 14, 16, 18, 20], [seed for _, _, seed in games]
+        )
+
+    def test_play_game(self):
+        for name in BOTS:
+            result = play_game(name, "greedy", seed=3)
+            self.assertIn(result["winner"], [-1, 0, 1])
+            self.assertEqual(0, result["invalid_orders"])
+
+        self.assertEqual(
+            play_game("random", "greedy", seed=5),
+            play_game("random", "greedy", seed=5),
+        )
+
+    def test_standings(self):
+        standings = Standings(["a", "b"])
+        standings.add({"bot_one": "a", "bot_two": "b", "winner": 1})
+        standings.add({"bot_one": "a", "bot_two": "b", "winner": -1})
+        standings.add({"bot_one": "b", "bot_two": "a", "winner": -1})
+        standings.add({"bot_one": "b", "bot_two": "a", "winner": 0})
+
+        self.assertEqual(
+            {"wins": 2, "losses": 1, "draws": 1}, standings.table["a"]
+        )
+        self.assertEqual(
+            {"wins": 1, "losses": 2, "draws": 1}, standings.table["b"]
+        )
+
+    def test_pool_matches_in_process(self):
+        bots = ["random", "greedy", "wait"]
+        pool_standings, pool_results, _ = run_tournament(
+            bots, 2, seed=1, workers=2,
+        )
+        standings, results, games_per_second = run_tournament(
+            bots, 2, seed=1, workers=0,
+        )
+
+        self.assertEqual(results, pool_results)
+        self.assertEqual(standings.table, pool_standings.table)
+        self.assertGreater(games_per_second, 0)
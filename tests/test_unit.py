@@ -16,6 +16,14 @@ class TestUnits(unittest.TestCase):
             str(err.exception)
         )
 
+    def test_slots(self):
+        source_fac = Factory(0, 1, 0, 0, (15, -10))
+        dest_fac = Factory(1, 1, 0, 0, (-5, 20))
+
+        for unit_type in [Bomb, Troop]:
+            unit = unit_type(10, source_fac, dest_fac)
+            self.assertFalse(hasattr(unit, "__dict__"))
+
     def test_units_move(self):
         unit_types = [Bomb, Troop]
 
@@ -74,4 +82,5 @@ class TestUnits(unittest.TestCase):
         unit.move()
         self.assertFalse(unit.active)
 
-        self.assertEqual(dest_fac.occupying_troops, {-1: 10, 1: 0})
+        self.assertEqual(dest_fac.occupying_troops[-1], 10)
+        self.assertEqual(dest_fac.occupying_troops[1], 0)
@@ -0,0 +1,218 @@
+"""
+Round-robin tournament runner.
+
+Games are fanned out over a process pool. Each game is seeded on its own, so
+a tournament with the same seed plays the same games regardless of how many
+workers run it.
+
+Run from the repository root with, for example:
+
+    python tournament.py greedy random wait --games 20 --workers 4
+"""
+import argparse
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bots import BOTS
+from game import GameBoard
+from order import Order
+
+
+def play_game(bot_one, bot_two, seed, game_options=None):
+    """
+    Play a full game between two bots.
+
+    Parameters
+    ----------
+    bot_one : str
+        Name (see ``bots.BOTS``) of the bot playing team 1
+    bot_two : str
+        Name of the bot playing team -1
+    seed : int
+        Seed for the board and both bots
+    game_options : dict, optional
+        Keyword arguments for ``GameBoard.init_game``
+
+    Returns
+    -------
+    dict
+        The bots, seed, winner (1, -1 or 0 for a draw), number of turns and
+        number of order strings that couldn't be parsed
+    """
+    game = GameBoard(seed=seed)
+    game.init_game(**(game_options or {}))
+
+    bots = {
+        1: BOTS[bot_one](1, seed=seed),
+        -1: BOTS[bot_two](-1, seed=seed + 1),
+    }
+
+    invalid_orders = 0
+    while not game.game_over:
+        for team, bot in bots.items():
+            for order_string in bot.get_orders(game):
+                try:
+                    game.orders[team].append(Order.from_string(order_string))
+                except ValueError:
+                    invalid_orders += 1
+        game.update()
+
+    return {
+        "bot_one": bot_one,
+        "bot_two": bot_two,
+        "seed": seed,
+        "winner": game.winner,
+        "turns": game.current_turn,
+        "invalid_orders": invalid_orders,
+    }
+
+
+def run_tasks(tasks, workers=None):
+    """
+    Call ``func(*args)`` for each ``(func, args)`` task, in this process if
+    ``workers`` is 0 and on a process pool otherwise.
+
+    Parameters
+    ----------
+    tasks : list of (callable, tuple)
+        Functions must be picklable, i.e. defined at module level
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    list
+        Result of each task, in order
+    """
+    if workers == 0:
+        return [func(*args) for func, args in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(func, *args) for func, args in tasks]
+        return [future.result() for future in futures]
+
+
+def schedule(bot_names, games_per_pair, seed=0):
+    """
+    List the games of a round robin between the given bots. Each pair plays
+    ``games_per_pair`` games, swapping sides every game.
+
+    Returns
+    -------
+    list of (str, str, int)
+        Team 1 bot, team -1 bot and seed for each game
+    """
+    games = []
+    for pair in itertools.combinations(bot_names, 2):
+        for i in range(games_per_pair):
+            bot_one, bot_two = pair if i % 2 == 0 else pair[::-1]
+            games.append((bot_one, bot_two, seed + 2 * len(games)))
+    return games
+
+
+class Standings:
+    """
+    Win/loss/draw table for a set of bots
+    """
+    def __init__(self, bot_names):
+        self.table = {
+            name: {"wins": 0, "losses": 0, "draws": 0}
+            for name in bot_names
+        }
+
+    def add(self, result):
+        """
+        Record a result returned by ``play_game``
+        """
+        if result["winner"] == 0:
+            self.table[result["bot_one"]]["draws"] += 1
+            self.table[result["bot_two"]]["draws"] += 1
+            return
+
+        if result["winner"] == 1:
+            winner, loser = result["bot_one"], result["bot_two"]
+        else:
+            winner, loser = result["bot_two"], result["bot_one"]
+        self.table[winner]["wins"] += 1
+        self.table[loser]["losses"] += 1
+
+    def format(self):
+        lines = ["{:<12} {:>6} {:>6} {:>6}".format("bot", "W", "L", "D")]
+        ranked = sorted(
+            self.table.items(),
+            key=lambda item: (item[1]["wins"], item[1]["draws"]),
+            reverse=True,
+        )
+        for name, record in ranked:
+            lines.append("{:<12} {:>6} {:>6} {:>6}".format(
+                name, record["wins"], record["losses"], record["draws"]
+            ))
+        return "\n".join(lines)
+
+
+def run_tournament(bot_names, games_per_pair, seed=0, workers=None,
+                   game_options=None):
+    """
+    Play a round robin between bots on a process pool.
+
+    Parameters
+    ----------
+    bot_names : list of str
+        Names of bots in ``bots.BOTS``
+    games_per_pair : int
+        Games played by each pair of bots
+    seed : int, optional
+        Base seed for the whole tournament
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs. With
+        ``workers=0`` games are played in this process.
+    game_options : dict, optional
+        Keyword arguments for ``GameBoard.init_game``
+
+    Returns
+    -------
+    standings : Standings
+    results : list of dict
+        Result of each game, in schedule order
+    games_per_second : float
+    """
+    games = schedule(bot_names, games_per_pair, seed=seed)
+    standings = Standings(bot_names)
+
+    start = time.perf_counter()
+    results = run_tasks(
+        [
+            (play_game, (bot_one, bot_two, game_seed, game_options))
+            for bot_one, bot_two, game_seed in games
+        ],
+        workers,
+    )
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        standings.add(result)
+
+    games_per_second = len(results) / elapsed if elapsed > 0 else 0.0
+    return standings, results, games_per_second
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("bots", nargs="+", choices=sorted(BOTS))
+    parser.add_argument("--games", type=int, default=10,
+                        help="games per pair of bots")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, 0 to play in-process")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    standings, results, games_per_second = run_tournament(
+        args.bots, args.games, seed=args.seed, workers=args.workers,
+    )
+    print(standings.format())
+    print("{} games, {:.1f} games/s".format(len(results), games_per_second))
+
+
+if __name__ == "__main__":
+    main()
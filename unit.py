@@ -1,13 +1,55 @@
-from abc import ABC, abstractmethod
-
-import numpy as np
+from abc import abstractmethod
 
 from factory import factory_dist
 from jsonize import Jsonizable
 
 
+class Clock:
+    """
+    Turn counter shared by a board and its units. Units know how far they've
+    travelled from the turn they were sent, so nothing needs to be done to
+    them between sending and arrival.
+
+    Parameters
+    ----------
+    turn : int, optional
+    """
+    __slots__ = ("turn", "moved")
+
+    def __init__(self, turn=0):
+        self.turn = turn
+        # Set when a unit on this clock is moved by hand, so its board knows
+        # to rebuild its arrival schedule
+        self.moved = False
+
+
 class Unit(Jsonizable):
-    def __init__(self, strength, source, destination):
+    """
+    A unit travelling between two factories
+
+    Parameters
+    ----------
+    strength : int or None
+        Unit strength
+    source : Factory
+        Factory the unit was sent from
+    destination : Factory
+        Factory the unit is travelling to
+    distance : int, optional
+        Number of turns to reach the destination. Computed from the factory
+        positions if not given, but boards should pass their precomputed
+        ``GameBoard.distances`` entry.
+    clock : Clock, optional
+        Clock of the board the unit is on. The unit is sent on the clock's
+        current turn. Units not on a board get a clock of their own.
+    """
+    __slots__ = (
+        "strength", "active", "source", "destination", "team", "distance",
+        "spawn_turn", "clock",
+    )
+
+    def __init__(self, strength, source, destination, distance=None,
+                 clock=None):
         self.strength = strength
 
         self.active = True
@@ -18,26 +60,76 @@ class Unit(Jsonizable):
 
         self.team = self.source.team
 
-        self.distance = factory_dist(source, destination)
-        self.travelled = 0
+        if distance is None:
+            distance = factory_dist(source, destination)
+        self.distance = distance
+
+        self.clock = Clock() if clock is None else clock
+        self.spawn_turn = self.clock.turn
+
+    @property
+    def travelled(self):
+        """
+        Number of turns travelled so far
+        """
+        return self.clock.turn - self.spawn_turn
+
+    @travelled.setter
+    def travelled(self, travelled):
+        self.spawn_turn = self.clock.turn - travelled
+        self.clock.moved = True
+
+    @property
+    def arrival_turn(self):
+        """
+        Turn of the unit's clock on which it reaches its destination
+        """
+        return self.spawn_turn + self.distance
 
     @abstractmethod
     def resolve_at_dest(self):
         pass
 
     def move(self):
+        """
+        Move the unit one turn on its own, resolving it if it arrives. Boards
+        don't move their units, see ``GameBoard.update``.
+        """
         self.travelled += 1
         if self.travelled == self.distance:
             self.resolve_at_dest()
             self.active = False
 
     def get_position(self):
-        vec = np.array(self.destination.position, dtype="float64") \
-            - np.array(self.source.position, dtype="float64")
-
-        vec *= self.travelled / self.distance
+        """
+        Return the unit's (x, y) position, between its source and destination
+        """
+        fraction = self.travelled / self.distance
+        (x0, y0), (x1, y1) = self.source.position, self.destination.position
+        return (x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction)
 
-        return self.source.position + vec
+    def copy(self, factory_table, clock=None):
+        """
+        Return a copy of this unit travelling between the factories with the
+        same IDs in ``factory_table``
+
+        Parameters
+        ----------
+        factory_table : list of Factory
+            Factories indexed by ID, see ``GameBoard.factory_table``
+        clock : Clock, optional
+            Clock for the copy, by default the same as this unit's
+        """
+        unit = self.__class__.__new__(self.__class__)
+        unit.strength = self.strength
+        unit.active = self.active
+        unit.source = factory_table[self.source.id]
+        unit.destination = factory_table[self.destination.id]
+        unit.team = self.team
+        unit.distance = self.distance
+        unit.clock = self.clock if clock is None else clock
+        unit.spawn_turn = unit.clock.turn - self.travelled
+        return unit
 
     def to_json(self):
         return {
@@ -50,6 +142,19 @@ class Unit(Jsonizable):
             "travelled": self.travelled,
         }
 
+    def to_delta_json(self):
+        """
+        JSON for a newly sent unit, which is always active and hasn't
+        travelled yet
+        """
+        return {
+            "strength": self.strength,
+            "source": self.source.id,
+            "destination": self.destination.id,
+            "team": self.team,
+            "distance": self.distance,
+        }
+
     @classmethod
     def from_json(cls, obj):
         """
@@ -60,10 +165,14 @@ class Unit(Jsonizable):
 
 
 class Troop(Unit):
+    __slots__ = ()
+
     def resolve_at_dest(self):
         self.destination.occupying_troops[self.team] += self.strength
 
 
 class Bomb(Unit):
+    __slots__ = ()
+
     def resolve_at_dest(self):
         self.destination.bombs_arriving += 1